@@ -1,16 +1,29 @@
 import pandas as pd
 import os
 
+# 优先使用calamine引擎（Rust实现的xlsx解析器，比openpyxl快且省内存），
+# 未安装python-calamine时回退到pandas默认引擎
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+    EXCEL_ENGINE_KWARGS = {}
+except ImportError:
+    # openpyxl的只读模式按流式读取单元格，显著降低解析时间和内存占用
+    EXCEL_ENGINE = 'openpyxl'
+    EXCEL_ENGINE_KWARGS = {'read_only': True, 'data_only': True, 'keep_links': False}
+
 # 读取配置文件
 config_file = '/home/alex/aidev/SvnMonitor/config/svn_monitor_config.xlsx'
 
-# 读取仓库配置工作表
-repo_df = pd.read_excel(config_file, sheet_name='Repository Configs')
+# 一次解析同时读取两个工作表，避免对同一个xlsx做两次完整解析；
+# 显式声明dtype=str跳过pandas的类型推断扫描（配置只作为字符串使用）
+dfs = pd.read_excel(config_file, sheet_name=['Repository Configs', 'Global Configs'],
+                    dtype=str,
+                    engine=EXCEL_ENGINE, engine_kwargs=EXCEL_ENGINE_KWARGS)
+
 print("仓库配置:")
-print(repo_df)
+print(dfs['Repository Configs'])
 print("\n")
 
-# 读取全局配置工作表
-global_df = pd.read_excel(config_file, sheet_name='Global Configs')
 print("全局配置:")
-print(global_df)
+print(dfs['Global Configs'])
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+邮件发送公共模块
+供send_failure_email.py和send_startup_email.py共享配置加载、
+SMTP会话管理和邮件发送逻辑；本模块只获取logger，
+日志配置（logging.basicConfig）由各脚本自行完成。
+"""
+
+import html
+import time
+from collections import namedtuple
+import os
+import smtplib
+import logging
+import configparser
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+# HTML邮件正文模板（模块级常量，避免每次发送重新构造整个模板字符串）
+_HTML_TEMPLATE = """
+    <html>
+    <body>
+        <h2>SVN监控服务状态通知</h2>
+        <p>{subject}</p>
+        <pre style="background-color: #f5f5f5; padding: 10px; border-radius: 5px; font-family: monospace;">
+{content}
+        </pre>
+    </body>
+    </html>
+    """
+
+logger = logging.getLogger(__name__)
+
+
+def _load_config_from_excel(config_file):
+    """
+    从Excel配置文件加载邮件配置
+
+    为了避免每次调用都重新解析Excel（openpyxl解析比纯文本慢得多），
+    会在Excel文件旁边维护一个INI缓存文件（config_file + '.cache.ini'）。
+    只有当Excel文件的修改时间比缓存新时才重新解析Excel，否则直接读取INI缓存。
+
+    :param config_file: Excel配置文件路径
+    :return: configparser.ConfigParser对象，如果加载失败则返回None
+    """
+    config = configparser.ConfigParser()
+
+    if not os.path.exists(config_file):
+        logger.error(f"Excel配置文件不存在: {config_file}")
+        return None
+
+    # 优先使用INI缓存，避免每次发送邮件都重新解析Excel
+    cache_path = config_file + '.cache.ini'
+    try:
+        if os.path.exists(cache_path) and \
+                os.path.getmtime(cache_path) >= os.path.getmtime(config_file):
+            config.read(cache_path, encoding='utf-8')
+            if config.sections():
+                logger.info(f"从INI缓存加载配置: {cache_path}")
+                return config
+            # 缓存为空或损坏，回退到重新解析Excel
+            config = configparser.ConfigParser()
+    except Exception as e:
+        logger.warning(f"读取INI缓存失败，将重新解析Excel: {str(e)}")
+        config = configparser.ConfigParser()
+
+    try:
+        # 优先使用python-calamine直接读取（Rust实现的xlsx解析器，
+        # 无需DataFrame分配），未安装时回退到openpyxl只读流式读取
+        try:
+            from python_calamine import CalamineWorkbook
+
+            workbook = CalamineWorkbook.from_path(config_file)
+            rows = workbook.get_sheet_by_name('Global Configs').to_python()
+            # 先聚合成嵌套字典再一次性read_dict，
+            # 避免逐行add_section/set的重复校验开销
+            parsed = {}
+            # 第一行为表头（Section/Key/Value），跳过
+            for row in rows[1:]:
+                try:
+                    if len(row) < 3 or row[0] is None or row[1] is None:
+                        continue
+                    parsed.setdefault(str(row[0]), {})[str(row[1])] = str(row[2])
+                except Exception as e:
+                    logger.error(f"解析配置行失败: {row}, 错误: {str(e)}")
+            config.read_dict(parsed)
+        except ImportError:
+            # 三列配置无需pandas/numpy，直接用openpyxl只读模式流式读取单元格，
+            # 省掉pandas导入开销和DataFrame物化
+            from openpyxl import load_workbook
+
+            wb = load_workbook(config_file, read_only=True, data_only=True)
+            try:
+                ws = wb['Global Configs']
+                # 先聚合成嵌套字典再一次性read_dict，
+                # 避免逐行add_section/set的重复校验开销
+                parsed = {}
+                # 第一行为表头（Section/Key/Value），跳过
+                for row in ws.iter_rows(min_row=2, values_only=True):
+                    try:
+                        if not row or row[0] is None or row[1] is None:
+                            continue
+                        value = '' if len(row) < 3 or row[2] is None else str(row[2])
+                        parsed.setdefault(str(row[0]), {})[str(row[1])] = value
+                    except Exception as e:
+                        logger.error(f"解析配置行失败: {row}, 错误: {str(e)}")
+                config.read_dict(parsed)
+            finally:
+                wb.close()
+
+        # 写入INI缓存，后续调用可以直接读取缓存而无需解析Excel
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                config.write(f)
+            logger.info(f"配置已缓存到: {cache_path}")
+        except Exception as e:
+            logger.warning(f"写入INI缓存失败: {str(e)}")
+
+        return config
+    except ImportError:
+        logger.error("python-calamine和openpyxl均未安装，无法读取Excel配置文件")
+        return None
+    except Exception as e:
+        logger.error(f"从Excel加载配置失败: {str(e)}")
+        return None
+
+
+#: 一次性从配置对象提取的SMTP参数快照，供重试循环直接引用字段，
+#: 避免每次重试都重新走SectionProxy查找和strip
+SmtpConfig = namedtuple('SmtpConfig',
+                        ['server', 'port', 'use_ssl', 'username', 'password', 'timeout'])
+
+
+def _smtp_config_from(config):
+    """
+    从配置对象提取SMTP参数快照
+
+    :param config: configparser.ConfigParser对象
+    :return: SmtpConfig命名元组
+    """
+    email_cfg = config['EMAIL']
+    return SmtpConfig(
+        server=email_cfg['smtp_server'],
+        port=int(email_cfg.get('smtp_port', '465')),
+        use_ssl=email_cfg.get('use_ssl', 'True').lower() == 'true',
+        username=email_cfg.get('username', '').strip(),
+        password=email_cfg.get('password', '').strip(),
+        timeout=30)
+
+
+class SmtpSession:
+    """SMTP会话上下文管理器
+
+    持有一个已连接并登录的SMTP会话，发送多封邮件时可以复用同一会话，
+    把TCP+TLS+AUTH握手的开销摊薄到多次发送上：
+
+        with SmtpSession(config) as server:
+            send_email(subject1, content1, server=server)
+            send_email(subject2, content2, server=server)
+    """
+
+    def __init__(self, config):
+        self.smtp_cfg = _smtp_config_from(config)
+        self.server = None
+
+    def __enter__(self):
+        smtp_cfg = self.smtp_cfg
+        if smtp_cfg.use_ssl:
+            self.server = smtplib.SMTP_SSL(smtp_cfg.server, smtp_cfg.port,
+                                           timeout=smtp_cfg.timeout)
+        else:
+            self.server = smtplib.SMTP(smtp_cfg.server, smtp_cfg.port,
+                                       timeout=smtp_cfg.timeout)
+            self.server.starttls()
+
+        if smtp_cfg.username and smtp_cfg.password:
+            self.server.login(smtp_cfg.username, smtp_cfg.password)
+        else:
+            logger.info("跳过SMTP认证，因为未提供有效凭证")
+
+        return self.server
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception as e:
+                logger.warning(f"关闭SMTP会话失败: {str(e)}")
+            self.server = None
+        return False
+
+
+def _send_email(msg, smtp_cfg, server=None):
+    """
+    内部邮件发送方法，包含重试逻辑
+
+    :param msg: 邮件消息对象
+    :param smtp_cfg: SmtpConfig命名元组（见_smtp_config_from）
+    :param server: 可选的已连接SMTP会话（见SmtpSession）；
+                   传入时复用该会话发送，不再重新连接/登录/退出
+    :return: bool: 是否发送成功
+    """
+    # 复用外部传入的SMTP会话，跳过连接/登录/退出
+    if server is not None:
+        try:
+            recipients_str = msg['To']
+            recipients_list = [r.strip() for r in recipients_str.split(',') if r.strip()]
+            server.send_message(msg, to_addrs=recipients_list)
+            logger.info(f"邮件发送成功（复用SMTP会话），收件人: {recipients_str}")
+            return True
+        except Exception as e:
+            logger.error(f"复用SMTP会话发送邮件失败: {str(e)}")
+            return False
+
+    try:
+        # 发送邮件，带重试逻辑
+        has_credentials = bool(smtp_cfg.username) and bool(smtp_cfg.password)
+        max_retries = 2
+        retry_count = 0
+        success = False
+
+        while retry_count <= max_retries and not success:
+            try:
+                if smtp_cfg.use_ssl:
+                    server = smtplib.SMTP_SSL(smtp_cfg.server, smtp_cfg.port,
+                                              timeout=smtp_cfg.timeout)
+                else:
+                    server = smtplib.SMTP(smtp_cfg.server, smtp_cfg.port,
+                                          timeout=smtp_cfg.timeout)
+                    server.starttls()
+
+                # 只有在有完整凭证时才尝试登录
+                if has_credentials:
+                    try:
+                        server.login(smtp_cfg.username, smtp_cfg.password)
+                    except smtplib.SMTPAuthenticationError:
+                        logger.error(f"SMTP认证失败 (尝试 {retry_count + 1}/{max_retries + 1})")
+                        retry_count += 1
+                        time.sleep(2 ** retry_count)  # 指数退避，缓解灰名单限制
+                        continue
+                else:
+                    logger.info("跳过SMTP认证，因为未提供有效凭证")
+
+                # 提取收件人列表
+                recipients_str = msg['To']
+                recipients_list = [r.strip() for r in recipients_str.split(',') if r.strip()]
+
+                # 发送邮件
+                server.send_message(msg, to_addrs=recipients_list)
+                server.quit()
+                success = True
+                logger.info(f"邮件发送成功，收件人: {recipients_str}")
+                return True
+            except smtplib.SMTPException as e:
+                logger.error(f"SMTP发送错误: {str(e)} (尝试 {retry_count + 1}/{max_retries + 1})")
+                retry_count += 1
+                time.sleep(2 ** retry_count)  # 指数退避，缓解灰名单限制
+            except Exception as e:
+                logger.error(f"发送邮件时发生意外错误: {str(e)}")
+                break
+
+        if not success:
+            logger.error("多次尝试后仍无法发送邮件")
+            return False
+    except Exception as e:
+        logger.error(f"_send_email方法出错: {str(e)}")
+        return False
+
+
+def send_email(subject, content, server=None, prefer_plain=True):
+    """
+    发送邮件函数
+
+    :param subject: 邮件主题
+    :param content: 邮件内容
+    :param server: 可选的已连接SMTP会话（见SmtpSession），用于批量发送时复用连接
+    :param prefer_plain: 为True时只发送纯文本正文；HTML正文只是把同样的content
+                         包进<pre>，multipart/alternative会让内容在邮件里重复两份
+    :return: bool: 是否发送成功
+    """
+    # 获取配置文件路径
+    config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'svn_monitor_config.xlsx')
+
+    # 加载配置
+    config = _load_config_from_excel(config_path)
+    if config is None:
+        logger.error("无法加载配置文件，邮件发送失败")
+        return False
+
+    # 检查邮件配置是否完整（绑定一次SectionProxy，避免重复的节查找）
+    if 'EMAIL' not in config:
+        logger.error("邮件配置不完整，缺少必要的SMTP参数")
+        return False
+    email_cfg = config['EMAIL']
+    if not all([
+        'smtp_server' in email_cfg,
+        'from_email' in email_cfg,
+        'to_emails' in email_cfg
+    ]):
+        logger.error("邮件配置不完整，缺少必要的SMTP参数")
+        return False
+
+    # 一次性提取SMTP参数快照，后续统一引用快照字段
+    smtp_cfg = _smtp_config_from(config)
+
+    # 检查SMTP凭证
+    has_credentials = bool(smtp_cfg.username) and bool(smtp_cfg.password)
+
+    if not has_credentials:
+        logger.error("SMTP凭证不完整，无法发送邮件")
+        return False
+
+    # 获取收件人列表
+    to_emails = email_cfg.get('to_emails', '').strip()
+    if not to_emails:
+        logger.error("收件人列表为空")
+        return False
+
+    # 创建邮件对象
+    if prefer_plain:
+        # 单一纯文本正文即可，避免multipart把同样的内容传输两份
+        msg = MIMEText(content, 'plain', 'utf-8')
+    else:
+        # 构建HTML邮件内容（转义主题和内容，避免日志中的特殊字符破坏HTML结构）
+        html_content = _HTML_TEMPLATE.format(
+            subject=html.escape(subject),
+            content=html.escape(content))
+
+        msg = MIMEMultipart('alternative')
+        # 添加邮件正文（HTML和纯文本）
+        msg.attach(MIMEText(content, 'plain', 'utf-8'))
+        msg.attach(MIMEText(html_content, 'html'))
+
+    msg['From'] = email_cfg['from_email']
+    msg['To'] = to_emails
+    msg['Subject'] = subject
+
+    # 发送邮件
+    return _send_email(msg, smtp_cfg, server=server)
@@ -22,8 +22,9 @@ logger = logging.getLogger(__name__)
 # 添加脚本所在目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# 导入邮件发送所需的模块
-from send_failure_email import send_email
+# 导入邮件发送所需的模块（从emailer公共模块导入，
+# 避免import send_failure_email时执行其logging.basicConfig导致重复写日志）
+from emailer import send_email
 
 def send_startup_notification():
     """
@@ -1,2557 +1,3412 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-
-"""
-SVN Monitor Script
-This script monitors SVN repository changes, sends email notifications,
-performs backup and restore operations, and maintains operation logs.
-"""
-
-import os
-import sys
-import time
-import subprocess
-import xml.etree.ElementTree as ET
-import logging
-import configparser
-import datetime
-import smtplib
-import re
-import signal
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from logging.handlers import RotatingFileHandler
-
-# 导入时区处理模块
-try:
-    # Python 3.9+ 推荐使用zoneinfo
-    from zoneinfo import ZoneInfo
-except ImportError:
-    # 兼容旧版本Python
-    try:
-        import pytz
-    except ImportError:
-        pytz = None
-
-# 定义北京时间时区
-def get_beijing_time():
-    """获取北京时间（UTC+8）"""
-    now = datetime.datetime.now()
-    # 尝试使用zoneinfo（Python 3.9+）
-    if 'ZoneInfo' in globals():
-        return now.astimezone(ZoneInfo('Asia/Shanghai'))
-    # 尝试使用pytz
-    elif pytz:
-        if now.tzinfo is None:
-            # 如果没有时区信息，先设为UTC
-            now = pytz.UTC.localize(now)
-        return now.astimezone(pytz.timezone('Asia/Shanghai'))
-    # 如果都不可用，至少记录当前使用的是系统时区
-    logging.warning("无法设置北京时间时区，使用系统默认时区")
-    return now
-
-# 获取北京时间的格式化字符串
-def get_beijing_time_str(format_str='%Y-%m-%d %H:%M:%S'):
-    """获取格式化的北京时间字符串"""
-    return get_beijing_time().strftime(format_str)
-
-# 尝试导入pandas用于读取Excel文件
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
-    logging.warning("pandas库未安装，将使用默认收件人配置。如需使用Excel收件人功能，请安装pandas: pip install pandas openpyxl")
-
-def setup_logging(config=None):
-    """Setup logging based on configuration"""
-    # Default log settings
-    log_file = 'svn_monitor.log'
-    log_level = logging.INFO
-    
-    # 确保日志使用北京时间
-    if 'ZoneInfo' in globals():
-        # 为logging设置时区
-        logging.Formatter.converter = lambda *args: datetime.datetime.now(ZoneInfo('Asia/Shanghai')).timetuple()
-    elif pytz:
-        # 使用pytz设置时区
-        logging.Formatter.converter = lambda *args: datetime.datetime.now(pytz.timezone('Asia/Shanghai')).timetuple()
-    
-    # Override with config values if available
-    if config and 'LOGGING' in config:
-        log_file = config['LOGGING'].get('log_file', log_file)
-        log_level_str = config['LOGGING'].get('log_level', 'INFO').upper()
-        log_level = getattr(logging, log_level_str, logging.INFO)
-    
-    # Ensure log file path is absolute
-    if not os.path.isabs(log_file):
-        # Get the directory of the script or current working directory
-        base_dir = os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv else os.getcwd()
-        log_file = os.path.normpath(os.path.join(base_dir, log_file))
-    
-    # Ensure log directory exists
-    log_dir = os.path.dirname(log_file)
-    if log_dir and not os.path.exists(log_dir):
-        os.makedirs(log_dir, exist_ok=True)
-    
-    # Configure logging
-    numeric_level = getattr(logging, logging.getLevelName(log_level), logging.INFO)
-    
-    # Create logger
-    logger = logging.getLogger(__name__)
-    logger.setLevel(numeric_level)
-    
-    # Clear existing handlers if any
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-    
-    # Create handlers
-    handlers = []
-    
-    # File handler for detailed logging
-    file_handler = RotatingFileHandler(
-        log_file,
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    file_handler.setLevel(numeric_level)
-    file_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s'
-    ))
-    handlers.append(file_handler)
-    
-    # Stream handler for console output
-    stream_handler = logging.StreamHandler()
-    stream_handler.setLevel(numeric_level)
-    stream_handler.setFormatter(logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    ))
-    handlers.append(stream_handler)
-    
-    # Add handlers to logger
-    for handler in handlers:
-        logger.addHandler(handler)
-    
-    return logger
-
-# Initialize logger with default settings
-logger = setup_logging()
-
-# 默认配置常量
-DEFAULT_CHECK_INTERVAL = 300  # 默认检查间隔（秒）
-
-class SVNMonitor:
-    """SVN Monitor class to handle SVN operations, monitoring, backup and restore"""
-    
-    def __init__(self):
-        """Initialize SVN Monitor with configuration from Excel file"""
-        # 使用Excel作为唯一配置源
-        # 使用项目根目录的config目录中的配置文件
-        base_dir = os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv else os.getcwd()
-        # 如果当前在src目录，需要向上退一级到项目根目录
-        if os.path.basename(base_dir) == 'src':
-            base_dir = os.path.dirname(base_dir)
-        self.config_file = os.path.join(base_dir, 'config', 'svn_monitor_config.xlsx')
-        self.config = self._load_config()
-        self._validate_config()
-        self.repositories = self._get_repositories()
-        # Convert relative paths to absolute paths in repository configurations
-        self._convert_relative_paths()
-        self.last_revisions = self._get_last_recorded_revisions()
-        # 加载仓库名称映射关系（动态从Excel读取）
-        self.repo_name_mapping = self._load_repo_name_mapping()
-        # 加载收件人信息
-        self.recipients_mapping = self._load_recipients_from_excel()
-        # 初始化远程检测模式配置
-        self.use_remote_check = self._get_remote_check_setting()
-        
-        # 设置程序运行标志和信号处理
-        self.running = True
-        signal.signal(signal.SIGTERM, self._handle_sigterm)
-        signal.signal(signal.SIGINT, self._handle_sigterm)
-        
-        logger.info(f"SVN Monitor initialized with {len(self.repositories)} repositories, remote check mode: {self.use_remote_check}")
-    
-    def _load_config(self):
-        """Load configuration from Excel file only"""
-        config = configparser.ConfigParser()
-        
-        # Load from Excel config file
-        if os.path.exists(self.config_file):
-            logger.info(f"Loading configuration from Excel file: {self.config_file}")
-            success = self._load_config_from_excel(config, self.config_file)
-            if success:
-                return config
-            else:
-                logger.error("Failed to load configuration from Excel, creating default configuration")
-        else:
-            logger.warning(f"Configuration Excel file {self.config_file} not found. Creating default configuration.")
-        
-        # Create default Excel configuration if it doesn't exist
-        self._create_default_config()
-        
-        # Try to load the newly created configuration
-        success = self._load_config_from_excel(config, self.config_file)
-        if success:
-            return config
-        else:
-            # If all else fails, return a minimal default config
-            logger.error("Failed to create or load default configuration. Using minimal fallback config.")
-            return self._create_minimal_config()
-    
-    def _load_config_from_excel(self, config, excel_file):
-        """Load configuration from Excel file and populate the config object"""
-        try:
-            import pandas as pd
-            
-            # 首先检查Excel文件是否存在
-            if not os.path.exists(excel_file):
-                logger.warning(f"Excel configuration file does not exist: {excel_file}")
-                return False
-            
-            # Try to load repository configs sheet
-            try:
-                repo_df = pd.read_excel(excel_file, sheet_name='Repository Configs')
-                
-                # Process each repository configuration
-                for _, row in repo_df.iterrows():
-                    repo_id = row.get('Repository ID')
-                    if repo_id:
-                        if repo_id not in config:
-                            config.add_section(repo_id)
-                        
-                        # Map Excel columns to INI keys
-                        if pd.notna(row.get('Repository Name')):
-                            config.set(repo_id, 'name', str(row.get('Repository Name')))
-                        if pd.notna(row.get('Repository Path')):
-                            config.set(repo_id, 'repository_path', str(row.get('Repository Path')))
-                        if pd.notna(row.get('URL')):
-                            config.set(repo_id, 'url', str(row.get('URL')))
-                        if pd.notna(row.get('Username')):
-                            config.set(repo_id, 'username', str(row.get('Username')))
-                        if pd.notna(row.get('Password')):
-                            config.set(repo_id, 'password', str(row.get('Password')))
-                        if pd.notna(row.get('Check Interval')):
-                            config.set(repo_id, 'check_interval', str(row.get('Check Interval')))
-                        if pd.notna(row.get('Local Working Copy')):
-                            config.set(repo_id, 'local_working_copy', str(row.get('Local Working Copy')))
-                        if pd.notna(row.get('Notify On Changes')):
-                            config.set(repo_id, 'notify_on_changes', str(row.get('Notify On Changes')))
-            except Exception as e:
-                logger.warning(f"Error loading repository configs from Excel: {str(e)}")
-            
-            # Try to load global configs sheet
-            try:
-                global_df = pd.read_excel(excel_file, sheet_name='Global Configs')
-                
-                for _, row in global_df.iterrows():
-                    section = row.get('Section')
-                    key = row.get('Key')
-                    value = row.get('Value')
-                    
-                    if section and key is not None and pd.notna(key):
-                        if section not in config:
-                            config.add_section(section)
-                        config.set(section, key, str(value))
-            except Exception as e:
-                logger.warning(f"Error loading global configs from Excel: {str(e)}")
-            
-            # 检查是否成功加载了任何配置
-            if len(config.sections()) > 0:
-                logger.info("Configuration successfully loaded from Excel file")
-                return True
-            else:
-                logger.warning("No configuration sections were loaded from Excel file")
-                return False
-            
-        except ImportError:
-            logger.error("pandas library not installed. Cannot read Excel configuration.")
-            return False
-        except Exception as e:
-            logger.error(f"Error loading configuration from Excel: {str(e)}")
-            return False
-    
-    def _create_default_config(self):
-        """Create default configuration Excel file instead of INI"""
-        try:
-            import pandas as pd
-            
-            # 确保配置目录存在
-            config_dir = os.path.dirname(self.config_file)
-            if not os.path.exists(config_dir):
-                os.makedirs(config_dir, exist_ok=True)
-                logger.info(f"Created configuration directory: {config_dir}")
-            
-            # 创建仓库配置数据 - 使用更合理的默认值
-            repo_data = {
-                'Repository ID': ['REPO_1'],
-                'Repository Name': ['Demo Repository'],
-                'Repository Path': ['https://svn.apache.org/repos/asf/subversion/trunk'],
-                'URL': ['https://svn.apache.org/repos/asf/subversion/trunk'],
-                'Username': [''],
-                'Password': [''],
-                'Check Interval': [DEFAULT_CHECK_INTERVAL],
-                'Local Working Copy': [os.path.join(os.path.dirname(self.config_file), '..', 'svn_wc', 'repo_1')],
-                'Notify On Changes': [False],
-                'Recipients': ['admin@example.com']
-            }
-            
-            # 创建全局配置数据
-            global_data = {
-                'Section': ['EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'LOGGING', 'LOGGING', 'SYSTEM', 'SYSTEM', 'SYSTEM'],
-                'Key': ['smtp_server', 'smtp_port', 'use_ssl', 'username', 'password', 'from_email', 'to_emails', 'log_file', 'log_level', 'auto_startup', 'mode', 'use_remote_check'],
-                'Value': ['smtp.example.com', '465', 'True', 'svn@example.com', 'your_password', 'svn@example.com', 'admin@example.com', 'svn_monitor.log', 'INFO', 'True', 'monitor', 'False']
-            }
-            
-            # 创建DataFrame
-            repo_df = pd.DataFrame(repo_data)
-            global_df = pd.DataFrame(global_data)
-            
-            # 保存为Excel文件
-            with pd.ExcelWriter(self.config_file, engine='openpyxl') as writer:
-                repo_df.to_excel(writer, sheet_name='Repository Configs', index=False)
-                global_df.to_excel(writer, sheet_name='Global Configs', index=False)
-            
-            logger.info(f"Default configuration Excel created at {self.config_file}")
-            return True
-        except ImportError:
-            logger.error("pandas library not installed. Cannot create Excel configuration.")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to create default configuration Excel: {str(e)}")
-            return False
-    
-    def _create_minimal_config(self):
-        """Create minimal fallback configuration when Excel creation fails"""
-        config = configparser.ConfigParser()
-        
-        config.add_section('SVN')
-        config.set('SVN', 'url', 'https://svn.apache.org/repos/asf/subversion/trunk')
-        config.set('SVN', 'repository_path', 'https://svn.apache.org/repos/asf/subversion/trunk')
-        config.set('SVN', 'username', '')
-        config.set('SVN', 'password', '')
-        config.set('SVN', 'check_interval', str(DEFAULT_CHECK_INTERVAL))
-        config.set('SVN', 'local_working_copy', os.path.join(os.getcwd(), 'svn_wc'))
-        
-        config.add_section('EMAIL')
-        config.set('EMAIL', 'smtp_server', 'smtp.example.com')
-        config.set('EMAIL', 'smtp_port', '465')
-        config.set('EMAIL', 'use_ssl', 'True')
-        config.set('EMAIL', 'username', '')
-        config.set('EMAIL', 'password', '')
-        config.set('EMAIL', 'from_email', 'svn@example.com')
-        config.set('EMAIL', 'to_emails', 'admin@example.com')
-        
-        config.add_section('LOGGING')
-        config.set('LOGGING', 'log_file', 'svn_monitor.log')
-        config.set('LOGGING', 'log_level', 'INFO')
-        
-        config.add_section('SYSTEM')
-        config.set('SYSTEM', 'auto_startup', 'False')
-        config.set('SYSTEM', 'mode', 'monitor')
-        config.set('SYSTEM', 'use_remote_check', 'False')
-        
-        config.add_section('REPO_1')
-        config.set('REPO_1', 'name', 'Default Repository')
-        config.set('REPO_1', 'url', 'https://svn.apache.org/repos/asf/subversion/trunk')
-        config.set('REPO_1', 'repository_path', 'https://svn.apache.org/repos/asf/subversion/trunk')
-        config.set('REPO_1', 'username', '')
-        config.set('REPO_1', 'password', '')
-        config.set('REPO_1', 'check_interval', str(DEFAULT_CHECK_INTERVAL))
-        config.set('REPO_1', 'local_working_copy', os.path.join(os.getcwd(), 'svn_wc', 'repo_1'))
-        config.set('REPO_1', 'notify_on_changes', 'False')
-        
-        return config
-    
-    def _get_repositories(self):
-        """Get all repository configurations from the config file"""
-        repositories = {}
-        for section in self.config.sections():
-            if section.startswith('REPO_'):
-                repo_name = section[5:]  # Remove 'REPO_' prefix
-                repositories[repo_name] = self.config[section]
-        return repositories
-        
-    def _convert_relative_paths(self):
-        """Convert relative paths in configuration to absolute paths based on project directory"""
-        # 使用项目目录作为基础目录（脚本所在目录）
-        base_dir = os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv else os.getcwd()
-        
-        # 确保所有相对路径都转换为绝对路径，基于项目目录
-        
-        # Convert paths in main SVN section if it exists
-        if 'SVN' in self.config:
-            for key in ['local_working_copy', 'local_path', 'repository_path', 'url']:
-                if key in self.config['SVN']:
-                    path = self.config['SVN'][key]
-                    # 仅对文件路径进行转换，URL类型的路径保持不变
-                    if path and not os.path.isabs(path) and not (path.startswith('http://') or path.startswith('https://')):
-                        self.config['SVN'][key] = os.path.normpath(os.path.join(base_dir, path))
-        
-        # Convert paths in each repository configuration
-        for repo_name, repo_config in self.repositories.items():
-            for key in ['local_working_copy', 'repository_path']:
-                if key in repo_config:
-                    path = repo_config[key]
-                    # 仅对文件路径进行转换，URL类型的路径保持不变
-                    if path and not os.path.isabs(path) and not (path.startswith('http://') or path.startswith('https://')):
-                        abs_path = os.path.normpath(os.path.join(base_dir, path))
-                        # Update in both the repositories dictionary and the config object
-                        repo_config[key] = abs_path
-                        self.config[f'REPO_{repo_name}'][key] = abs_path
-        
-        # Convert log file path
-        if 'LOGGING' in self.config and 'log_file' in self.config['LOGGING']:
-            log_file = self.config['LOGGING']['log_file']
-            if log_file and not os.path.isabs(log_file):
-                self.config['LOGGING']['log_file'] = os.path.normpath(os.path.join(base_dir, log_file))
-        
-        logger.info(f"Relative paths converted to absolute paths using base directory: {base_dir}")
-    
-    def _create_default_repository_config(self):
-        """Create a default repository configuration"""
-        self.config['REPO_1'] = {
-            'name': 'Demo Repository',
-            'repository_path': 'https://svn.apache.org/repos/asf/subversion/trunk',
-            'username': '',
-            'password': '',
-            'check_interval': str(DEFAULT_CHECK_INTERVAL),  # in seconds
-            'local_working_copy': os.path.join(os.getcwd(), 'svn_wc', 'repo_1'),
-            'enable_notifications': 'False',
-            'enable_backup': 'False'
-        }
-        
-        # Save the updated configuration
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                self.config.write(f)
-            logger.info("Default repository configuration created")
-        except Exception as e:
-            logger.error(f"Failed to save default repository configuration: {str(e)}")
-    
-    def _get_last_recorded_revisions(self):
-        """Get the last recorded revisions for all repositories"""
-        revisions = {}
-        revision_file = 'last_revisions.json'
-        
-        if os.path.exists(revision_file):
-            try:
-                import json
-                with open(revision_file, 'r') as f:
-                    loaded_revisions = json.load(f)
-                    
-                # Only keep revisions for repositories that actually exist in configuration
-                for repo_name in self.repositories:
-                    if repo_name in loaded_revisions:
-                        revisions[repo_name] = loaded_revisions[repo_name]
-            except Exception as e:
-                logger.error(f"Failed to read last revisions: {str(e)}")
-        
-        # Initialize revisions for repositories without recorded data
-        for repo_name in self.repositories:
-            if repo_name not in revisions:
-                revisions[repo_name] = 0
-        
-        return revisions
-    
-    def _get_remote_check_setting(self):
-        """获取远程检测模式配置"""
-        if 'SYSTEM' in self.config and 'use_remote_check' in self.config['SYSTEM']:
-            value = self.config['SYSTEM']['use_remote_check']
-            return str(value).lower() in ('true', '1', 'yes', 'on')
-        return False
-    
-    def _handle_sigterm(self, signum, frame):
-        """处理终止信号(SIGTERM和SIGINT)
-        
-        Args:
-            signum: 信号编号
-            frame: 当前堆栈帧
-        """
-        logger.info(f"收到终止信号 {signum}，准备优雅退出")
-        self.log_operation('INFO', f"SVN Monitor收到终止信号 {signum}，准备优雅退出")
-        self.running = False
-    
-    def _save_last_revisions(self, revisions):
-        """Save the last revisions for all repositories"""
-        revision_file = 'last_revisions.json'
-        try:
-            import json
-            with open(revision_file, 'w') as f:
-                json.dump(revisions, f)
-            logger.info(f"Last revisions updated")
-        except Exception as e:
-            logger.error(f"Failed to save last revisions: {str(e)}")
-    
-    def _load_repo_name_mapping(self):
-        """动态从Excel加载仓库名称映射关系
-        
-        Returns:
-            dict: 双向映射字典，包含英文到中文、中文到英文的映射
-        """
-        mapping = {}
-        
-        # 从完整配置Excel加载仓库信息
-        if os.path.exists(self.config_file):
-            try:
-                import pandas as pd
-                
-                # 尝试从完整配置Excel加载
-                repo_df = pd.read_excel(self.config_file, sheet_name='Repository Configs')
-                
-                # 检查是否有必要的列
-                if 'Repository ID' in repo_df.columns and 'Repository Name' in repo_df.columns:
-                    for _, row in repo_df.iterrows():
-                        repo_id = row.get('Repository ID')
-                        repo_name = row.get('Repository Name')
-                        
-                        if pd.notna(repo_id) and pd.notna(repo_name):
-                            repo_id_str = str(repo_id).strip()
-                            repo_name_str = str(repo_name).strip()
-                            
-                            # 添加双向映射
-                            mapping[repo_id_str] = f"{repo_name_str}仓库"  # 例如：REPO_1 -> 采购仓库
-                            mapping[f"{repo_name_str}仓库"] = repo_id_str  # 例如：采购仓库 -> REPO_1
-                            mapping[repo_name_str] = repo_id_str  # 简写形式：采购 -> REPO_1
-                
-                # 添加一些常见的别名映射（向后兼容）
-                mapping['Procurement'] = '采购仓库'
-                mapping['Production'] = '生产仓库'
-                
-                logger.info(f"成功加载仓库名称映射关系: {mapping}")
-            except Exception as e:
-                logger.warning(f"从Excel加载仓库名称映射失败: {str(e)}")
-                # 使用默认映射作为备份
-                mapping = self._get_default_repo_mapping()
-        else:
-            # 使用默认映射作为备份
-            mapping = self._get_default_repo_mapping()
-            
-        return mapping
-    
-    def _get_default_repo_mapping(self):
-        """获取默认的仓库名称映射（作为备份）"""
-        return {
-            'REPO_1': '采购仓库',
-            'REPO_2': '生产仓库',
-            'REPO_3': '研发仓库',
-            'REPO_4': '质量仓库',
-            'REPO_5': '售后仓库',
-            '采购仓库': 'REPO_1',
-            '生产仓库': 'REPO_2',
-            '研发仓库': 'REPO_3',
-            '质量仓库': 'REPO_4',
-            '售后仓库': 'REPO_5',
-            '采购': 'REPO_1',
-            '生产': 'REPO_2',
-            '研发': 'REPO_3',
-            '质量': 'REPO_4',
-            '售后': 'REPO_5',
-            'Procurement': '采购仓库',
-            'Production': '生产仓库'
-        }
-    
-    def _load_recipients_from_excel(self):
-        """从Excel文件中加载收件人信息
-        
-        支持两种格式：
-        1. 完整配置Excel（svn_monitor_config.xlsx）：从'Repository Configs'工作表加载
-        2. 旧版收件人Excel：从第一列和第二列加载
-        
-        Returns:
-            dict: 仓库名称到收件人列表的映射
-        """
-        recipients_mapping = {}
-        
-        # 首先检查是否存在完整配置Excel文件
-        # 使用与主配置文件相同的路径
-        excel_config_file = self.config_file
-        if os.path.exists(excel_config_file):
-            try:
-                import pandas as pd
-                
-                # 尝试从完整配置Excel加载
-                repo_df = pd.read_excel(excel_config_file, sheet_name='Repository Configs')
-                
-                # 检查是否有Recipients列
-                if 'Recipients' in repo_df.columns:
-                    for _, row in repo_df.iterrows():
-                        # 获取仓库ID或名称
-                        repo_id = row.get('Repository ID') or row.get('Repository Name')
-                        if pd.notna(repo_id):
-                            repo_name = str(repo_id).strip()
-                            recipients_str = row.get('Recipients')
-                            
-                            if pd.notna(recipients_str):
-                                # 分割多个邮箱地址
-                                recipients = [email.strip() for email in str(recipients_str).split(';') if email.strip()]
-                                if recipients:
-                                    recipients_mapping[repo_name] = recipients
-                                    logger.info(f"从完整配置Excel加载仓库 '{repo_name}' 的收件人: {', '.join(recipients)}")
-                
-                logger.info(f"成功从完整配置Excel加载 {len(recipients_mapping)} 个仓库的收件人信息")
-                return recipients_mapping
-                
-            except Exception as e:
-                logger.warning(f"从完整配置Excel加载收件人失败: {str(e)}，尝试使用旧版收件人配置")
-        
-        # 如果完整配置Excel不存在或加载失败，尝试使用旧版收件人Excel
-        if 'EMAIL' in self.config and 'recipients_excel' in self.config['EMAIL']:
-            excel_path = self.config['EMAIL']['recipients_excel']
-            
-            # 确保路径是绝对路径
-            if not os.path.isabs(excel_path):
-                base_dir = os.path.dirname(os.path.abspath(self.config_file))
-                excel_path = os.path.normpath(os.path.join(base_dir, excel_path))
-            
-            # 检查pandas是否已安装
-            if pd is None:
-                logger.warning(f"pandas库未安装，无法读取收件人Excel文件: {excel_path}")
-                return recipients_mapping
-            
-            # 检查文件是否存在
-            if not os.path.exists(excel_path):
-                logger.warning(f"收件人Excel文件不存在: {excel_path}")
-                return recipients_mapping
-            
-            try:
-                # 读取Excel文件
-                df = pd.read_excel(excel_path)
-                
-                # 检查必要的列是否存在
-                if df.empty:
-                    logger.warning(f"收件人Excel文件为空: {excel_path}")
-                    return recipients_mapping
-                
-                # 获取列名（使用前两列）
-                columns = df.columns.tolist()
-                if len(columns) < 2:
-                    logger.warning(f"收件人Excel文件格式不正确，至少需要两列: {excel_path}")
-                    return recipients_mapping
-                
-                repo_col = columns[0]
-                email_col = columns[1]
-                
-                # 处理每一行数据
-                for _, row in df.iterrows():
-                    repo_name = str(row[repo_col]).strip()
-                    email_str = str(row[email_col]).strip()
-                    
-                    # 跳过空值
-                    if repo_name and email_str and repo_name.lower() != 'nan' and email_str.lower() != 'nan':
-                        # 分割多个邮箱地址
-                        recipients = [email.strip() for email in email_str.split(';') if email.strip()]
-                        if recipients:
-                            recipients_mapping[repo_name] = recipients
-                            logger.info(f"从Excel加载仓库 '{repo_name}' 的收件人: {', '.join(recipients)}")
-                
-                logger.info(f"成功从旧版收件人Excel加载 {len(recipients_mapping)} 个仓库的收件人信息")
-            except Exception as e:
-                logger.error(f"读取旧版收件人Excel文件时出错: {str(e)}")
-        
-        return recipients_mapping
-    
-    def _get_recipients_for_repository(self, repo_name):
-        """获取指定仓库的收件人列表
-        
-        Args:
-            repo_name: 仓库名称
-            
-        Returns:
-            str: 收件人邮箱字符串（逗号分隔）
-        """
-        logger.info(f"尝试获取仓库 '{repo_name}' 的收件人")
-        logger.info(f"当前recipients_mapping: {self.recipients_mapping}")
-        
-        # 首先尝试直接匹配
-        if repo_name in self.recipients_mapping:
-            recipients = self.recipients_mapping[repo_name]
-            logger.info(f"使用Excel中配置的仓库 '{repo_name}' 的收件人: {', '.join(recipients)}")
-            return ', '.join(recipients)
-        
-        # 检查是否需要映射到英文名称（使用动态映射）
-        mapped_repo_name = self.repo_name_mapping.get(repo_name)
-        if mapped_repo_name and mapped_repo_name in self.recipients_mapping:
-            recipients = self.recipients_mapping[mapped_repo_name]
-            logger.info(f"使用Excel中配置的仓库 '{mapped_repo_name}' (映射自 '{repo_name}') 的收件人: {', '.join(recipients)}")
-            return ', '.join(recipients)
-        
-        # 如果直接匹配失败，尝试添加'REPO_'前缀
-        repo_with_prefix = f'REPO_{repo_name}'
-        if repo_with_prefix in self.recipients_mapping:
-            recipients = self.recipients_mapping[repo_with_prefix]
-            logger.info(f"使用Excel中配置的仓库 '{repo_with_prefix}' 的收件人: {', '.join(recipients)}")
-            return ', '.join(recipients)
-        
-        # 尝试移除可能的前缀
-        if repo_name.startswith('REPO_'):
-            repo_without_prefix = repo_name[5:]
-            if repo_without_prefix in self.recipients_mapping:
-                recipients = self.recipients_mapping[repo_without_prefix]
-                logger.info(f"使用Excel中配置的仓库 '{repo_without_prefix}' 的收件人: {', '.join(recipients)}")
-                return ', '.join(recipients)
-        
-        # 如果recipients_mapping不为空，尝试从Excel中获取所有收件人
-        if self.recipients_mapping:
-            all_excel_recipients = set()
-            for repo, recipients in self.recipients_mapping.items():
-                all_excel_recipients.update(recipients)
-            if all_excel_recipients:
-                logger.info(f"未找到特定仓库的收件人，使用Excel中所有的收件人: {', '.join(all_excel_recipients)}")
-                return ', '.join(all_excel_recipients)
-        
-        # 如果Excel中没有配置，使用默认收件人
-        default_recipients = self.config['EMAIL'].get('to_emails', '')
-        logger.info(f"使用默认收件人: {default_recipients}")
-        return default_recipients
-    
-    def process_commit(self, repository_path, revision):
-        """Process a single commit triggered by SVN hook
-        
-        Args:
-            repository_path: Path to the SVN repository
-            revision: The revision number of the commit
-        """
-        try:
-            revision = int(revision)
-            logger.info(f"Processing commit for repository: {repository_path}, revision: {revision}")
-            
-            # Find the matching repository configuration
-            matching_repo = None
-            matching_repo_name = None
-            
-            for repo_name, repo_config in self.repositories.items():
-                if 'repository_path' in repo_config:
-                    # Check if the repository path matches
-                    if repository_path in repo_config['repository_path'] or \
-                       repo_config['repository_path'] in repository_path:
-                        matching_repo = repo_config
-                        matching_repo_name = repo_name
-                        break
-            
-            if not matching_repo:
-                logger.warning(f"No matching repository configuration found for: {repository_path}")
-                # Try to use the first repository config as fallback
-                if self.repositories:
-                    matching_repo_name, matching_repo = next(iter(self.repositories.items()))
-                    logger.warning(f"Using fallback repository configuration: {matching_repo_name}")
-                else:
-                    logger.error("No repository configurations available")
-                    return
-            
-            # Get the last recorded revision
-            last_revision = self.last_revisions.get(matching_repo_name, 0)
-            
-            # Only process if this is a new revision
-            if revision > last_revision:
-                logger.info(f"New commit detected: {last_revision} -> {revision}")
-                
-                # Log the operation
-                self.log_operation('COMMIT_PROCESSED', 
-                                  f"Processing commit: {last_revision} -> {revision}",
-                                  repository=matching_repo_name)
-                
-                # Get the changes
-                changes = self.get_changes(last_revision, revision, matching_repo)
-                
-                # Send notification if enabled
-                if matching_repo.get('notify_on_changes', 'True').lower() == 'true' and changes:
-                    email_success = self.send_email_notification(changes)
-                    
-                    # Update revision if email was sent successfully
-                    if email_success:
-                        logger.info(f"Email notification successful for revision {revision}")
-                        self.last_revisions[matching_repo_name] = revision
-                        self._save_last_revisions(self.last_revisions)
-                    else:
-                        logger.warning(f"Email notification failed for revision {revision}")
-                else:
-                    # Update revision even if notifications are disabled
-                    self.last_revisions[matching_repo_name] = revision
-                    self._save_last_revisions(self.last_revisions)
-            else:
-                logger.info(f"Revision {revision} has already been processed")
-                
-        except Exception as e:
-            error_msg = f"Error processing commit: {str(e)}"
-            logger.error(error_msg)
-            self.log_operation('ERROR', error_msg)
-    
-    def _try_svn_cleanup(self, working_dir, repo_config=None):
-        """尝试执行SVN清理操作来解除锁定"""
-        try:
-            if not working_dir:
-                logger.warning("无法执行SVN清理：工作目录为空")
-                return False
-            
-            # 检查工作目录是否存在
-            if not os.path.exists(working_dir):
-                logger.warning(f"工作目录不存在，无法清理: {working_dir}")
-                return False
-            
-            # 检查是否为SVN工作副本
-            svn_dir = os.path.join(working_dir, '.svn')
-            if not os.path.exists(svn_dir):
-                logger.warning(f"目录不是SVN工作副本，无法清理: {working_dir}")
-                return False
-            
-            logger.info(f"执行SVN清理操作: {working_dir}")
-            
-            # 构建清理命令 - 使用绝对路径确保正确性
-            cleanup_command = ['svn', 'cleanup', working_dir]
-            
-            # 添加凭据（如果可用）
-            # 首先尝试从仓库配置获取凭据
-            username = None
-            password = None
-            
-            if repo_config and 'username' in repo_config and 'password' in repo_config:
-                if repo_config['username'] and repo_config['password']:
-                    username = repo_config['username']
-                    password = repo_config['password']
-            # 如果仓库配置没有凭据，尝试从全局配置获取
-            elif 'SVN' in self.config:
-                if self.config['SVN'].get('username') and self.config['SVN'].get('password'):
-                    username = self.config['SVN']['username']
-                    password = self.config['SVN']['password']
-            
-            # 如果有凭据，添加到命令中
-            if username and password:
-                cleanup_command.extend(['--username', username])
-                cleanup_command.extend(['--password', password])
-                cleanup_command.append('--non-interactive')
-                cleanup_command.append('--trust-server-cert')
-                cleanup_command.append('--trust-server-cert-failures')
-                cleanup_command.append('unknown-ca,cn-mismatch,expired,not-yet-valid,other')
-            
-            # 执行清理命令
-            result = subprocess.run(
-                cleanup_command,
-                capture_output=True,
-                cwd=working_dir,  # 在工作目录中执行清理
-                check=True
-            )
-            
-            logger.info(f"SVN清理成功: {result.stdout.strip() if result.stdout else '无输出'}")
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            # 处理错误消息编码
-            if isinstance(e.stderr, bytes):
-                try:
-                    error_message = e.stderr.decode('utf-8', errors='replace')
-                except UnicodeDecodeError:
-                    error_message = e.stderr.decode('gbk', errors='replace')
-            else:
-                error_message = e.stderr
-            
-            logger.error(f"SVN清理失败: {error_message}")
-            
-            # 如果清理失败，尝试手动删除锁定文件
-            if 'locked' in error_message.lower():
-                logger.info("尝试手动删除锁定文件")
-                manual_cleanup_success = self._remove_svn_locks_manually(working_dir)
-                
-                # 手动删除锁定文件后，重试SVN清理操作
-                if manual_cleanup_success:
-                    logger.info("手动锁定文件删除成功，重试SVN清理")
-                    try:
-                        # 重新执行清理命令
-                        result = subprocess.run(
-                            cleanup_command,
-                            capture_output=True,
-                            cwd=working_dir,
-                            check=True
-                        )
-                        logger.info(f"重试SVN清理成功: {result.stdout.strip() if result.stdout else '无输出'}")
-                        return True
-                    except subprocess.CalledProcessError as retry_e:
-                        logger.error(f"重试SVN清理仍然失败: {retry_e.stderr}")
-                        return False
-                else:
-                    logger.error("手动锁定文件删除失败")
-                    return False
-            
-            return False
-        except Exception as e:
-            logger.error(f"执行SVN清理时出错: {str(e)}")
-            return False
-    
-    def _remove_svn_locks_manually(self, working_dir):
-        """手动删除SVN锁定文件"""
-        try:
-            svn_dir = os.path.join(working_dir, '.svn')
-            if not os.path.exists(svn_dir):
-                logger.warning(f"SVN目录不存在: {svn_dir}")
-                return False
-            
-            # 查找并删除锁定文件
-            lock_files = []
-            for root, dirs, files in os.walk(svn_dir):
-                for file in files:
-                    if 'lock' in file.lower():
-                        lock_files.append(os.path.join(root, file))
-            
-            if not lock_files:
-                logger.info("未找到锁定文件")
-                return False
-            
-            # 删除所有锁定文件
-            for lock_file in lock_files:
-                try:
-                    os.remove(lock_file)
-                    logger.info(f"删除锁定文件: {lock_file}")
-                except Exception as e:
-                    logger.warning(f"无法删除锁定文件 {lock_file}: {str(e)}")
-            
-            logger.info("手动锁定文件删除完成")
-            return True
-            
-        except Exception as e:
-            logger.error(f"手动删除锁定文件失败: {str(e)}")
-            return False
-    
-    def _get_safe_command_string(self, command):
-        """获取安全的命令字符串，隐藏用户名和密码信息
-        
-        Args:
-            command: 命令列表
-            
-        Returns:
-            str: 安全的命令字符串
-        """
-        safe_command = []
-        i = 0
-        while i < len(command):
-            if command[i] in ['--username', '--password']:
-                # 跳过用户名和密码参数，用***代替
-                safe_command.append(command[i])
-                safe_command.append('***')
-                i += 2  # 跳过参数值
-            else:
-                safe_command.append(command[i])
-                i += 1
-        return ' '.join(safe_command)
-    
-    def _run_svn_command(self, command, repo_config=None, working_dir=None, is_retry=False, output_raw_log=False):
-        """运行SVN命令并返回输出
-        
-        Args:
-            command: SVN命令列表
-            repo_config: 仓库配置字典
-            working_dir: 工作目录
-            is_retry: 是否为重试调用（避免参数重复）
-            output_raw_log: 是否输出原始SVN日志
-        """
-        try:
-            # 添加SVN凭据（如果可用），仅在非重试调用时添加
-            if not is_retry:
-                # 首先尝试从仓库配置获取凭据
-                username = None
-                password = None
-                
-                if repo_config and 'username' in repo_config and 'password' in repo_config:
-                    if repo_config['username'] and repo_config['password']:
-                        username = repo_config['username']
-                        password = repo_config['password']
-                # 如果仓库配置没有凭据，尝试从全局配置获取
-                elif 'SVN' in self.config:
-                    if self.config['SVN'].get('username') and self.config['SVN'].get('password'):
-                        username = self.config['SVN']['username']
-                        password = self.config['SVN']['password']
-                
-                # 如果有凭据，添加到命令中
-                if username and password:
-                    # 检查是否已经包含凭据参数，避免重复添加
-                    if '--username' not in command:
-                        command.extend(['--username', username])
-                    if '--password' not in command:
-                        command.extend(['--password', password])
-                    if '--non-interactive' not in command:
-                        command.append('--non-interactive')
-                    if '--trust-server-cert' not in command:
-                        command.append('--trust-server-cert')
-                    if '--trust-server-cert-failures' not in command:
-                        command.append('--trust-server-cert-failures')
-                        command.append('unknown-ca,cn-mismatch,expired,not-yet-valid,other')
-            
-            # 在Windows中文环境下，SVN输出可能是GBK编码，使用通用方法处理
-            # 确保传递环境变量，特别是OPENSSL_CONF
-            env = os.environ.copy()
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                cwd=working_dir,
-                env=env,
-                check=True
-            )
-            
-            # 处理输出编码问题
-            if result.stdout:
-                if isinstance(result.stdout, bytes):
-                    # 尝试UTF-8解码，如果失败则使用GBK解码
-                    try:
-                        decoded_output = result.stdout.decode('utf-8').strip()
-                    except UnicodeDecodeError:
-                        decoded_output = result.stdout.decode('gbk').strip()
-                else:
-                    decoded_output = result.stdout.strip()
-                
-                # 输出原始SVN日志（使用安全的命令字符串）
-                if output_raw_log:
-                    safe_command = self._get_safe_command_string(command)
-                    logger.info(f"[SVN原始日志] 命令: {safe_command}")
-                    logger.info(f"[SVN原始日志] 输出: {decoded_output}")
-                    
-                return decoded_output
-            return ''
-        except subprocess.CalledProcessError as e:
-            # 确保错误消息正确解码，处理中文编码问题
-            if isinstance(e.stderr, bytes):
-                # 尝试UTF-8解码，如果失败则使用GBK解码（Windows中文环境）
-                try:
-                    error_message = e.stderr.decode('utf-8', errors='replace')
-                except UnicodeDecodeError:
-                    error_message = e.stderr.decode('gbk', errors='replace')
-            else:
-                error_message = e.stderr
-            
-            # 输出原始SVN错误日志（使用安全的命令字符串）
-            safe_command = self._get_safe_command_string(command)
-            logger.info(f"[SVN原始错误日志] 命令: {safe_command}")
-            logger.info(f"[SVN原始错误日志] 错误: {error_message}")
-            
-            # 检测SVN锁定错误并尝试自动清理
-            if 'locked' in error_message.lower() or 'cleanup' in error_message.lower():
-                logger.warning(f"检测到SVN锁定错误，尝试自动清理: {error_message}")
-                
-                # 尝试执行svn cleanup命令
-                cleanup_success = self._try_svn_cleanup(working_dir, repo_config)
-                if cleanup_success:
-                    logger.info("SVN清理成功，重试原始命令")
-                    # 重试原始命令，传递is_retry=True避免参数重复
-                    try:
-                        return self._run_svn_command(command, repo_config, working_dir, is_retry=True)
-                    except Exception:
-                        # 如果重试仍然失败，返回空字符串
-                        logger.error("重试SVN命令仍然失败")
-                        return ''
-                else:
-                    logger.error("SVN清理失败，无法解除锁定")
-                    # 即使清理失败，也尝试重试一次原始命令（可能锁定已被手动删除）
-                    try:
-                        logger.info("尝试重试原始命令（可能锁定已被手动删除）")
-                        return self._run_svn_command(command, repo_config, working_dir, is_retry=True)
-                    except Exception:
-                        logger.error("重试SVN命令仍然失败")
-                        return ''
-            
-            logger.error(f"SVN命令失败: {command}\n错误: {error_message}")
-            return ''
-        except Exception as e:
-            logger.error(f"运行SVN命令时出错: {str(e)}")
-            return ''
-    
-    def _ensure_working_copy(self, repo_config):
-        """确保本地工作副本存在且是最新的"""
-        working_copy = repo_config['local_working_copy']
-        repo_path = repo_config['repository_path']
-        
-        try:
-            # 确保父目录存在
-            parent_dir = os.path.dirname(working_copy)
-            if parent_dir and not os.path.exists(parent_dir):
-                os.makedirs(parent_dir, exist_ok=True)
-            
-            # 如果工作副本存在，先检查.svn目录是否存在，避免不必要的状态检查
-            if os.path.exists(working_copy):
-                logger.info(f"检查工作副本: {working_copy}")
-                
-                # 检查是否是有效的SVN工作副本
-                if not os.path.exists(os.path.join(working_copy, '.svn')):
-                    logger.warning(f"目录存在但不是工作副本，删除: {working_copy}")
-                    import shutil
-                    shutil.rmtree(working_copy)
-                else:
-                    # 只有在.svn目录存在的情况下才进行状态检查
-                    logger.info(f"工作副本有效，跳过状态检查以提升性能")
-                    # 注释：为了提升性能，我们假设工作副本正常，只在更新失败时才处理锁定问题
-            
-            # 清理目录如果存在但不是工作副本
-            if os.path.exists(working_copy) and not os.path.exists(os.path.join(working_copy, '.svn')):
-                logger.info(f"目录存在但不是工作副本，删除: {working_copy}")
-                import shutil
-                shutil.rmtree(working_copy)
-            
-            if not os.path.exists(working_copy):
-                logger.info(f"创建工作副本: {working_copy}")
-                # 对于checkout，需要在父目录中运行命令
-                self._run_svn_command(['svn', 'checkout', repo_path, os.path.basename(working_copy)], 
-                                     repo_config, working_dir=parent_dir or os.getcwd())
-            else:
-                logger.info(f"更新工作副本: {working_copy}")
-                # 优化更新策略：先执行cleanup，然后尝试快速更新，如果失败再尝试修复
-                try:
-                    # 在更新前先执行cleanup操作
-                    logger.info(f"在更新前先执行SVN清理: {working_copy}")
-                    self._try_svn_cleanup(working_copy, repo_config)
-                    # 尝试快速更新
-                    logger.info(f"执行SVN更新: {working_copy}")
-                    self._run_svn_command(['svn', 'update', '--accept', 'theirs-full', working_copy], repo_config, output_raw_log=True)
-                except Exception as update_error:
-                    logger.warning(f"快速更新失败，尝试修复工作副本: {str(update_error)}")
-                    
-                    # 检查是否有缺失文件问题
-                    try:
-                        status_result = self._run_svn_command(['svn', 'status'], repo_config, working_dir=working_copy)
-                        if '!' in status_result:
-                            logger.info("检测到缺失文件，执行修复操作")
-                            # 先执行清理
-                            self._try_svn_cleanup(working_copy, repo_config)
-                            # 然后执行revert恢复缺失文件
-                            self._run_svn_command(['svn', 'revert', '-R', working_copy], repo_config)
-                            # 最后重新更新
-                            self._run_svn_command(['svn', 'update', '--accept', 'theirs-full', working_copy], repo_config)
-                        else:
-                            # 其他错误，尝试清理后重试
-                            self._try_svn_cleanup(working_copy, repo_config)
-                            self._run_svn_command(['svn', 'update', '--accept', 'theirs-full', working_copy], repo_config)
-                    except Exception as repair_error:
-                        logger.error(f"修复工作副本失败: {str(repair_error)}")
-                        raise update_error
-        except Exception as e:
-            logger.error(f"确保工作副本失败: {str(e)}")
-            raise
-    
-    def get_latest_revision(self, repo_config):
-        """Get the latest revision number of the repository"""
-        try:
-            # 根据检测模式选择不同的获取方式
-            if self.use_remote_check:
-                # 远程检测模式：直接通过SVN URL获取信息
-                repo_url = repo_config.get('repository_path', repo_config.get('url', ''))
-                if not repo_url:
-                    logger.error(f"No repository URL found in configuration")
-                    raise ValueError(f"No repository URL found in configuration")
-                
-                # 使用_run_svn_command方法获取远程仓库的最新版本号（支持认证和证书信任）
-                cmd = ['svn', 'info', repo_url, '--show-item', 'revision']
-                logger.info(f"Getting latest revision remotely for {repo_config.get('name', 'Unnamed Repository')}")
-                output = self._run_svn_command(cmd, repo_config)
-                
-                if not output:
-                    logger.warning(f"Empty output when getting latest revision")
-                    return 0
-                
-                return int(output)
-            else:
-                # 本地检测模式：更新本地工作副本后获取
-                self._ensure_working_copy(repo_config)
-                output = self._run_svn_command(
-                    ['svn', 'info', '--show-item', 'revision'],
-                    repo_config,
-                    working_dir=repo_config['local_working_copy']
-                )
-                return int(output)
-        except Exception as e:
-            logger.error(f"Failed to get latest revision: {str(e)}")
-            raise
-    
-    # get_file_diff method removed as AI analysis feature is no longer required
-    
-    # analyze_file_change method removed as AI analysis feature is no longer required
-    
-    def _get_paginated_svn_log(self, repo_config, from_revision, to_revision, repo_name):
-        """Get SVN log using pagination for large revision ranges
-        
-        Args:
-            repo_config: Repository configuration
-            from_revision: Starting revision
-            to_revision: Ending revision
-            repo_name: Repository name
-            
-        Returns:
-            str: Combined log output in XML format
-        """
-        try:
-            repo_url = repo_config.get('repository_path', repo_config.get('url', ''))
-            if not repo_url:
-                logger.error(f"No repository URL found in configuration for {repo_name}")
-                return ""
-            combined_logs = []
-            
-            # Use page size of 500 to avoid overwhelming the SVN server
-            page_size = 500
-            current_start = from_revision
-            
-            while current_start <= to_revision:
-                current_end = min(current_start + page_size - 1, to_revision)
-                
-                # Build SVN log command with revision range
-                cmd = [
-                    'svn', 'log', repo_url,
-                    '--xml', '--verbose',
-                    '-r', f'{current_start}:{current_end}'
-                ]
-                
-                logger.debug(f"Fetching SVN log for revisions {current_start} to {current_end}")
-                
-                try:
-                    # 使用_run_svn_command方法执行SVN命令，确保环境变量正确传递
-                    log_output = self._run_svn_command(cmd, repo_config)
-                    if log_output:
-                        combined_logs.append(log_output)
-                    else:
-                        logger.warning(f"Empty log output for revisions {current_start} to {current_end}")
-                        # If we get empty output, try to get individual revisions
-                        for rev in range(current_start, current_end + 1):
-                            try:
-                                single_cmd = [
-                                    'svn', 'log', repo_url,
-                                    '--xml', '--verbose',
-                                    '-r', str(rev)
-                                ]
-                                single_log = self._run_svn_command(single_cmd, repo_config)
-                                if single_log:
-                                    combined_logs.append(single_log)
-                            except Exception as e:
-                                logger.warning(f"Failed to get revision {rev}: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Error executing SVN log command: {str(e)}")
-                
-                # Move to next page
-                current_start = current_end + 1
-                
-                # Small delay to avoid overwhelming the SVN server
-                time.sleep(0.5)
-            
-            # Combine all log outputs
-            if combined_logs:
-                # Create a root XML element to wrap all log entries
-                root = ET.Element('log')
-                for log_xml in combined_logs:
-                    try:
-                        log_root = ET.fromstring(log_xml)
-                        for logentry in log_root.findall('.//logentry'):
-                            root.append(logentry)
-                    except ET.ParseError:
-                        logger.warning("Failed to parse individual log XML, skipping")
-                
-                # Convert back to XML string
-                return ET.tostring(root, encoding='unicode')
-            else:
-                return ""
-                
-        except Exception as e:
-            logger.error(f"Error in paginated SVN log retrieval: {str(e)}")
-            return ""
-
-    def get_changes(self, from_revision, to_revision, repo_config):
-        """Get changes between two revisions"""
-        logger.debug(f"Getting changes from revision {from_revision} to {to_revision}")
-        
-        try:
-            # Check if repo_config is valid
-            if not repo_config:
-                logger.error("Invalid repository configuration")
-                return [{
-                    'revision': to_revision,
-                    'author': 'unknown',
-                    'date': get_beijing_time_str(),
-                    'message': 'Invalid repository configuration',
-                    'changed_paths': [],
-                    'repository': 'Unknown Repository'
-                }]
-            
-            # Get repository name for logging
-            repo_name = repo_config.get('name', 'Unnamed Repository')
-            
-            # 根据检测模式选择不同的获取方式
-            if self.use_remote_check:
-                # 远程检测模式：直接通过SVN URL获取日志
-                repo_url = repo_config.get('repository_path', repo_config.get('url', ''))
-                if not repo_url:
-                    logger.error(f"No repository URL found in configuration for {repo_name}")
-                    return [{
-                        'revision': to_revision,
-                        'author': 'unknown',
-                        'date': get_beijing_time_str(),
-                        'message': 'Missing repository URL configuration',
-                        'changed_paths': [],
-                        'repository': repo_name
-                    }]
-                
-                logger.info(f"Getting changes remotely for {repo_name}")
-                # 使用分页方式获取SVN日志
-                output = self._get_paginated_svn_log(repo_config, from_revision, to_revision, repo_name)
-            else:
-                # 本地检测模式：更新本地工作副本后获取
-                # Check if local_working_copy is set
-                if 'local_working_copy' not in repo_config:
-                    logger.error("local_working_copy not set in repository configuration")
-                    return [{
-                        'revision': to_revision,
-                        'author': 'unknown',
-                        'date': get_beijing_time_str(),
-                        'message': 'Missing local_working_copy configuration',
-                        'changed_paths': [],
-                        'repository': repo_name
-                    }]
-                
-                self._ensure_working_copy(repo_config)
-                
-                # Calculate the number of revisions to fetch
-                revision_gap = to_revision - from_revision
-                
-                # Use the new approach: svn log --verbose -l N where N is the revision gap
-                # This limits the number of log entries fetched to exactly the number needed
-                limit_option = f'-l {revision_gap}' if revision_gap > 0 else '-l 1'
-                
-                # Build the SVN log command with limit option and revision range
-                # Use -r option to specify the revision range
-                revision_range = f'-r{from_revision+1}:{to_revision}' if from_revision > 1 else f'-r1:{to_revision}'
-                
-                cmd = ['svn', 'log', revision_range, limit_option, '--xml', '--verbose']
-                
-                logger.info(f"Getting SVN log for {repo_name} using range: {revision_range} and limit: {limit_option}")
-                
-                # Execute the SVN log command
-                output = self._run_svn_command(
-                    cmd,
-                    repo_config,
-                    working_dir=repo_config['local_working_copy']
-                )
-            
-            logger.debug(f"Raw SVN log result for {repo_name}: {output[:500]}..." if len(output) > 500 else f"Raw SVN log result for {repo_name}: {output}")
-            
-            # Ensure output is string type
-            if not isinstance(output, str):
-                output = str(output) if output is not None else ''
-            
-            # Fix: Properly get all changes, add additional logging
-            logger.info(f"Parsing SVN log output for {repo_name}, checking for multiple revisions")
-            changes = self._parse_svn_log(output, repo_name)
-            logger.info(f"Successfully parsed {len(changes)} changes from SVN log")
-            
-            # Removed AI analysis functionality, keeping only basic change records
-            for change in changes:
-                logger.debug(f"Parsed change for {repo_name} (rev {change.get('revision')}): {len(change.get('changed_paths', []))} files changed")
-                for path in change.get('changed_paths', []):
-                    logger.debug(f"  - {path.get('action')}: {path.get('path')}")
-            
-            return changes
-        except Exception as e:
-            logger.error(f"Failed to get changes: {str(e)}")
-            # Return a default change object to avoid crashing
-            return [{
-                'revision': to_revision,
-                'author': 'unknown',
-                'date': get_beijing_time().isoformat(),
-                'message': 'Unable to parse commit details',
-                'changed_paths': [],
-                'repository': repo_config.get('name', 'Unnamed Repository'),
-                'ai_analysis': 'Unable to parse commit details'
-            }]
-    
-    def _parse_svn_log(self, xml_log, repo_name):
-        """Parse SVN log XML output"""
-        changes = []
-        
-        try:
-            # Check if xml_log is empty, None, or not a string
-            if not xml_log or not isinstance(xml_log, str) or xml_log.strip() == '':
-                logger.warning("Empty or invalid SVN log output received")
-                return changes
-            
-            # Preprocess XML output by removing leading spaces and newlines
-            xml_log = xml_log.strip()
-            logger.info(f"Parsing SVN log XML of length: {len(xml_log)} characters")
-            
-            # Try to parse XML with error handling
-            try:
-                root = ET.fromstring(xml_log)
-                logger.info("Successfully parsed XML log")
-            except ET.ParseError as e:
-                logger.error(f"XML parsing error: {str(e)}")
-                logger.debug(f"XML content: {xml_log[:100]}...")
-                
-                # Try multiple fix methods
-                # 1. Check and fix XML declaration position issues
-                if "XML or text declaration not at start of entity" in str(e):
-                    # Try to find the first < opening tag
-                    first_tag_pos = xml_log.find('<')
-                    if first_tag_pos > 0:
-                        xml_log = xml_log[first_tag_pos:]
-                        try:
-                            root = ET.fromstring(xml_log)
-                            logger.info("Successfully parsed XML after removing leading characters")
-                        except:
-                            # If fixing fails, try wrapping
-                            if not xml_log.startswith('<log'):
-                                xml_log = f'<log>{xml_log}</log>'
-                            root = ET.fromstring(xml_log)
-                    else:
-                        # 2. Try wrapping as a complete XML document
-                        if not xml_log.startswith('<log>'):
-                            xml_log = f'<log>{xml_log}</log>'
-                        root = ET.fromstring(xml_log)
-            
-            # Debug: Print the XML structure
-            logger.debug(f"XML root tag: {root.tag}, children: {len(root)}")
-            
-            # Fix: Use multiple ways to find logentry elements to ensure all changes are captured
-            logentries = []
-            if root is not None:
-                try:
-                    # First try XPath query
-                    logentries = root.findall('.//logentry')
-                    logger.info(f"Found {len(logentries)} logentries using XPath")
-                    
-                    if not logentries:
-                        # If XPath fails, try direct child iteration
-                        logentries = [child for child in root if child.tag == 'logentry']
-                        logger.info(f"Found {len(logentries)} logentries using direct child access")
-                except Exception as e:
-                    logger.error(f"Error finding logentries: {str(e)}")
-            
-            # Fix: Ensure all log entries are processed in correct order
-            logger.info(f"Processing {len(logentries)} logentries for {repo_name}")
-            
-            for i, logentry in enumerate(logentries):
-                try:
-                    revision = int(logentry.get('revision', 0))
-                    author_elem = logentry.find('author')
-                    author = author_elem.text if author_elem is not None else 'unknown'
-                    date_elem = logentry.find('date')
-                    if date_elem is not None and date_elem.text:
-                        try:
-                            # Parse ISO format date string
-                            date_obj = datetime.datetime.fromisoformat(date_elem.text.replace('Z', '+00:00'))
-                            # Format to yyyy-MM-dd HH:mm:ss format
-                            date = date_obj.strftime('%Y-%m-%d %H:%M:%S')
-                        except Exception as e:
-                            logger.warning(f"Failed to parse date: {date_elem.text}, error: {str(e)}")
-                            # If parsing fails, use current time
-                            date = get_beijing_time_str()
-                    else:
-                        # If no date element, use current time
-                        date = get_beijing_time_str()
-                    msg_elem = logentry.find('msg')
-                    message = msg_elem.text.strip() if msg_elem is not None and msg_elem.text else ''
-                    
-                    # Get changed paths - add None check for paths_elem
-                    changed_paths = []
-                    paths_elem = logentry.find('paths')
-                    logger.debug(f"Parsing paths element for revision {revision}: {paths_elem is not None}")
-                    
-                    if paths_elem is not None:
-                        try:
-                            path_elements = paths_elem.findall('path')
-                            logger.info(f"Found {len(path_elements)} path elements in revision {revision}")
-                            
-                            for path in path_elements:
-                                action = path.get('action', 'M')
-                                path_name = path.text if path.text else ''
-                                
-                                # Skip empty paths
-                                if path_name.strip():
-                                    changed_paths.append({
-                                        'path': path_name,
-                                        'action': action
-                                    })
-                                    logger.debug(f"Added path: {action}: {path_name}")
-                                else:
-                                    logger.debug(f"Skipping empty path")
-                        except AttributeError as e:
-                            logger.error(f"AttributeError when finding paths: {str(e)}")
-                    
-                    logger.info(f"Revision {revision}: {len(changed_paths)} changed paths")
-                    
-                    # Create change record
-                    change_record = {
-                        'revision': revision,
-                        'author': author,
-                        'date': date,
-                        'message': message,
-                        'changed_paths': changed_paths,
-                        'repository': repo_name
-                    }
-                    
-                    # Add to result list
-                    changes.append(change_record)
-                    logger.info(f"Successfully added change record for revision {revision}")
-                    
-                except Exception as e:
-                    logger.error(f"Error parsing log entry {i}: {str(e)}")
-                    # Continue with other entries
-            
-            # Fix: Ensure all parsed changes are returned
-            logger.info(f"Total changes parsed: {len(changes)}")
-            return changes
-        except ET.ParseError as e:
-            logger.error(f"XML parsing error: {str(e)}")
-            logger.debug(f"Offending XML: {xml_log}")
-            # Return a minimal change object
-            return [{
-                'revision': 0,
-                'author': 'unknown',
-                'date': get_beijing_time().isoformat(),
-                'message': 'XML parsing error',
-                'changed_paths': [],
-                'repository': repo_name
-            }]
-        except Exception as e:
-            logger.error(f"Failed to parse SVN log: {str(e)}")
-            # Return a minimal change object
-            return [{
-                'revision': 0,
-                'author': 'unknown',
-                'date': get_beijing_time().isoformat(),
-                'message': 'Unknown error parsing log',
-                'changed_paths': [],
-                'repository': repo_name
-            }]
-    
-    def log_operation(self, operation_type, message, repository=None, change_details=None):
-        """Log script operation for tracking and auditing"""
-        operation_log = {
-            'timestamp': get_beijing_time().isoformat(),
-            'operation_type': operation_type,
-            'message': message,
-            'repository': repository
-        }
-        
-        if change_details:
-            operation_log['change_details'] = change_details
-        
-        # 安全处理repository参数，避免AttributeError
-        repo_display = repository
-        if isinstance(repository, dict):
-            # 如果是字典，尝试获取name字段，否则显示字典类型
-            repo_display = repository.get('name', f"dict({type(repository).__name__})")
-        elif repository is None:
-            repo_display = 'None'
-        elif not isinstance(repository, str):
-            # 如果是其他非字符串类型，显示类型信息
-            repo_display = f"{type(repository).__name__}({repository})"
-        
-        # Log to file and console
-        if operation_type == 'ERROR':
-            logger.error(f"[OPERATION] {operation_log['timestamp']} - {operation_log['message']} - Repo: {repo_display}")
-        elif operation_type == 'WARNING':
-            logger.warning(f"[OPERATION] {operation_log['timestamp']} - {operation_log['message']} - Repo: {repo_display}")
-        else:
-            logger.info(f"[OPERATION] {operation_log['timestamp']} - {operation_log['message']} - Repo: {repo_display}")
-        
-        # Additional logging of change details if provided
-        if change_details and isinstance(change_details, list):
-            for detail in change_details:
-                logger.info(f"[CHANGE_DETAIL] {detail}")
-    
-    def send_email_notification(self, changes):
-        """Send email notification about changes"""
-        if not changes:
-            return False
-        
-        try:
-            # Log the notification attempt
-            self.log_operation('NOTIFICATION', f"Attempting to send email notification with {len(changes)} changes")
-            
-            # Check if email configuration is complete
-            if 'EMAIL' not in self.config or not all([
-                'smtp_server' in self.config['EMAIL'],
-                'from_email' in self.config['EMAIL'],
-                'to_emails' in self.config['EMAIL']
-            ]):
-                logger.warning("Email notification skipped: incomplete email configuration")
-                self.log_operation('WARNING', "Email notification skipped: incomplete email configuration")
-                return False
-            
-            # Check if SMTP credentials are configured, skip email sending if not
-            has_credentials = False
-            if 'username' in self.config['EMAIL'] and 'password' in self.config['EMAIL']:
-                username = self.config['EMAIL'].get('username', '').strip()
-                password = self.config['EMAIL'].get('password', '').strip()
-                has_credentials = bool(username) and bool(password)
-                
-            if not has_credentials:
-                logger.info("Email notification skipped: No valid SMTP credentials configured")
-                self.log_operation('INFO', "Email notification skipped: No valid SMTP credentials configured")
-                return False
-            
-            # Group changes by repository
-            changes_by_repo = {}
-            try:
-                for change in changes:
-                    repo_name = change.get('repository', 'Unnamed Repository')
-                    logger.info(f"Processing change with repository name: '{repo_name}'")
-                    if repo_name not in changes_by_repo:
-                        changes_by_repo[repo_name] = []
-                    changes_by_repo[repo_name].append(change)
-            except Exception as e:
-                logger.error(f"Error grouping changes by repository: {str(e)}")
-                return
-            
-            # 修改：无论有多少个仓库，都将所有变更合并到一封邮件中发送
-            # 获取所有相关仓库的唯一收件人列表
-            all_recipients = set()
-            logger.info(f"Changes grouped by repository: {list(changes_by_repo.keys())}")
-            logger.info(f"Available recipients mapping: {list(self.recipients_mapping.keys())}")
-            for repo_name in changes_by_repo.keys():
-                logger.info(f"Trying to get recipients for repository: '{repo_name}'")
-                repo_recipients = self._get_recipients_for_repository(repo_name)
-                if repo_recipients:
-                    # 灵活支持逗号或分号分隔的收件人字符串
-                    # 首先将所有分号替换为逗号，然后统一用逗号分割
-                    recipients_str = repo_recipients.replace(';', ',')
-                    for recipient in recipients_str.split(','):
-                        recipient = recipient.strip()
-                        if recipient and recipient.lower() != 'nan':
-                            all_recipients.add(recipient)
-            
-            # 如果没有配置收件人，使用默认收件人
-            if not all_recipients:
-                default_recipients = self.config['EMAIL'].get('to_emails', '')
-                if default_recipients:
-                    # 灵活支持逗号或分号分隔的收件人字符串
-                    recipients_str = default_recipients.replace(';', ',')
-                    for recipient in recipients_str.split(','):
-                        recipient = recipient.strip()
-                        if recipient and recipient.lower() != 'nan':
-                            all_recipients.add(recipient)
-            
-            # 准备邮件内容
-            # 使用动态加载的仓库名称映射（从Excel配置文件读取）
-            repo_name_mapping = self.repo_name_mapping
-            
-            # 获取仓库名称列表（包含ID和中文名称）
-            formatted_repo_names = []
-            for repo_name in changes_by_repo.keys():
-                chinese_name = repo_name_mapping.get(repo_name, repo_name)
-                # 查找英文ID（REPO_*）
-                repo_id = None
-                for key, value in self.repo_name_mapping.items():
-                    if key.startswith('REPO_') and (value == chinese_name or key == repo_name):
-                        repo_id = key
-                        break
-                if repo_id is None:
-                    repo_id = repo_name
-                formatted_repo_names.append(f"{repo_id} ({chinese_name})")
-            
-            # 创建邮件主题
-            if len(formatted_repo_names) == 1:
-                subject = f"SVN仓库变更通知 - {formatted_repo_names[0]} ({len(changes)}个变更)"
-            else:
-                subject = f"SVN仓库变更通知 - {len(changes)}个变更涉及{len(changes_by_repo)}个仓库 ({', '.join(formatted_repo_names)})"
-            
-            body = f"""
-            <html>
-            <body>
-                <h2>SVN仓库变更检测通知</h2>
-                <p>检测到以下SVN仓库变更：</p>
-            """
-            
-            # 为每个仓库添加变更详情
-            for repo_name, repo_changes in changes_by_repo.items():
-                # Get repository URL if available
-                repo_url = ""
-                # Find the corresponding repository configuration
-                for r_name, r_config in self.repositories.items():
-                    if r_name == repo_name:
-                        repo_url = r_config.get('repository_path', '')
-                        break
-                
-                # 使用动态加载的仓库名称映射（从Excel配置文件读取）
-                repo_name_mapping = self.repo_name_mapping
-                chinese_repo_name = repo_name_mapping.get(repo_name, repo_name)
-                
-                # Format the repository name with ID and Chinese name
-                # 查找英文ID（REPO_*）
-                repo_id = None
-                for key, value in self.repo_name_mapping.items():
-                    if key.startswith('REPO_') and (value == chinese_repo_name or key == repo_name):
-                        repo_id = key
-                        break
-                if repo_id is None:
-                    repo_id = repo_name
-                
-                repo_display = f"{repo_id} ({chinese_repo_name})"
-                if repo_url:
-                    repo_display += f" (URL: {repo_url})"
-                
-                body += f"""
-                <h3>{repo_display}</h3>
-                <table border="1" cellpadding="5" cellspacing="0">
-                    <tr bgcolor="#f2f2f2">
-                        <th>Revision</th>
-                        <th>Author</th>
-                        <th>Date</th>
-                        <th>Message</th>
-                        <th>Change Type</th>
-                        <th>Changed Files</th>
-                    </tr>
-                """
-                
-                for change in repo_changes:
-                    try:
-                        # Get changed paths
-                        changed_paths = change.get('changed_paths', [])
-                        
-                        # Create HTML for changed files and determine change type
-                        if changed_paths:
-                            files_html = "<ul style='margin: 0; padding-left: 15px;'>"
-                            # Collect all actions in this revision
-                            actions = set()
-                            for path in changed_paths:
-                                action = path.get('action', 'M')
-                                actions.add(action)
-                                path_name = path.get('path', 'unknown')
-                                action_desc = {
-                                    'A': 'Added',
-                                    'M': 'Modified',
-                                    'D': 'Deleted',
-                                    'R': 'Replaced'
-                                }.get(action, action)
-                                files_html += f"<li>{action_desc}: {path_name}</li>"
-                            files_html += "</ul>"
-                            
-                            # Determine the primary change type for coloring
-                            if 'D' in actions:
-                                change_type = 'Deleted'
-                                change_color = 'red'
-                            elif len(actions) > 1:
-                                change_type = 'Mixed'
-                                change_color = 'orange'
-                            elif 'M' in actions:
-                                change_type = 'Modified'
-                                change_color = 'blue'
-                            elif 'A' in actions:
-                                change_type = 'Added'
-                                change_color = 'green'
-                            else:
-                                change_type = 'Other'
-                                change_color = 'black'
-                        else:
-                            files_html = "<span style='color: #666;'>No files listed in log</span>"
-                            change_type = 'None'
-                            change_color = 'grey'
-                        
-                        # Add to email body
-                        body += f"""
-                            <tr>
-                            <td>{change.get('revision', 'N/A')}</td>
-                            <td>{change.get('author', 'unknown')}</td>
-                            <td>{change.get('date', 'N/A')}</td>
-                            <td>{change.get('message', '')}</td>
-                            <td style='color: {change_color}; font-weight: bold;'>{change_type}</td>
-                            <td style='white-space: normal; word-break: break-all; max-width: 500px;'>{files_html}</td>
-                        </tr>
-                        """
-                    except Exception as e:
-                        logger.error(f"Error processing change for email: {str(e)}")
-                        # Skip this change but continue with others
-                
-                body += """
-                </table>
-                <br>
-                """
-            
-            body += """
-            </body>
-            </html>
-            """
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.config['EMAIL']['from_email']
-            # 修改：正确设置多个收件人
-            recipients_str = ', '.join(all_recipients)
-            msg['To'] = recipients_str
-            msg['Subject'] = subject
-            
-            # Attach HTML body
-            msg.attach(MIMEText(body, 'html'))
-            
-            # 发送邮件
-            return self._send_email(msg)
-        except Exception as e:
-            logger.error(f"Error in send_email_notification: {str(e)}")
-            self.log_operation('ERROR', f"Failed to send email notification: {str(e)}")
-            return False
-    
-    def _send_email_for_repository(self, repo_name, changes):
-        """为指定仓库发送邮件通知
-        
-        Args:
-            repo_name: 仓库名称
-            changes: 该仓库的变更列表
-            
-        Returns:
-            bool: 是否发送成功
-        """
-        try:
-            # 获取该仓库的收件人
-            recipients = self._get_recipients_for_repository(repo_name)
-            if not recipients:
-                logger.warning(f"仓库 '{repo_name}' 没有配置收件人，跳过邮件发送")
-                return False
-                
-            # 准备邮件内容
-            # 使用动态加载的仓库名称映射（从Excel配置文件读取）
-            repo_name_mapping = self.repo_name_mapping
-            chinese_repo_name = repo_name_mapping.get(repo_name, repo_name)
-            
-            # 查找英文ID（REPO_*）
-            repo_id = None
-            for key, value in self.repo_name_mapping.items():
-                if key.startswith('REPO_') and (value == chinese_repo_name or key == repo_name):
-                    repo_id = key
-                    break
-            if repo_id is None:
-                repo_id = repo_name
-                
-            subject = f"SVN仓库变更通知 - {repo_id} ({chinese_repo_name}) ({len(changes)}个变更)"
-            
-            body = f"""
-            <html>
-            <body>
-                <h2>SVN仓库变更检测通知</h2>
-                <p>检测到以下SVN仓库变更：</p>
-            """
-            
-            # 添加仓库信息和变更详情
-            # Get repository URL if available
-            repo_url = ""
-            # Find the corresponding repository configuration
-            for r_name, r_config in self.repositories.items():
-                if r_name == repo_name:
-                    repo_url = r_config.get('repository_path', '')
-                    break
-            
-            # Format the repository name with ID and Chinese name
-            repo_display = f"{repo_id} ({chinese_repo_name})"
-            if repo_url:
-                repo_display += f" (URL: {repo_url})"
-            
-            body += f"""
-            <h3>{repo_display}</h3>
-            <table border="1" cellpadding="5" cellspacing="0">
-                <tr bgcolor="#f2f2f2">
-                    <th>Revision</th>
-                    <th>Author</th>
-                    <th>Date</th>
-                    <th>Message</th>
-                    <th>Change Type</th>
-                    <th>Changed Files</th>
-                </tr>
-            """
-            
-            for change in changes:
-                try:
-                    # Log the change details for debugging
-                    logger.debug(f"Processing change for email - repo: {repo_name}, rev: {change.get('revision')}")
-                    
-                    # Get changed paths
-                    changed_paths = change.get('changed_paths', [])
-                    logger.debug(f"  Has {len(changed_paths)} changed paths")
-                    
-                    # Create HTML for changed files and determine change type
-                    if changed_paths:
-                        files_html = "<ul style='margin: 0; padding-left: 15px;'>"
-                        # Collect all actions in this revision
-                        actions = set()
-                        for path in changed_paths:
-                            action = path.get('action', 'M')
-                            actions.add(action)
-                            path_name = path.get('path', 'unknown')
-                            action_desc = {
-                                'A': 'Added',
-                                'M': 'Modified',
-                                'D': 'Deleted',
-                                'R': 'Replaced'
-                            }.get(action, action)
-                            files_html += f"<li>{action_desc}: {path_name}</li>"
-                            logger.debug(f"  Added to email: {action_desc}: {path_name}")
-                        files_html += "</ul>"
-                        
-                        # Determine the primary change type for coloring
-                        # Priority: Deleted > Mixed > Modified > Added
-                        if 'D' in actions:
-                            change_type = 'Deleted'
-                            change_color = 'red'
-                        elif len(actions) > 1:
-                            change_type = 'Mixed'
-                            change_color = 'orange'
-                        elif 'M' in actions:
-                            change_type = 'Modified'
-                            change_color = 'blue'
-                        elif 'A' in actions:
-                            change_type = 'Added'
-                            change_color = 'green'
-                        else:
-                            change_type = 'Other'
-                            change_color = 'black'
-                    else:
-                        # Show a message when no files were changed
-                        files_html = "<span style='color: #666;'>No files listed in log</span>"
-                        change_type = 'None'
-                        change_color = 'grey'
-                        logger.debug(f"  No changed files found in this revision")
-                    
-                    # Add to email body
-                    body += f"""
-                        <tr>
-                        <td>{change.get('revision', 'N/A')}</td>
-                        <td>{change.get('author', 'unknown')}</td>
-                        <td>{change.get('date', 'N/A')}</td>
-                        <td>{change.get('message', '')}</td>
-                        <td style='color: {change_color}; font-weight: bold;'>{change_type}</td>
-                        <td style='white-space: normal; word-break: break-all; max-width: 500px;'>{files_html}</td>
-                    </tr>
-                    """
-                except Exception as e:
-                    logger.error(f"Error processing change for email: {str(e)}")
-                    # Skip this change but continue with others
-            
-            body += """
-            </table>
-            <br>
-            </body>
-            </html>
-            """
-            
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.config['EMAIL']['from_email']
-            msg['To'] = recipients
-            msg['Subject'] = subject
-            
-            # Attach HTML body
-            msg.attach(MIMEText(body, 'html'))
-            
-            # 调用原有的邮件发送逻辑
-            return self._send_email(msg)
-        except Exception as e:
-            logger.error(f"Error in _send_email_for_repository: {str(e)}")
-            return False
-    
-    def _send_email(self, msg):
-        """内部邮件发送方法，包含重试逻辑
-        
-        Args:
-            msg: 邮件消息对象
-            
-        Returns:
-            bool: 是否发送成功
-        """
-        try:
-            # 检查是否有SMTP凭证
-            has_credentials = False
-            if 'username' in self.config['EMAIL'] and 'password' in self.config['EMAIL']:
-                username = self.config['EMAIL'].get('username', '').strip()
-                password = self.config['EMAIL'].get('password', '').strip()
-                has_credentials = bool(username) and bool(password)
-            
-            # Send email with retry logic
-            smtp_server = self.config['EMAIL']['smtp_server']
-            smtp_port = int(self.config['EMAIL'].get('smtp_port', '465'))
-            use_ssl = self.config['EMAIL'].get('use_ssl', 'True').lower() == 'true'
-            max_retries = 2
-            retry_count = 0
-            success = False
-            
-            while retry_count <= max_retries and not success:
-                try:
-                    if use_ssl:
-                        server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-                    else:
-                        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-                        server.starttls()
-                    
-                    # Only attempt login if we have complete credentials and has_credentials is True
-                    if has_credentials:
-                        try:
-                            username = self.config['EMAIL'].get('username', '').strip()
-                            password = self.config['EMAIL'].get('password', '').strip()
-                            if username and password:  # Double check for security
-                                server.login(username, password)
-                        except smtplib.SMTPAuthenticationError:
-                            logger.error(f"SMTP authentication failed (attempt {retry_count + 1}/{max_retries + 1})")
-                            retry_count += 1
-                            time.sleep(2)  # Wait before retry
-                            continue
-                    else:
-                        logger.info("Skipping SMTP authentication as no valid credentials provided")
-                    
-                    # 明确提取收件人列表，确保所有收件人都能收到邮件
-                    recipients_str = msg['To']
-                    # 将收件人字符串拆分为列表
-                    recipients_list = [r.strip() for r in recipients_str.split(',') if r.strip()]
-                    
-                    # 使用明确的收件人列表发送邮件
-                    server.send_message(msg, to_addrs=recipients_list)
-                    server.quit()
-                    success = True
-                    logger.info(f"Email notification sent to {recipients_str}")
-                    self.log_operation('SUCCESS', f"Email notification successfully sent to {recipients_str}")
-                    return True
-                except smtplib.SMTPException as e:
-                    logger.error(f"SMTP error sending email: {str(e)} (attempt {retry_count + 1}/{max_retries + 1})")
-                    retry_count += 1
-                    time.sleep(2)  # Wait before retry
-                except Exception as e:
-                    logger.error(f"Unexpected error sending email: {str(e)}")
-                    break
-            
-            if not success:
-                logger.error("Failed to send email after multiple attempts")
-                # Do not throw exception, allow program to continue running
-                return False
-        except Exception as e:
-            logger.error(f"Error in _send_email: {str(e)}")
-            return False
-                
-        except Exception as e:
-            logger.error(f"Failed to send email notification: {str(e)}")
-            # Ensure no exception is thrown, allow program to continue running
-            return False
-    
-    # Backup functionality has been removed
-
-    def send_status_email(self, check_result):
-        """发送程序运行状态邮件
-        
-        Args:
-            check_result: 检查结果字典，包含以下字段：
-                - check_time: 检查时间
-                - total_repos: 总仓库数
-                - repos_with_changes: 有变更的仓库数
-                - total_changes: 总变更数
-                - repos_checked: 已检查的仓库列表
-                - errors: 错误信息列表
-                
-        Returns:
-            bool: 是否发送成功
-        """
-        try:
-            # 检查邮件配置是否完整
-            if 'EMAIL' not in self.config or not all([
-                'smtp_server' in self.config['EMAIL'],
-                'from_email' in self.config['EMAIL']
-            ]):
-                logger.warning("状态邮件发送跳过：邮件配置不完整")
-                self.log_operation('WARNING', "状态邮件发送跳过：邮件配置不完整")
-                return False
-            
-            # 检查是否有SMTP凭证
-            has_credentials = False
-            if 'username' in self.config['EMAIL'] and 'password' in self.config['EMAIL']:
-                username = self.config['EMAIL'].get('username', '').strip()
-                password = self.config['EMAIL'].get('password', '').strip()
-                has_credentials = bool(username) and bool(password)
-            
-            if not has_credentials:
-                logger.info("状态邮件发送跳过：未配置有效的SMTP凭证")
-                self.log_operation('INFO', "状态邮件发送跳过：未配置有效的SMTP凭证")
-                return False
-            
-            # 准备邮件内容
-            check_time = check_result.get('check_time', get_beijing_time_str())
-            total_repos = check_result.get('total_repos', 0)
-            repos_with_changes = check_result.get('repos_with_changes', 0)
-            total_changes = check_result.get('total_changes', 0)
-            repos_checked = check_result.get('repos_checked', [])
-            errors = check_result.get('errors', [])
-            
-            # 创建邮件主题
-            subject = f"SVN监控程序运行状态报告 - {check_time}"
-            
-            # 创建邮件正文
-            body = f"""
-            <html>
-            <body>
-                <h2>SVN监控程序运行状态报告</h2>
-                <p><strong>检测时间：</strong>{check_time}</p>
-                
-                <h3>检测概况</h3>
-                <table border="1" cellpadding="5" cellspacing="0">
-                    <tr>
-                        <td><strong>监控仓库总数</strong></td>
-                        <td>{total_repos}</td>
-                    </tr>
-                    <tr>
-                        <td><strong>本次检测仓库数</strong></td>
-                        <td>{len(repos_checked)}</td>
-                    </tr>
-                    <tr>
-                        <td><strong>有变更的仓库数</strong></td>
-                        <td>{repos_with_changes}</td>
-                    </tr>
-                    <tr>
-                        <td><strong>检测到的变更总数</strong></td>
-                        <td>{total_changes}</td>
-                    </tr>
-                </table>
-                
-                <h3>检测的仓库列表</h3>
-                <table border="1" cellpadding="5" cellspacing="0">
-                    <tr bgcolor="#f2f2f2">
-                        <th>仓库ID</th>
-                        <th>仓库名称</th>
-                        <th>状态</th>
-                    </tr>
-            """
-            
-            # 添加仓库详情
-            for repo_name in repos_checked:
-                # 使用动态加载的仓库名称映射（从Excel配置文件读取）
-                repo_name_mapping = self.repo_name_mapping
-                chinese_repo_name = repo_name_mapping.get(repo_name, repo_name)
-                
-                # 查找英文ID（REPO_*）
-                repo_id = None
-                for key, value in self.repo_name_mapping.items():
-                    if key.startswith('REPO_') and (value == chinese_repo_name or key == repo_name):
-                        repo_id = key
-                        break
-                if repo_id is None:
-                    repo_id = repo_name
-                
-                # 检查该仓库是否有变更
-                has_change = False
-                if repos_with_changes > 0 and total_changes > 0:
-                    # 这里简化处理，实际可以根据check_result中的详细信息判断
-                    has_change = False
-                
-                status = "正常" if not has_change else "有变更"
-                status_color = "green" if not has_change else "orange"
-                
-                body += f"""
-                    <tr>
-                        <td>{repo_id}</td>
-                        <td>{chinese_repo_name}</td>
-                        <td style='color: {status_color}; font-weight: bold;'>{status}</td>
-                    </tr>
-                """
-            
-            body += """
-                </table>
-            """
-            
-            # 添加错误信息（如果有）
-            if errors:
-                body += """
-                <h3 style='color: red;'>检测过程中发生的错误</h3>
-                <table border="1" cellpadding="5" cellspacing="0">
-                    <tr bgcolor="#f2f2f2">
-                        <th>仓库</th>
-                        <th>错误信息</th>
-                    </tr>
-                """
-                for error in errors:
-                    repo_name = error.get('repo', '未知')
-                    error_msg = error.get('message', '未知错误')
-                    body += f"""
-                        <tr>
-                            <td>{repo_name}</td>
-                            <td style='color: red;'>{error_msg}</td>
-                        </tr>
-                    """
-                body += """
-                </table>
-                """
-            
-            body += """
-                <p><em>此邮件由SVN监控程序自动发送，请勿回复。</em></p>
-            </body>
-            </html>
-            """
-            
-            # 创建邮件消息
-            msg = MIMEMultipart('alternative')
-            msg['From'] = self.config['EMAIL']['from_email']
-            # 状态邮件发送给pyc@lektec.com
-            msg['To'] = 'pyc@lektec.com'
-            msg['Subject'] = subject
-
-            # 附加HTML正文
-            msg.attach(MIMEText(body, 'html'))
-
-            # 发送邮件
-            success = self._send_email(msg)
-            if success:
-                logger.info("程序运行状态邮件发送成功")
-                self.log_operation('SUCCESS', "程序运行状态邮件发送成功")
-            else:
-                logger.warning("程序运行状态邮件发送失败")
-                self.log_operation('WARNING', "程序运行状态邮件发送失败")
-
-            return success
-        except Exception as e:
-            logger.error(f"发送程序运行状态邮件时出错：{str(e)}")
-            self.log_operation('ERROR', f"发送程序运行状态邮件时出错：{str(e)}")
-            return False
-
-    def setup_auto_startup(self):
-        """Set up the script to run automatically on startup (Windows)"""
-        try:
-            if sys.platform == 'win32':
-                import winreg
-
-                # Get the path to the current script
-                script_path = os.path.abspath(__file__)
-                python_exe = sys.executable
-
-                # Create a batch file to run the script
-                batch_path = os.path.join(os.path.dirname(script_path),
-                                          'run_svn_monitor.bat')
-                with open(batch_path, 'w') as f:
-                    f.write('@echo off\n')
-                    f.write(f'"{python_exe}" "{script_path}"\n')
-                    f.write('exit\n')
-
-                # Add to startup registry
-                key = winreg.OpenKey(
-                    winreg.HKEY_CURRENT_USER,
-                    r'SOFTWARE\Microsoft\Windows\CurrentVersion\Run',
-                    0,
-                    winreg.KEY_SET_VALUE
-                )
-                winreg.SetValueEx(key, 'SVN_Monitor', 0, winreg.REG_SZ,
-                                 batch_path)
-                winreg.CloseKey(key)
-                
-                logger.info(f"Auto startup configured. Script will run on system boot.")
-            else:
-                logger.warning("Auto startup setup is only supported on Windows.")
-        except Exception as e:
-            logger.error(f"Failed to set up auto startup: {str(e)}")
-            raise
-
-    # 备份功能已移除
-
-    def _validate_config(self):
-        """Validate the configuration settings"""
-        # Global required sections
-        required_sections = ['EMAIL', 'LOGGING', 'SYSTEM']
-
-        # Ensure all required global sections exist
-        for section in required_sections:
-            if section not in self.config:
-                logger.warning(
-                    f"Configuration section '{section}' missing. Creating default settings."
-                )
-                self.config[section] = {}
-
-        # Ensure SYSTEM section has required keys
-        if 'auto_startup' not in self.config['SYSTEM']:
-            self.config['SYSTEM']['auto_startup'] = 'True'
-        if 'use_remote_check' not in self.config['SYSTEM']:
-            self.config['SYSTEM']['use_remote_check'] = 'True'
-
-        # Check for at least one repository configuration
-        repositories = self._get_repositories()
-        if not repositories:
-            logger.warning(
-                "No repository configurations found. Creating a default repository configuration."
-            )
-            self._create_default_repository_config()
-        else:
-            # Validate each repository configuration has required fields
-            for repo_name, repo_config in repositories.items():
-                # Ensure local_working_copy exists for all repositories
-                if 'local_working_copy' not in repo_config:
-                    logger.warning(
-                        f"Repository '{repo_name}' missing 'local_working_copy'. Adding default path."
-                    )
-                    # Create a default working copy path
-                    default_path = os.path.join(
-                        os.path.dirname(os.path.abspath(__file__)), 'svn_wc',
-                        repo_name
-                    )
-                    repo_config['local_working_copy'] = default_path
-
-        # No need to save configuration to file as we're using Excel for configuration management
-
-    def run(self):
-        """Main run method for the SVN monitor"""
-        try:
-            # Default to monitor mode
-            mode = "远程检测模式" if self.use_remote_check else "本地检测模式"
-            logger.info(f"Starting SVN Monitor ({mode})")
-            
-            # 在远程检测模式下跳过本地工作副本初始化
-            if not self.use_remote_check:
-                # Ensure working copies are properly initialized
-                for repo_name, repo_config in self.repositories.items():
-                    self._ensure_working_copy(repo_config)
-            else:
-                logger.info("Running in remote check mode, skipping local working copy initialization")
-            
-            # Setup auto startup if enabled
-            if self.config['SYSTEM'].get('auto_startup', 'True').lower() == 'true':
-                try:
-                    self.setup_auto_startup()
-                except Exception as e:
-                    logger.warning(f"Failed to setup auto startup: {str(e)}")
-            
-            # Main monitoring loop
-            # 使用基于时间的调度，确保检查间隔准确
-            min_check_interval = min(
-                int(repo_config.get('check_interval', str(DEFAULT_CHECK_INTERVAL))) 
-                for repo_config in self.repositories.values()
-            )
-            
-            # 记录上一次检查的时间
-            last_check_time = time.time()
-            
-            # 启动时立即检测一次版本变化（不等待第一个检查间隔）
-            logger.info("服务启动，立即检查所有仓库变更...")
-            try:
-                all_changes = []
-                changes_to_update = {}
-                errors = []  # 收集所有仓库检查错误
-                
-                # Fix: Dynamically reread last_revisions.json file to ensure using the latest version records
-                self.last_revisions = self._get_last_recorded_revisions()
-                
-                # Check each repository for changes
-                for repo_name, repo_config in self.repositories.items():
-                    try:
-                        # Check for changes
-                        latest_revision = self.get_latest_revision(repo_config)
-                        last_revision = self.last_revisions.get(repo_name, 0)
-                        
-                        if latest_revision > last_revision:
-                            logger.info(f"New changes detected in repository '{repo_name}': {last_revision} -> {latest_revision}")
-                            # Log the detected changes
-                            self.log_operation('CHANGE_DETECTED', 
-                                              f"New changes detected: {last_revision} -> {latest_revision}",
-                                              repository=repo_name)
-                            changes = self.get_changes(last_revision, latest_revision, repo_config)
-                            
-                            # Only add changes if notifications are enabled for this repository
-                            if repo_config.get('notify_on_changes', 'True').lower() == 'true':
-                                all_changes.extend(changes)
-                                # Store changes and revision info for this repository
-                                changes_to_update[repo_name] = {
-                                    'last_revision': last_revision,
-                                    'latest_revision': latest_revision
-                                }
-                            else:
-                                # If notifications are disabled, update revision immediately
-                                self.last_revisions[repo_name] = latest_revision
-                                # Save immediately for repos with notifications disabled
-                                self._save_last_revisions(self.last_revisions)
-                    except Exception as e:
-                        error_msg = f"Error checking repository '{repo_name}': {str(e)}"
-                        logger.error(error_msg)
-                        self.log_operation('ERROR', error_msg, repository=repo_name)
-                        # 收集错误信息
-                        errors.append({
-                            'repo': repo_name,
-                            'message': error_msg
-                        })
-                        # Continue with other repositories even if one fails
-                
-                # No unconditional save here to ensure revisions are only saved after successful email or for disabled notifications
-                
-                # 记录检查完成的日志
-                logger.info("所有仓库检查完成，准备处理变更通知")
-                
-                # Send notifications for all changes
-                if all_changes:
-                    email_success = self.send_email_notification(all_changes)
-                    # Only update and save revision numbers if email was sent successfully
-                    if email_success:
-                        logger.info("Email notification successful, updating repository revision numbers")
-                        # Create a temporary copy to avoid modifying self.last_revisions directly
-                        temp_revisions = self.last_revisions.copy()
-                        for repo_name, info in changes_to_update.items():
-                            temp_revisions[repo_name] = info['latest_revision']
-                        # Only update and save if all updates were successful
-                        self.last_revisions = temp_revisions
-                        self._save_last_revisions(self.last_revisions)
-                    else:
-                        logger.warning("Email notification failed, keeping original revision numbers")
-                        # Explicitly reload last revisions to ensure no changes were made
-                        self.last_revisions = self._get_last_recorded_revisions()
-                
-                # 服务启动后发送状态通知邮件，无论是否有变更
-                try:
-                    # 准备状态邮件的检测结果数据
-                    check_result = {
-                        'check_time': get_beijing_time_str(),
-                        'total_repos': len(self.repositories),
-                        'repos_with_changes': len(changes_to_update),
-                        'total_changes': len(all_changes),
-                        'repos_checked': list(self.repositories.keys()),
-                        'errors': errors  # 包含所有收集到的错误信息
-                    }
-                    
-                    # 发送状态邮件
-                    self.send_status_email(check_result)
-                except Exception as e:
-                    logger.error(f"发送程序运行状态邮件时出错：{str(e)}")
-                    # 状态邮件发送失败不影响主程序运行
-            except Exception as e:
-                error_msg = f"Error in initial repository check: {str(e)}"
-                logger.error(error_msg)
-                self.log_operation('ERROR', error_msg)
-            
-            while self.running:
-                try:
-                    # 计算应该等待的时间
-                    current_time = time.time()
-                    elapsed = current_time - last_check_time
-                    
-                    # 如果距离上次检查的时间小于最小间隔，等待剩余时间
-                    if elapsed < min_check_interval:
-                        wait_time = min_check_interval - elapsed
-                        logger.info(f"等待 {wait_time:.2f} 秒后进行下一次仓库检查，当前时间: {get_beijing_time_str()}")
-                        # 使用小步循环等待，以便能够响应终止信号
-                        remaining_time = wait_time
-                        start_wait_time = time.time()
-                        while remaining_time > 0 and self.running:
-                            time.sleep(min(1, remaining_time))  # 最多等待1秒
-                            remaining_time = wait_time - (time.time() - start_wait_time)
-                        
-                        # 如果在等待期间收到终止信号，直接退出循环
-                        if not self.running:
-                            break
-                    
-                    # 更新最后检查时间
-                    last_check_time = time.time()
-                    logger.info(f"开始检查所有仓库变更，当前时间: {get_beijing_time_str()}")
-                    
-                    all_changes = []
-                    changes_to_update = {}
-                    errors = []  # 收集所有仓库检查错误
-                    
-                    # Fix: Dynamically reread last_revisions.json file to ensure using the latest version records
-                    self.last_revisions = self._get_last_recorded_revisions()
-                    
-                    # Check each repository for changes
-                    for repo_name, repo_config in self.repositories.items():
-                        try:
-                            # Check for changes
-                            latest_revision = self.get_latest_revision(repo_config)
-                            last_revision = self.last_revisions.get(repo_name, 0)
-                            
-                            if latest_revision > last_revision:
-                                logger.info(f"New changes detected in repository '{repo_name}': {last_revision} -> {latest_revision}")
-                                # Log the detected changes
-                                self.log_operation('CHANGE_DETECTED', 
-                                                  f"New changes detected: {last_revision} -> {latest_revision}",
-                                                  repository=repo_name)
-                                changes = self.get_changes(last_revision, latest_revision, repo_config)
-                                
-                                # Only add changes if notifications are enabled for this repository
-                                if repo_config.get('notify_on_changes', 'True').lower() == 'true':
-                                    all_changes.extend(changes)
-                                    # Store changes and revision info for this repository
-                                    changes_to_update[repo_name] = {
-                                        'last_revision': last_revision,
-                                        'latest_revision': latest_revision
-                                    }
-                                else:
-                                    # If notifications are disabled, update revision immediately
-                                    self.last_revisions[repo_name] = latest_revision
-                                    # Save immediately for repos with notifications disabled
-                                    self._save_last_revisions(self.last_revisions)
-                        except Exception as e:
-                            error_msg = f"Error checking repository '{repo_name}': {str(e)}"
-                            logger.error(error_msg)
-                            self.log_operation('ERROR', error_msg, repository=repo_name)
-                            # 收集错误信息
-                            errors.append({
-                                'repo': repo_name,
-                                'message': error_msg
-                            })
-                            # Continue with other repositories even if one fails
-                    
-                    # No unconditional save here to ensure revisions are only saved after successful email or for disabled notifications
-                    
-                    # 记录检查完成的日志
-                    logger.info("所有仓库检查完成，准备处理变更通知")
-                    
-                    # Send notifications for all changes
-                    if all_changes:
-                        email_success = self.send_email_notification(all_changes)
-                        # Only update and save revision numbers if email was sent successfully
-                        if email_success:
-                            logger.info("Email notification successful, updating repository revision numbers")
-                            # Create a temporary copy to avoid modifying self.last_revisions directly
-                            temp_revisions = self.last_revisions.copy()
-                            for repo_name, info in changes_to_update.items():
-                                temp_revisions[repo_name] = info['latest_revision']
-                            # Only update and save if all updates were successful
-                            self.last_revisions = temp_revisions
-                            self._save_last_revisions(self.last_revisions)
-                        else:
-                            logger.warning("Email notification failed, keeping original revision numbers")
-                            # Explicitly reload last revisions to ensure no changes were made
-                            self.last_revisions = self._get_last_recorded_revisions()
-                    
-                    # 每次定时检测完成后，发送程序运行状态邮件
-                    try:
-                        # 准备状态邮件的检测结果数据
-                        check_result = {
-                            'check_time': get_beijing_time_str(),
-                            'total_repos': len(self.repositories),
-                            'repos_with_changes': len(changes_to_update),
-                            'total_changes': len(all_changes),
-                            'repos_checked': list(self.repositories.keys()),
-                            'errors': errors  # 包含所有收集到的错误信息
-                        }
-                        
-                        # 发送状态邮件
-                        self.send_status_email(check_result)
-                    except Exception as e:
-                        logger.error(f"发送程序运行状态邮件时出错：{str(e)}")
-                        # 状态邮件发送失败不影响主程序运行
-                        
-                except KeyboardInterrupt:
-                    logger.info("SVN Monitor stopped by user")
-                    self.log_operation('INFO', "SVN Monitor stopped by user")
-                    break
-                except Exception as e:
-                    error_msg = f"Error in monitoring loop: {str(e)}"
-                    logger.error(error_msg)
-                    self.log_operation('ERROR', error_msg)
-                    # 发生异常时，仍然保持原有的检查间隔，但给系统一点恢复时间
-                    # 使用配置的最小检查间隔，确保时间设置的一致性和动态性
-                    logger.info(f"监控循环发生异常，将在 {min_check_interval} 秒后重试")
-                    time.sleep(min_check_interval)  # 等待配置的最小检查间隔后重试
-        except Exception as e:
-            logger.error(f"Fatal error in run method: {str(e)}")
-            raise
-
-
-def main():
-    """Main entry point - can be run in monitor mode or hook mode"""
-    try:
-        import argparse
-        
-        # Parse command line arguments
-        parser = argparse.ArgumentParser(description='SVN Monitor Script')
-        parser.add_argument('--repository', help='Repository path (used by SVN hooks)')
-        parser.add_argument('--revision', help='Revision number (used by SVN hooks)')
-        args = parser.parse_args()
-        
-        monitor = SVNMonitor()
-        
-        # If repository and revision are provided, run in hook mode
-        if args.repository and args.revision:
-            logger.info(f"Running in hook mode for repository: {args.repository}, revision: {args.revision}")
-            monitor.process_commit(args.repository, args.revision)
-        else:
-            # Otherwise run in normal monitor mode (continuous monitoring)
-            logger.info("Running in continuous monitor mode")
-            monitor.run()
-    except Exception as e:
-        logger.critical(f"Unhandled exception: {str(e)}")
-        sys.exit(1)
-
-
-if __name__ == "__main__":
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SVN Monitor Script
+This script monitors SVN repository changes, sends email notifications,
+performs backup and restore operations, and maintains operation logs.
+"""
+
+import functools
+from html import escape as _esc
+import glob
+import io
+import locale
+import os
+import sys
+import time
+import subprocess
+import xml.etree.ElementTree as ET
+import logging
+import configparser
+import datetime
+import smtplib
+import re
+import selectors
+import signal
+import threading
+from collections import defaultdict
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from dataclasses import dataclass
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from logging.handlers import MemoryHandler, RotatingFileHandler
+
+# 导入时区处理模块
+try:
+    # Python 3.9+ 推荐使用zoneinfo
+    from zoneinfo import ZoneInfo
+except ImportError:
+    # 兼容旧版本Python
+    try:
+        import pytz
+    except ImportError:
+        pytz = None
+
+# 北京时区对象（模块级构造一次并缓存，避免每次取时间/每条日志记录
+# 都重新走ZoneInfo/pytz的查找链）
+if 'ZoneInfo' in globals():
+    _BJ_TZ = ZoneInfo('Asia/Shanghai')
+elif pytz:
+    _BJ_TZ = pytz.timezone('Asia/Shanghai')
+else:
+    _BJ_TZ = None
+
+# 定义北京时间时区
+def get_beijing_time():
+    """获取北京时间（UTC+8）"""
+    now = datetime.datetime.now()
+    # 尝试使用zoneinfo（Python 3.9+）
+    if 'ZoneInfo' in globals():
+        return now.astimezone(_BJ_TZ)
+    # 尝试使用pytz
+    elif pytz:
+        if now.tzinfo is None:
+            # 如果没有时区信息，先设为UTC
+            now = pytz.UTC.localize(now)
+        return now.astimezone(_BJ_TZ)
+    # 如果都不可用，至少记录当前使用的是系统时区
+    logging.warning("无法设置北京时间时区，使用系统默认时区")
+    return now
+
+# 获取北京时间的格式化字符串
+def get_beijing_time_str(format_str='%Y-%m-%d %H:%M:%S'):
+    """获取格式化的北京时间字符串"""
+    return get_beijing_time().strftime(format_str)
+
+# 尝试导入pandas用于读取Excel文件
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+    logging.warning("pandas库未安装，将使用默认收件人配置。如需使用Excel收件人功能，请安装pandas: pip install pandas openpyxl")
+
+# last_revisions.json的序列化：优先使用orjson（C实现，直接输出bytes），
+# 未安装时回退到stdlib json的紧凑分隔符形式（不带空格，文件也更小）
+import json as _json
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        """把对象序列化为紧凑JSON字节串"""
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj):
+        """把对象序列化为紧凑JSON字节串（stdlib回退实现）"""
+        return _json.dumps(obj, separators=(',', ':')).encode()
+
+# 状态文件写入时的进程间文件锁（POSIX专用；
+# Windows上没有fcntl，退化为仅靠tmp+os.replace的原子替换）
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# lxml可选依赖：其recover模式能从截断/畸形的XML里抢救出完整的
+# logentry子树（解析速度也快于标准库），未安装时回退到标准库
+# ElementTree的声明修复路径（见_parse_svn_log）
+try:
+    from lxml import etree as LET
+except ImportError:
+    LET = None
+
+# 流式解析失败时需要捕获的异常类型：lxml抛XMLSyntaxError而不是
+# 标准库的ParseError
+_XML_PARSE_ERRORS = (ET.ParseError,) if LET is None \
+    else (ET.ParseError, LET.XMLSyntaxError)
+
+# Excel读取引擎：优先使用calamine（Rust实现的xlsx解析器，比openpyxl快且省内存），
+# 未安装python-calamine时回退到openpyxl只读流式模式。
+# 引擎探测只在模块导入时做一次，所有read_excel/ExcelFile调用统一引用这两个常量
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+    _EXCEL_ENGINE_KWARGS = {}
+except ImportError:
+    _EXCEL_ENGINE = 'openpyxl'
+    _EXCEL_ENGINE_KWARGS = {'read_only': True, 'data_only': True, 'keep_links': False}
+
+# 内存缓冲日志处理器的模块级引用（供_handle_sigterm在退出前强制flush）
+_memory_handler = None
+
+def setup_logging(config=None):
+    """Setup logging based on configuration"""
+    # Default log settings
+    log_file = 'svn_monitor.log'
+    log_level = logging.INFO
+    log_buffer_size = 1024  # 文件日志的内存缓冲条数
+
+    # 确保日志使用北京时间
+    # 直接用logging传入的记录时间戳换算，引用缓存的时区对象，
+    # 避免每条日志记录重新构造时区再取当前时间。
+    # 注意：赋值到类属性后会按绑定方法调用（首个参数是Formatter实例），
+    # 因此用*args并取最后一个数值参数作为时间戳
+    if _BJ_TZ is not None:
+        logging.Formatter.converter = (
+            lambda *args, tz=_BJ_TZ: datetime.datetime.fromtimestamp(
+                args[-1] if args and isinstance(args[-1], (int, float)) else time.time(),
+                tz).timetuple())
+    
+    # Override with config values if available
+    if config and 'LOGGING' in config:
+        log_file = config['LOGGING'].get('log_file', log_file)
+        log_level_str = config['LOGGING'].get('log_level', 'INFO').upper()
+        log_level = getattr(logging, log_level_str, logging.INFO)
+        try:
+            log_buffer_size = int(config['LOGGING'].get('buffer_size', str(log_buffer_size)))
+        except ValueError:
+            logging.warning("LOGGING.buffer_size配置无效，使用默认缓冲条数")
+    
+    # Ensure log file path is absolute
+    if not os.path.isabs(log_file):
+        # Get the directory of the script or current working directory
+        base_dir = os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv else os.getcwd()
+        log_file = os.path.normpath(os.path.join(base_dir, log_file))
+    
+    # Ensure log directory exists
+    log_dir = os.path.dirname(log_file)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+    
+    # Configure logging
+    numeric_level = getattr(logging, logging.getLevelName(log_level), logging.INFO)
+    
+    # Create logger
+    logger = logging.getLogger(__name__)
+    logger.setLevel(numeric_level)
+    
+    # Clear existing handlers if any
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    
+    # Create handlers
+    handlers = []
+    
+    # File handler for detailed logging
+    file_handler = RotatingFileHandler(
+        log_file,
+        maxBytes=10*1024*1024,  # 10MB
+        backupCount=5
+    )
+    file_handler.setLevel(numeric_level)
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s'
+    ))
+    # 用MemoryHandler包装文件处理器：日志先在内存中攒批，
+    # 攒满buffer_size条或出现ERROR及以上级别时才批量写盘，
+    # 摊薄高频轮询日志的逐条写文件开销
+    global _memory_handler
+    _memory_handler = MemoryHandler(
+        capacity=log_buffer_size,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flushOnClose=True
+    )
+    handlers.append(_memory_handler)
+    
+    # Stream handler for console output
+    stream_handler = logging.StreamHandler()
+    stream_handler.setLevel(numeric_level)
+    stream_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s'
+    ))
+    handlers.append(stream_handler)
+    
+    # Add handlers to logger
+    for handler in handlers:
+        logger.addHandler(handler)
+    
+    return logger
+
+# Initialize logger with default settings
+logger = setup_logging()
+
+# 默认配置常量
+DEFAULT_CHECK_INTERVAL = 300  # 默认检查间隔（秒）
+
+# URL前缀（元组形式可一次startswith判断，配置里这类路径不做相对路径转换）
+_URL_PREFIXES = ('http://', 'https://')
+
+# 收件人单元格里分号分隔的邮箱列表的分割正则（预编译，单次C层扫描即可
+# 完成分割并吞掉分号两侧的空白，替代逐段split+strip的Python层循环）
+_EMAIL_SPLIT = re.compile(r'\s*;\s*')
+
+# 逗号/分号混合分隔的收件人字符串的分割正则（预编译，一次扫描完成
+# 分割并吞掉分隔符两侧空白，替代replace+split+逐段strip的三趟遍历）
+_RECIP_SPLIT = re.compile(r'\s*[;,]\s*')
+
+# SVN错误码提取正则（预编译，用于更新失败时的错误分类，见_ensure_working_copy）
+_SVN_ERR_RE = re.compile(r'svn: (E\d+)')
+
+# 锁定类错误的检测正则（预编译忽略大小写匹配，替代对整段stderr做
+# lower()再子串查找——那会为每次检查分配一份完整的小写副本）
+_LOCK_ERR_RE = re.compile(r'locked|cleanup|E155\d{3}', re.IGNORECASE)
+
+# 瞬时网络类错误的检测正则（连接失败/超时），命中时走指数退避重试
+# 而不是立即失败（见_run_svn_command）
+_TRANSIENT_ERR_RE = re.compile(r'E170001|E170013|timed out|connection', re.IGNORECASE)
+
+# 日志中需要隐藏参数值的敏感命令行选项（见_get_safe_command_string）
+_SENSITIVE_ARGS = frozenset({'--username', '--password'})
+
+# SVN日志日期的固定格式前缀（YYYY-MM-DDTHH:MM:SS[.ffffff]Z）：
+# 命中时直接按切片拼出目标格式，免去每条logentry构造datetime对象
+# 再strftime的往返（见_parse_logentry）
+_SVN_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+
+# SVN变更动作码到英文描述的映射（模块级常量：邮件正文的内层循环
+# 每个变更路径都要查一次，不在循环内重新构造字典字面量）
+_ACTION_DESC = {
+    'A': 'Added',
+    'M': 'Modified',
+    'D': 'Deleted',
+    'R': 'Replaced'
+}
+
+# 变更动作的位编码：内层循环用按位或聚合代替set的逐路径哈希插入，
+# 变更类型判定化简为几次位测试（mask & (mask - 1)非零即"多种动作"）
+_ACTION_BIT = {'A': 1, 'M': 2, 'D': 4, 'R': 8}
+
+# 通知邮件正文的静态HTML片段（模块级常量，两个邮件构建器共用，
+# 每封邮件直接引用同一份字符串而不是重新创建相同的字面量）
+_HTML_PREAMBLE = ("<html><body><h2>SVN仓库变更检测通知</h2>"
+                  "<p>检测到以下SVN仓库变更：</p>")
+_TABLE_HEADER = ('<table border="1" cellpadding="5" cellspacing="0">'
+                 '<tr bgcolor="#f2f2f2"><th>Revision</th><th>Author</th>'
+                 '<th>Date</th><th>Message</th><th>Change Type</th>'
+                 '<th>Changed Files</th></tr>')
+_TABLE_FOOTER = '</table><br>'
+_HTML_POSTAMBLE = '</body></html>'
+
+# 状态邮件的静态HTML片段（同上，进程生命周期内只构造一次，
+# 每次发送只拼接动态行）
+_STATUS_REPO_TABLE_HEADER = (
+    '<h3>检测的仓库列表</h3>'
+    '<table border="1" cellpadding="5" cellspacing="0">'
+    '<tr bgcolor="#f2f2f2"><th>仓库ID</th><th>仓库名称</th>'
+    '<th>状态</th></tr>')
+_STATUS_ERRORS_HEADER = (
+    "<h3 style='color: red;'>检测过程中发生的错误</h3>"
+    '<table border="1" cellpadding="5" cellspacing="0">'
+    '<tr bgcolor="#f2f2f2"><th>仓库</th><th>错误信息</th></tr>')
+_STATUS_POSTAMBLE = ('<p><em>此邮件由SVN监控程序自动发送，请勿回复。</em></p>'
+                     '</body></html>')
+
+# 清理/revert能修复的工作副本错误码：E155004（工作副本锁定）、
+# E155037（上次操作被中断）；其他错误码修复流程也无济于事
+_RECOVERABLE_SVN_ERRS = frozenset({'E155004', 'E155037'})
+
+def _abs_path(base_dir, path):
+    """把相对路径规范化为基于base_dir的绝对路径"""
+    return os.path.normpath(os.path.join(base_dir, path))
+
+@dataclass(frozen=True, slots=True)
+class RepoCfg:
+    """单个仓库配置的不可变快照
+
+    配置加载完成后内容不再变化，监控循环每个周期都要读取检查间隔和
+    通知开关；快照成frozen dataclass后热路径是C层的属性访问，
+    不必反复穿过configparser的节/键查找和布尔字符串解析。
+    """
+    name: str
+    url: str
+    repository_path: str
+    local_working_copy: str
+    check_interval: int
+    notify_on_changes: bool
+
+@dataclass(frozen=True, slots=True)
+class _RepoEmailMeta:
+    """通知邮件中单个仓库的显示信息快照
+
+    在send_email_notification的分组遍历中一次性算好，
+    主题格式化和正文组装直接取用，不再重查名称映射和仓库配置。
+    """
+    formatted_name: str
+    display: str
+
+# 'Repository Configs'工作表列名到INI键的映射
+# （数据驱动遍历，替代逐列手写的pd.notna判断）
+_REPO_COLUMN_KEYS = (
+    ('Repository Name', 'name'),
+    ('Repository Path', 'repository_path'),
+    ('URL', 'url'),
+    ('Username', 'username'),
+    ('Password', 'password'),
+    ('Check Interval', 'check_interval'),
+    ('Local Working Copy', 'local_working_copy'),
+    ('Notify On Changes', 'notify_on_changes'),
+)
+
+class _ConfigDict(dict):
+    """嵌套字典形式的配置对象（节名 -> {键: 字符串值}）
+
+    配置源是Excel，不需要configparser的插值/DEFAULT继承机制，
+    但部分使用方仍按configparser的读接口调用sections()，
+    这里补上该方法保持兼容；需要完整configparser语义的写路径
+    见SVNMonitor._as_configparser()。
+    """
+
+    def sections(self):
+        """返回全部节名（语义同configparser.sections()，无DEFAULT节）"""
+        return list(self.keys())
+
+
+class SVNMonitor:
+    """SVN Monitor class to handle SVN operations, monitoring, backup and restore"""
+    
+    def __init__(self, use_config_cache=True, max_concurrent=None):
+        """Initialize SVN Monitor with configuration from Excel file
+
+        Args:
+            use_config_cache: 是否允许使用配置Excel的磁盘解析缓存
+            max_concurrent: 并发检查仓库的最大数量（默认按CPU数自动推算）
+        """
+        # 使用Excel作为唯一配置源
+        # 使用项目根目录的config目录中的配置文件
+        base_dir = os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv else os.getcwd()
+        # 如果当前在src目录，需要向上退一级到项目根目录
+        if os.path.basename(base_dir) == 'src':
+            base_dir = os.path.dirname(base_dir)
+        self.config_file = os.path.join(base_dir, 'config', 'svn_monitor_config.xlsx')
+        # 是否允许配置Excel的磁盘解析缓存（进程内memoize见_read_sheets_cached）
+        self._use_config_cache = use_config_cache
+        # 启动路径上多个加载器都要判断配置Excel是否存在，这里只stat一次并缓存；
+        # st_mtime_ns/st_size同时充当_read_sheets_cached的缓存键
+        self._config_stat = self._stat_config_file()
+        self.config = self._load_config()
+        self._validate_config()
+        self.repositories = self._get_repositories()
+        # Convert relative paths to absolute paths in repository configurations
+        self._convert_relative_paths()
+        # 路径转换完成后快照仓库配置（见RepoCfg，监控循环走属性访问）
+        self.repos = self._build_repo_cfgs()
+        # 预构建仓库路径到配置的索引，钩子调用走O(1)查找（见process_commit）
+        self._path_to_repo = self._build_path_index()
+        self.last_revisions = self._get_last_recorded_revisions()
+        # 版本号落盘的去抖状态（见_save_last_revisions/_flush_revisions_if_due）
+        # _last_flush初始为0保证首次保存立即落盘（hook模式单次调用也能写入）
+        self._revisions_dirty = False
+        self._last_flush = 0.0
+        self._flush_interval = 30  # 秒
+        # 加载仓库名称映射关系（动态从Excel读取）
+        self.repo_name_mapping = self._load_repo_name_mapping()
+        # REPO_* ID的反向索引（原始仓库名->ID、中文名->ID）：
+        # 邮件主题和正文各自对repo_name_mapping做线性扫描找ID，
+        # 这里在映射加载后一次性建好，查找退化为两次dict.get
+        self._repo_id_by_name = {k: k for k in self.repo_name_mapping
+                                 if k.startswith('REPO_')}
+        self._repo_id_by_chinese = {v: k for k, v in self.repo_name_mapping.items()
+                                    if k.startswith('REPO_')}
+        # 加载收件人信息
+        self.recipients_mapping = self._load_recipients_from_excel()
+        # 预构建别名到收件人的扁平索引（见_build_recipient_index）
+        self._recipient_index = self._build_recipient_index()
+        # 收件人解析结果缓存（recipients_mapping在初始化后不再变化，
+        # 同一仓库的解析结果可以直接复用）
+        self._recipients_cache = {}
+        # 仓库显示名快照缓存（名称映射和仓库配置初始化后不再变化，
+        # 同一仓库的格式化结果跨多封邮件复用，见_format_repo）
+        self._repo_display_cache = {}
+        # 初始化远程检测模式配置
+        self.use_remote_check = self._get_remote_check_setting()
+        # 本地检测模式下也默认通过仓库URL拉取日志：svn log带URL参数
+        # 不需要工作副本，省掉仅为托管日志查询而做的整次svn update
+        # （可通过SYSTEM.fetch_log_via_url=False关闭，回到工作副本路径）
+        if 'SYSTEM' in self.config and 'fetch_log_via_url' in self.config['SYSTEM']:
+            self._fetch_log_via_url = str(
+                self.config['SYSTEM']['fetch_log_via_url']).lower() in ('true', '1', 'yes', 'on')
+        else:
+            self._fetch_log_via_url = True
+        # 并发轮询仓库时的并发上限（svn子进程是I/O密集型，
+        # 限流避免同时拉起过多进程压垮CPU或SVN服务器）；
+        # 优先级：构造参数 > PERF.svn_parallelism配置 > 按CPU数自动推算
+        if max_concurrent:
+            self.max_concurrent = max_concurrent
+        elif 'PERF' in self.config and 'svn_parallelism' in self.config['PERF']:
+            try:
+                self.max_concurrent = max(1, int(self.config['PERF']['svn_parallelism']))
+            except ValueError:
+                logger.warning("PERF.svn_parallelism配置无效，按CPU数自动推算并发上限")
+                self.max_concurrent = max(1, min(32, (os.cpu_count() or 1) * 2))
+        else:
+            self.max_concurrent = max(1, min(32, (os.cpu_count() or 1) * 2))
+        # SVN命令认证参数缓存（见_get_auth_args，按凭据缓存整组参数元组）
+        self._auth_args_cache = {}
+        # SVN子进程输出的解码编码：按系统首选编码探测一次
+        # （Linux下通常是UTF-8，Windows中文环境是cp936/GBK）
+        self._svn_encoding = locale.getpreferredencoding(False) or 'utf-8'
+        # 各工作副本最近一次清理成功的时刻（见_try_svn_cleanup的去重门）
+        self._cleanup_cache = {}
+        # 各工作副本最近一次更新成功的时刻（见_ensure_working_copy）：
+        # 短时间内的密集轮询不必每次都做整树svn update
+        self._wc_update_cache = {}
+        # 最新版本号的TTL缓存（见get_latest_revision）：
+        # 键为仓库URL，值为(查询时刻, 版本号)
+        self._rev_cache = {}
+        # 并发轮询时多个工作线程会同时读写上面两个缓存和版本号记录：
+        # _cache_lock保护TTL/清理缓存的检查-更新序列，
+        # _revisions_lock保护last_revisions的修改与落盘序列化
+        self._cache_lock = threading.Lock()
+        self._revisions_lock = threading.Lock()
+        # 提交通知的摘要合并窗口（秒）：钩子密集触发时（批量合并、
+        # 分支推送）把窗口内的多次提交合并为一封摘要邮件，每个窗口
+        # 只走一次SMTP握手；0表示关闭合并、每次提交立即发送
+        # （见_queue_digest/_flush_digest）
+        try:
+            self._digest_window = float(
+                self.config['SYSTEM'].get('digest_window_sec', '60')
+            ) if 'SYSTEM' in self.config else 60.0
+        except ValueError:
+            logger.warning("SYSTEM.digest_window_sec配置无效，使用默认值60秒")
+            self._digest_window = 60.0
+        self._pending_lock = threading.Lock()
+        # 缓冲的变更条数达到该值时不等窗口到期立即发送
+        self._digest_max_pending = 200
+        # 摘要缓冲放在磁盘上的JSONL假脱机文件里而不是内存：钩子模式下
+        # 每次提交都是一个短命进程，内存缓冲和窗口定时器活不过进程退出；
+        # 各钩子进程只往同一文件追加记录，窗口到期后由后续钩子触发或
+        # 监控循环统一取走合并发送（见_queue_digest/_flush_digest）
+        self._digest_spool = 'digest_spool.jsonl'
+        # 跨多封邮件复用的SMTP连接（见_get_smtp_conn/close_smtp），
+        # smtplib连接不是线程安全的，发送全程持有_smtp_lock
+        self._smtp_conn = None
+        self._smtp_lock = threading.Lock()
+        # 瞬时网络错误的指数退避状态（见_run_svn_command）：
+        # 命令成功时归位到0.1秒，连续失败时翻倍直至上限
+        try:
+            self._max_backoff = float(
+                self.config['PERF'].get('max_backoff_sec', '8')
+            ) if 'PERF' in self.config else 8.0
+        except ValueError:
+            logger.warning("PERF.max_backoff_sec配置无效，使用默认值8秒")
+            self._max_backoff = 8.0
+        self._svn_backoff = 0.1
+        try:
+            self._min_poll_interval = int(
+                self.config['SYSTEM'].get('min_poll_interval', '5')
+            ) if 'SYSTEM' in self.config else 5
+        except ValueError:
+            logger.warning("SYSTEM.min_poll_interval配置无效，使用默认值5秒")
+            self._min_poll_interval = 5
+        # 常驻线程池：整个生命周期只创建一次，避免每个检查周期
+        # 重新拉起工作线程；收到终止信号时在_handle_sigterm中关闭
+        self.pool = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                       thread_name_prefix='repo-check')
+        
+        # 设置程序运行标志和信号处理
+        self.running = True
+        self._term_signum = None
+        signal.signal(signal.SIGTERM, self._handle_sigterm)
+        signal.signal(signal.SIGINT, self._handle_sigterm)
+        # 信号唤醒管道：主循环在selector上等待而不是time.sleep小步轮询，
+        # 信号到达时内核向管道写入一个字节，等待立即返回（见_wait_for_next_check）
+        self._wakeup_r, wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(wakeup_w, False)
+        signal.set_wakeup_fd(wakeup_w)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        
+        logger.info(f"SVN Monitor initialized with {len(self.repositories)} repositories, remote check mode: {self.use_remote_check}")
+    
+    def _load_config(self):
+        """Load configuration from Excel file only
+
+        配置统一保存为普通的嵌套字典（节名 -> {键: 字符串值}），
+        而不是configparser.ConfigParser：配置源本来就是Excel，
+        不需要INI解析/插值/DEFAULT继承这些机制，字典查找也比
+        SectionProxy的代理查找更直接。需要configparser语义的
+        下游（如写INI文件）通过_as_configparser()适配，
+        读侧的sections()由_ConfigDict直接提供。
+        """
+        config = _ConfigDict()
+
+        # Load from Excel config file
+        if self._config_stat is not None:
+            logger.info(f"Loading configuration from Excel file: {self.config_file}")
+            success = self._load_config_from_excel(config, self.config_file)
+            if success:
+                return config
+            else:
+                logger.error("Failed to load configuration from Excel, creating default configuration")
+        else:
+            logger.warning(f"Configuration Excel file {self.config_file} not found. Creating default configuration.")
+
+        # Create default Excel configuration if it doesn't exist
+        self._create_default_config()
+        # 文件刚被（尝试）创建，刷新缓存的stat结果
+        self._config_stat = self._stat_config_file()
+
+        # Try to load the newly created configuration
+        success = self._load_config_from_excel(config, self.config_file)
+        if success:
+            return config
+        else:
+            # If all else fails, return a minimal default config
+            logger.error("Failed to create or load default configuration. Using minimal fallback config.")
+            return self._create_minimal_config()
+
+    def _stat_config_file(self):
+        """stat配置Excel文件，不存在时返回None
+
+        Returns:
+            os.stat_result或None
+        """
+        try:
+            return os.stat(self.config_file)
+        except OSError:
+            return None
+
+    def _read_config_sheets(self):
+        """读取配置Excel的两个工作表（统一入口，带两级缓存）
+
+        配置Excel会被三个加载器（全局配置、仓库名称映射、收件人）分别读取，
+        而Excel解析是启动路径上最慢的一步。这里统一走一个入口：
+        1. 进程内memoize：按(路径, mtime, 大小)为键缓存解析结果，
+           同一次启动中三个加载器共享同一份解析；文件被修改后键变化，
+           缓存自动失效；
+        2. 磁盘缓存：按文件内容的sha256哈希缓存pickle到config/.cache/，
+           配置未变化时重启直接反序列化，无需重新解析Excel。
+
+        Returns:
+            tuple: (repo_df, global_df)，对应'Repository Configs'和
+                   'Global Configs'工作表；读取失败的工作表为None
+        """
+        st = self._config_stat
+        if st is None:
+            raise FileNotFoundError(self.config_file)
+        return self._read_sheets_cached(self.config_file, st.st_mtime_ns, st.st_size,
+                                        self._use_config_cache)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _read_sheets_cached(path, mtime_ns, size, use_disk_cache):
+        """解析配置Excel的两个工作表（实际读取逻辑，见_read_config_sheets）
+
+        mtime_ns/size只作为缓存键的一部分，保证文件变化时重新解析。
+        """
+        import pandas as pd
+        import hashlib
+        import pickle
+
+        with open(path, 'rb') as f:
+            file_hash = hashlib.sha256(f.read()).hexdigest()
+        cache_dir = os.path.join(os.path.dirname(path), '.cache')
+        cache_file = os.path.join(cache_dir, f'{file_hash}.pkl')
+
+        # 磁盘缓存命中：直接反序列化，跳过Excel解析
+        if use_disk_cache:
+            try:
+                with open(cache_file, 'rb') as f:
+                    sheets = pickle.load(f)
+                logger.info(f"从缓存加载配置Excel解析结果: {cache_file}")
+                return sheets
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"读取配置缓存失败，将重新解析Excel: {str(e)}")
+
+        # 缓存未命中：打开一次Excel，解析两个工作表
+        repo_df = None
+        global_df = None
+        excel = pd.ExcelFile(path, engine=_EXCEL_ENGINE,
+                             engine_kwargs=_EXCEL_ENGINE_KWARGS)
+        try:
+            try:
+                repo_df = excel.parse('Repository Configs')
+            except Exception as e:
+                logger.warning(f"Error loading repository configs from Excel: {str(e)}")
+            try:
+                global_df = excel.parse('Global Configs')
+            except Exception as e:
+                logger.warning(f"Error loading global configs from Excel: {str(e)}")
+        finally:
+            excel.close()
+
+        sheets = (repo_df, global_df)
+
+        # 写入磁盘缓存，供下次启动复用（失败不影响正常流程）
+        if use_disk_cache:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_file, 'wb') as f:
+                    pickle.dump(sheets, f)
+            except Exception as e:
+                logger.warning(f"写入配置缓存失败: {str(e)}")
+
+        return sheets
+
+    def _load_config_from_excel(self, config, excel_file):
+        """Load configuration from Excel file and populate the config object"""
+        try:
+            import pandas as pd
+
+            # 首先检查Excel文件是否存在（复用__init__缓存的stat结果）
+            if self._config_stat is None:
+                logger.warning(f"Excel configuration file does not exist: {excel_file}")
+                return False
+
+            # 先绑定两个工作表变量：_read_config_sheets整体失败
+            # （文件损坏、权限问题等）会在第一个try里抛出，
+            # 否则下面的全局配置块会因global_df未定义报NameError
+            repo_df = global_df = None
+
+            # Try to load repository configs sheet
+            try:
+                repo_df, global_df = self._read_config_sheets()
+                if repo_df is None:
+                    raise ValueError("'Repository Configs'工作表读取失败")
+
+                # Process each repository configuration
+                # 先把NaN统一替换为None并一次性物化为普通字典列表，
+                # 避免iterrows为每行构造Series以及逐单元格pd.notna判断的开销
+                records = repo_df.where(repo_df.notna(), None).to_dict('records')
+                for row in records:
+                    repo_id = row.get('Repository ID')
+                    if not repo_id:
+                        continue
+                    section_values = config.setdefault(repo_id, {})
+
+                    # Map Excel columns to INI keys
+                    for column, key in _REPO_COLUMN_KEYS:
+                        value = row.get(column)
+                        if value is not None:
+                            section_values[key] = str(value)
+            except Exception as e:
+                logger.warning(f"Error loading repository configs from Excel: {str(e)}")
+            
+            # Try to load global configs sheet
+            try:
+                if global_df is None:
+                    raise ValueError("'Global Configs'工作表读取失败")
+
+                for row in global_df.where(global_df.notna(), None).to_dict('records'):
+                    section = row.get('Section')
+                    key = row.get('Key')
+                    value = row.get('Value')
+
+                    if section and key is not None:
+                        config.setdefault(section, {})[key] = str(value)
+            except Exception as e:
+                logger.warning(f"Error loading global configs from Excel: {str(e)}")
+            
+            # 检查是否成功加载了任何配置
+            if len(config) > 0:
+                logger.info("Configuration successfully loaded from Excel file")
+                return True
+            else:
+                logger.warning("No configuration sections were loaded from Excel file")
+                return False
+            
+        except ImportError:
+            logger.error("pandas library not installed. Cannot read Excel configuration.")
+            return False
+        except Exception as e:
+            logger.error(f"Error loading configuration from Excel: {str(e)}")
+            return False
+    
+    def _create_default_config(self):
+        """Create default configuration Excel file instead of INI"""
+        try:
+            import pandas as pd
+            
+            # 确保配置目录存在
+            config_dir = os.path.dirname(self.config_file)
+            if not os.path.exists(config_dir):
+                os.makedirs(config_dir, exist_ok=True)
+                logger.info(f"Created configuration directory: {config_dir}")
+            
+            # 创建仓库配置数据 - 使用更合理的默认值
+            repo_data = {
+                'Repository ID': ['REPO_1'],
+                'Repository Name': ['Demo Repository'],
+                'Repository Path': ['https://svn.apache.org/repos/asf/subversion/trunk'],
+                'URL': ['https://svn.apache.org/repos/asf/subversion/trunk'],
+                'Username': [''],
+                'Password': [''],
+                'Check Interval': [DEFAULT_CHECK_INTERVAL],
+                'Local Working Copy': [os.path.join(os.path.dirname(self.config_file), '..', 'svn_wc', 'repo_1')],
+                'Notify On Changes': [False],
+                'Recipients': ['admin@example.com']
+            }
+            
+            # 创建全局配置数据
+            global_data = {
+                'Section': ['EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'EMAIL', 'LOGGING', 'LOGGING', 'SYSTEM', 'SYSTEM', 'SYSTEM'],
+                'Key': ['smtp_server', 'smtp_port', 'use_ssl', 'username', 'password', 'from_email', 'to_emails', 'log_file', 'log_level', 'auto_startup', 'mode', 'use_remote_check'],
+                'Value': ['smtp.example.com', '465', 'True', 'svn@example.com', 'your_password', 'svn@example.com', 'admin@example.com', 'svn_monitor.log', 'INFO', 'True', 'monitor', 'False']
+            }
+            
+            # 创建DataFrame
+            repo_df = pd.DataFrame(repo_data)
+            global_df = pd.DataFrame(global_data)
+            
+            # 保存为Excel文件
+            with pd.ExcelWriter(self.config_file, engine='openpyxl') as writer:
+                repo_df.to_excel(writer, sheet_name='Repository Configs', index=False)
+                global_df.to_excel(writer, sheet_name='Global Configs', index=False)
+            
+            logger.info(f"Default configuration Excel created at {self.config_file}")
+            return True
+        except ImportError:
+            logger.error("pandas library not installed. Cannot create Excel configuration.")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to create default configuration Excel: {str(e)}")
+            return False
+    
+    def _create_minimal_config(self):
+        """Create minimal fallback configuration when Excel creation fails"""
+        return _ConfigDict({
+            'SVN': {
+                'url': 'https://svn.apache.org/repos/asf/subversion/trunk',
+                'repository_path': 'https://svn.apache.org/repos/asf/subversion/trunk',
+                'username': '',
+                'password': '',
+                'check_interval': str(DEFAULT_CHECK_INTERVAL),
+                'local_working_copy': os.path.join(os.getcwd(), 'svn_wc'),
+            },
+            'EMAIL': {
+                'smtp_server': 'smtp.example.com',
+                'smtp_port': '465',
+                'use_ssl': 'True',
+                'username': '',
+                'password': '',
+                'from_email': 'svn@example.com',
+                'to_emails': 'admin@example.com',
+            },
+            'LOGGING': {
+                'log_file': 'svn_monitor.log',
+                'log_level': 'INFO',
+            },
+            'SYSTEM': {
+                'auto_startup': 'False',
+                'mode': 'monitor',
+                'use_remote_check': 'False',
+            },
+            'REPO_1': {
+                'name': 'Default Repository',
+                'url': 'https://svn.apache.org/repos/asf/subversion/trunk',
+                'repository_path': 'https://svn.apache.org/repos/asf/subversion/trunk',
+                'username': '',
+                'password': '',
+                'check_interval': str(DEFAULT_CHECK_INTERVAL),
+                'local_working_copy': os.path.join(os.getcwd(), 'svn_wc', 'repo_1'),
+                'notify_on_changes': 'False',
+            },
+        })
+
+    def _get_repositories(self):
+        """Get all repository configurations from the config file"""
+        repositories = {}
+        # 直接迭代配置对象：嵌套字典和configparser.ConfigParser都支持，
+        # 后者会额外迭代出DEFAULT节，但不匹配REPO_前缀，自然被过滤
+        for section in self.config:
+            if section.startswith('REPO_'):
+                repo_name = section[5:]  # Remove 'REPO_' prefix
+                repositories[repo_name] = self.config[section]
+        return repositories
+
+    def _as_configparser(self):
+        """把嵌套字典配置适配为configparser.ConfigParser
+
+        供仍需要configparser语义的下游使用（目前只有写INI文件的路径）。
+        如果self.config本身就是ConfigParser（测试会注入），直接返回。
+
+        Returns:
+            configparser.ConfigParser: 含当前全部配置的ConfigParser对象
+        """
+        if isinstance(self.config, configparser.ConfigParser):
+            return self.config
+        adapter = configparser.ConfigParser()
+        adapter.read_dict(self.config)
+        return adapter
+        
+    def _build_repo_cfgs(self):
+        """把各仓库配置快照为不可变的RepoCfg
+
+        Returns:
+            dict: 仓库名称到RepoCfg的映射
+        """
+        repos = {}
+        for repo_name, repo_config in self.repositories.items():
+            try:
+                check_interval = int(repo_config.get('check_interval', str(DEFAULT_CHECK_INTERVAL)))
+            except ValueError:
+                logger.warning(f"仓库 '{repo_name}' 的check_interval配置无效，使用默认值")
+                check_interval = DEFAULT_CHECK_INTERVAL
+            repos[repo_name] = RepoCfg(
+                name=repo_config.get('name', repo_name),
+                url=repo_config.get('url', ''),
+                repository_path=repo_config.get('repository_path', ''),
+                local_working_copy=repo_config.get('local_working_copy', ''),
+                check_interval=check_interval,
+                # 'immediate'（跳过摘要、逐封即时发送，见process_commit）
+                # 同样算开启通知，否则轮询路径会把它当作通知关闭、
+                # 不发邮件就推进版本号，直接丢掉这些变更通知
+                notify_on_changes=str(repo_config.get('notify_on_changes', 'True')).lower() in ('true', 'immediate')
+            )
+        return repos
+
+    def _build_path_index(self):
+        """预构建规范化仓库路径到(名称, 配置)的索引
+
+        process_commit由post-commit钩子高频触发，原本每次都要对所有
+        仓库做双向子串匹配；这里按规范化路径建一次索引，命中时只需
+        一次dict查找。未命中的（子串形式的部分路径）仍走线性回退。
+
+        Returns:
+            dict: 规范化小写路径 -> (仓库名称, 仓库配置)
+        """
+        index = {}
+        for repo_name, repo_config in self.repositories.items():
+            if 'repository_path' in repo_config and repo_config['repository_path']:
+                key = os.path.normpath(repo_config['repository_path']).lower()
+                index.setdefault(key, (repo_name, repo_config))
+        return index
+
+    def _convert_relative_paths(self):
+        """Convert relative paths in configuration to absolute paths based on project directory"""
+        # 使用项目目录作为基础目录（脚本所在目录）
+        base_dir = os.path.dirname(os.path.abspath(sys.argv[0])) if sys.argv else os.getcwd()
+        
+        # 确保所有相对路径都转换为绝对路径，基于项目目录
+        
+        # Convert paths in main SVN section if it exists
+        if 'SVN' in self.config:
+            for key in ['local_working_copy', 'local_path', 'repository_path', 'url']:
+                if key in self.config['SVN']:
+                    path = self.config['SVN'][key]
+                    # 仅对文件路径进行转换，URL类型的路径保持不变
+                    if path and not os.path.isabs(path) and not path.startswith(_URL_PREFIXES):
+                        self.config['SVN'][key] = _abs_path(base_dir, path)
+        
+        # Convert paths in each repository configuration
+        for repo_name, repo_config in self.repositories.items():
+            for key in ['local_working_copy', 'repository_path']:
+                if key in repo_config:
+                    path = repo_config[key]
+                    # 仅对文件路径进行转换，URL类型的路径保持不变
+                    if path and not os.path.isabs(path) and not path.startswith(_URL_PREFIXES):
+                        abs_path = _abs_path(base_dir, path)
+                        # Update in both the repositories dictionary and the config object
+                        repo_config[key] = abs_path
+                        self.config[f'REPO_{repo_name}'][key] = abs_path
+        
+        # Convert log file path
+        if 'LOGGING' in self.config and 'log_file' in self.config['LOGGING']:
+            log_file = self.config['LOGGING']['log_file']
+            if log_file and not os.path.isabs(log_file):
+                self.config['LOGGING']['log_file'] = _abs_path(base_dir, log_file)
+        
+        logger.info(f"Relative paths converted to absolute paths using base directory: {base_dir}")
+    
+    def _create_default_repository_config(self):
+        """Create a default repository configuration"""
+        self.config['REPO_1'] = {
+            'name': 'Demo Repository',
+            'repository_path': 'https://svn.apache.org/repos/asf/subversion/trunk',
+            'username': '',
+            'password': '',
+            'check_interval': str(DEFAULT_CHECK_INTERVAL),  # in seconds
+            'local_working_copy': os.path.join(os.getcwd(), 'svn_wc', 'repo_1'),
+            'enable_notifications': 'False',
+            'enable_backup': 'False'
+        }
+        
+        # Save the updated configuration
+        try:
+            with open(self.config_file, 'w', encoding='utf-8') as f:
+                self._as_configparser().write(f)
+            logger.info("Default repository configuration created")
+        except Exception as e:
+            logger.error(f"Failed to save default repository configuration: {str(e)}")
+    
+    def _get_last_recorded_revisions(self):
+        """Get the last recorded revisions for all repositories"""
+        revisions = {}
+        revision_file = 'last_revisions.json'
+        
+        if os.path.exists(revision_file):
+            try:
+                import json
+                with open(revision_file, 'r') as f:
+                    loaded_revisions = json.load(f)
+                    
+                # Only keep revisions for repositories that actually exist in configuration
+                for repo_name in self.repositories:
+                    if repo_name in loaded_revisions:
+                        revisions[repo_name] = loaded_revisions[repo_name]
+            except Exception as e:
+                logger.error(f"Failed to read last revisions: {str(e)}")
+        
+        # Initialize revisions for repositories without recorded data
+        for repo_name in self.repositories:
+            if repo_name not in revisions:
+                revisions[repo_name] = 0
+        
+        return revisions
+    
+    def _get_remote_check_setting(self):
+        """获取远程检测模式配置"""
+        if 'SYSTEM' in self.config and 'use_remote_check' in self.config['SYSTEM']:
+            value = self.config['SYSTEM']['use_remote_check']
+            return str(value).lower() in ('true', '1', 'yes', 'on')
+        return False
+    
+    def _handle_sigterm(self, signum, frame):
+        """处理终止信号(SIGTERM和SIGINT)
+
+        处理器里只设置退出标志：信号打断的可能是正持有_smtp_lock、
+        _pending_lock或日志锁的主线程，在这里冲刷摘要或关闭SMTP会在
+        自家线程已持有的锁上死锁。实际清理（线程池关闭、摘要冲刷、
+        版本号落盘、SMTP关闭、日志冲刷）由run()的循环退出路径完成，
+        signal.set_wakeup_fd注册的管道会立即唤醒等待中的主循环。
+
+        Args:
+            signum: 信号编号
+            frame: 当前堆栈帧
+        """
+        self._term_signum = signum
+        self.running = False
+    
+    def _save_last_revisions(self, revisions):
+        """Save the last revisions for all repositories
+
+        写入做了去抖：先更新内存并标记为脏，只有距离上次落盘超过
+        _flush_interval（或强制flush，见_handle_sigterm）时才真正写文件，
+        避免仓库较多时每个变更事件都把整个JSON文件重写一遍。
+        """
+        self.last_revisions = revisions
+        self._revisions_dirty = True
+        self._flush_revisions_if_due()
+
+    def _flush_revisions_if_due(self, force=False):
+        """将内存中的版本号记录落盘（带去抖、文件锁合并和原子替换）
+
+        钩子模式下多个进程可能并发写同一状态文件（svnserve会为每个
+        提交fork一次钩子），直接覆盖会丢掉其他进程刚写入的版本号。
+        落盘前先在.lock文件上拿排它锁，重读磁盘上的记录并按每仓库
+        取最大值合并，再写临时文件原子替换，保证版本号单调不回退。
+
+        Args:
+            force: 为True时忽略去抖间隔立即落盘（退出或收到终止信号时使用）
+        """
+        if not self._revisions_dirty:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self._flush_interval:
+            return
+
+        revision_file = 'last_revisions.json'
+        tmp_file = revision_file + '.tmp'
+        lock_file = revision_file + '.lock'
+        try:
+            with open(lock_file, 'w') as lock_f:
+                if fcntl is not None:
+                    fcntl.flock(lock_f, fcntl.LOCK_EX)
+                try:
+                    # 锁内重读磁盘记录并按最大值合并，
+                    # 避免并发钩子进程互相覆盖对方刚写入的版本号；
+                    # 合并和序列化放在线程锁内，防止并发轮询线程在
+                    # 遍历/序列化期间修改字典
+                    with self._revisions_lock:
+                        try:
+                            with open(revision_file, 'r') as f:
+                                stored = _json.load(f)
+                            for repo_name, stored_rev in stored.items():
+                                if stored_rev > self.last_revisions.get(repo_name, 0):
+                                    self.last_revisions[repo_name] = stored_rev
+                        except (FileNotFoundError, ValueError):
+                            pass
+
+                        payload = _dumps(self.last_revisions)
+                    with open(tmp_file, 'wb') as f:
+                        f.write(payload)
+                    # 先写临时文件再原子替换，避免崩溃时留下写了一半的JSON
+                    os.replace(tmp_file, revision_file)
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_f, fcntl.LOCK_UN)
+            self._revisions_dirty = False
+            self._last_flush = now
+            logger.info(f"Last revisions updated")
+        except Exception as e:
+            logger.error(f"Failed to save last revisions: {str(e)}")
+    
+    def _load_repo_name_mapping(self):
+        """动态从Excel加载仓库名称映射关系
+        
+        Returns:
+            dict: 双向映射字典，包含英文到中文、中文到英文的映射
+        """
+        mapping = {}
+
+        # 从完整配置Excel加载仓库信息（复用__init__缓存的stat结果）
+        if self._config_stat is not None:
+            try:
+                import pandas as pd
+
+                # 尝试从完整配置Excel加载（复用缓存的解析结果）
+                repo_df, _ = self._read_config_sheets()
+                if repo_df is None:
+                    raise ValueError("'Repository Configs'工作表读取失败")
+
+                # 检查是否有必要的列
+                if 'Repository ID' in repo_df.columns and 'Repository Name' in repo_df.columns:
+                    # NaN统一替换为None后按普通字典遍历，避免iterrows逐行构造Series
+                    for row in repo_df.where(repo_df.notna(), None).to_dict('records'):
+                        repo_id = row.get('Repository ID')
+                        repo_name = row.get('Repository Name')
+
+                        if repo_id is not None and repo_name is not None:
+                            repo_id_str = str(repo_id).strip()
+                            repo_name_str = str(repo_name).strip()
+                            
+                            # 添加双向映射
+                            mapping[repo_id_str] = f"{repo_name_str}仓库"  # 例如：REPO_1 -> 采购仓库
+                            mapping[f"{repo_name_str}仓库"] = repo_id_str  # 例如：采购仓库 -> REPO_1
+                            mapping[repo_name_str] = repo_id_str  # 简写形式：采购 -> REPO_1
+                
+                # 添加一些常见的别名映射（向后兼容）
+                mapping['Procurement'] = '采购仓库'
+                mapping['Production'] = '生产仓库'
+                
+                logger.info(f"成功加载仓库名称映射关系: {mapping}")
+            except Exception as e:
+                logger.warning(f"从Excel加载仓库名称映射失败: {str(e)}")
+                # 使用默认映射作为备份
+                mapping = self._get_default_repo_mapping()
+        else:
+            # 使用默认映射作为备份
+            mapping = self._get_default_repo_mapping()
+            
+        return mapping
+    
+    def _get_default_repo_mapping(self):
+        """获取默认的仓库名称映射（作为备份）"""
+        return {
+            'REPO_1': '采购仓库',
+            'REPO_2': '生产仓库',
+            'REPO_3': '研发仓库',
+            'REPO_4': '质量仓库',
+            'REPO_5': '售后仓库',
+            '采购仓库': 'REPO_1',
+            '生产仓库': 'REPO_2',
+            '研发仓库': 'REPO_3',
+            '质量仓库': 'REPO_4',
+            '售后仓库': 'REPO_5',
+            '采购': 'REPO_1',
+            '生产': 'REPO_2',
+            '研发': 'REPO_3',
+            '质量': 'REPO_4',
+            '售后': 'REPO_5',
+            'Procurement': '采购仓库',
+            'Production': '生产仓库'
+        }
+    
+    def _load_recipients_from_excel(self):
+        """从Excel文件中加载收件人信息
+        
+        支持两种格式：
+        1. 完整配置Excel（svn_monitor_config.xlsx）：从'Repository Configs'工作表加载
+        2. 旧版收件人Excel：从第一列和第二列加载
+        
+        Returns:
+            dict: 仓库名称到收件人列表的映射
+        """
+        recipients_mapping = {}
+        
+        # 首先检查是否存在完整配置Excel文件（复用__init__缓存的stat结果）
+        if self._config_stat is not None:
+            try:
+                import pandas as pd
+
+                # 尝试从完整配置Excel加载（复用缓存的解析结果）
+                repo_df, _ = self._read_config_sheets()
+                if repo_df is None:
+                    raise ValueError("'Repository Configs'工作表读取失败")
+
+                # 检查是否有Recipients列
+                if 'Recipients' in repo_df.columns:
+                    # NaN统一替换为None后按普通字典遍历，避免iterrows逐行构造Series
+                    for row in repo_df.where(repo_df.notna(), None).to_dict('records'):
+                        # 获取仓库ID或名称
+                        repo_id = row.get('Repository ID') or row.get('Repository Name')
+                        if repo_id is not None:
+                            repo_name = str(repo_id).strip()
+                            recipients_str = row.get('Recipients')
+
+                            if recipients_str is not None:
+                                # 分割多个邮箱地址
+                                recipients = [email for email in _EMAIL_SPLIT.split(str(recipients_str).strip()) if email]
+                                if recipients:
+                                    recipients_mapping[repo_name] = recipients
+                                    logger.info(f"从完整配置Excel加载仓库 '{repo_name}' 的收件人: {', '.join(recipients)}")
+                
+                logger.info(f"成功从完整配置Excel加载 {len(recipients_mapping)} 个仓库的收件人信息")
+                return recipients_mapping
+                
+            except Exception as e:
+                logger.warning(f"从完整配置Excel加载收件人失败: {str(e)}，尝试使用旧版收件人配置")
+        
+        # 如果完整配置Excel不存在或加载失败，尝试使用旧版收件人Excel
+        if 'EMAIL' in self.config and 'recipients_excel' in self.config['EMAIL']:
+            excel_path = self.config['EMAIL']['recipients_excel']
+            
+            # 确保路径是绝对路径
+            if not os.path.isabs(excel_path):
+                base_dir = os.path.dirname(os.path.abspath(self.config_file))
+                excel_path = os.path.normpath(os.path.join(base_dir, excel_path))
+            
+            # 检查pandas是否已安装
+            if pd is None:
+                logger.warning(f"pandas库未安装，无法读取收件人Excel文件: {excel_path}")
+                return recipients_mapping
+            
+            # 检查文件是否存在
+            if not os.path.exists(excel_path):
+                logger.warning(f"收件人Excel文件不存在: {excel_path}")
+                return recipients_mapping
+            
+            try:
+                # 读取Excel文件
+                df = pd.read_excel(excel_path, engine=_EXCEL_ENGINE,
+                                   engine_kwargs=_EXCEL_ENGINE_KWARGS)
+                
+                # 检查必要的列是否存在
+                if df.empty:
+                    logger.warning(f"收件人Excel文件为空: {excel_path}")
+                    return recipients_mapping
+                
+                # 获取列名（使用前两列）
+                columns = df.columns.tolist()
+                if len(columns) < 2:
+                    logger.warning(f"收件人Excel文件格式不正确，至少需要两列: {excel_path}")
+                    return recipients_mapping
+                
+                repo_col = columns[0]
+                email_col = columns[1]
+                
+                # 处理每一行数据
+                for _, row in df.iterrows():
+                    repo_name = str(row[repo_col]).strip()
+                    email_str = str(row[email_col]).strip()
+                    
+                    # 跳过空值
+                    if repo_name and email_str and repo_name.lower() != 'nan' and email_str.lower() != 'nan':
+                        # 分割多个邮箱地址
+                        recipients = [email for email in _EMAIL_SPLIT.split(email_str) if email]
+                        if recipients:
+                            recipients_mapping[repo_name] = recipients
+                            logger.info(f"从Excel加载仓库 '{repo_name}' 的收件人: {', '.join(recipients)}")
+                
+                logger.info(f"成功从旧版收件人Excel加载 {len(recipients_mapping)} 个仓库的收件人信息")
+            except Exception as e:
+                logger.error(f"读取旧版收件人Excel文件时出错: {str(e)}")
+        
+        return recipients_mapping
+    
+    def _get_recipients_for_repository(self, repo_name):
+        """获取指定仓库的收件人列表
+
+        每个变更事件都会查询一次收件人，而同一仓库的解析结果不会变化，
+        因此首次解析后缓存在self._recipients_cache中，后续直接返回。
+
+        Args:
+            repo_name: 仓库名称
+
+        Returns:
+            str: 收件人邮箱字符串（逗号分隔）
+        """
+        cached = self._recipients_cache.get(repo_name)
+        if cached is not None:
+            return cached
+
+        recipients_str = self._resolve_recipients(repo_name)
+        self._recipients_cache[repo_name] = recipients_str
+        return recipients_str
+
+    def _build_recipient_index(self):
+        """预构建仓库别名到收件人字符串的扁平索引
+
+        _resolve_recipients原本要按直接匹配、名称映射、加/去REPO_前缀
+        的顺序做最多4次字典查找；这里把每个仓库的所有已知别名一次性
+        展开进一个扁平字典，热路径上的解析退化为一次dict查找。
+        按原有优先级顺序写入（高优先级先写，低优先级用setdefault不覆盖）。
+
+        Returns:
+            dict: 仓库别名 -> 逗号分隔的收件人字符串
+        """
+        index = {}
+        # 优先级1：配置键本身的直接匹配
+        for key, recipients in self.recipients_mapping.items():
+            index[key] = ', '.join(recipients)
+        # 优先级2：仓库名称映射（中英文别名）指向的配置键
+        for alias, canonical in self.repo_name_mapping.items():
+            if canonical in self.recipients_mapping:
+                index.setdefault(alias, ', '.join(self.recipients_mapping[canonical]))
+        # 优先级3/4：加/去REPO_前缀的变体
+        for key, recipients in self.recipients_mapping.items():
+            variant = key[5:] if key.startswith('REPO_') else f'REPO_{key}'
+            if variant:
+                index.setdefault(variant, ', '.join(recipients))
+        return index
+
+    def _resolve_recipients(self, repo_name):
+        """解析指定仓库的收件人（未缓存路径，见_get_recipients_for_repository）
+
+        Args:
+            repo_name: 仓库名称
+
+        Returns:
+            str: 收件人邮箱字符串（逗号分隔）
+        """
+        # 热路径日志：使用惰性%格式化，级别被过滤时不做任何字符串拼接；
+        # 整个mapping的repr很大，只在DEBUG级别输出
+        logger.debug("尝试获取仓库 '%s' 的收件人", repo_name)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("当前recipients_mapping: %s", self.recipients_mapping)
+
+        # 所有已知别名（直接匹配、名称映射、REPO_前缀变体）
+        # 都已在_build_recipient_index中展开，这里只做一次查找
+        recipients_str = self._recipient_index.get(repo_name)
+        if recipients_str is not None:
+            logger.info("使用Excel中配置的仓库 '%s' 的收件人: %s", repo_name, recipients_str)
+            return recipients_str
+
+        # 如果recipients_mapping不为空，尝试从Excel中获取所有收件人
+        if self.recipients_mapping:
+            all_excel_recipients = set()
+            for repo, recipients in self.recipients_mapping.items():
+                all_excel_recipients.update(recipients)
+            if all_excel_recipients:
+                logger.info("未找到特定仓库的收件人，使用Excel中所有的收件人: %s", ', '.join(all_excel_recipients))
+                return ', '.join(all_excel_recipients)
+
+        # 如果Excel中没有配置，使用默认收件人
+        default_recipients = self.config['EMAIL'].get('to_emails', '')
+        logger.info("使用默认收件人: %s", default_recipients)
+        return default_recipients
+    
+    def process_commit(self, repository_path, revision):
+        """Process a single commit triggered by SVN hook
+        
+        Args:
+            repository_path: Path to the SVN repository
+            revision: The revision number of the commit
+        """
+        try:
+            revision = int(revision)
+            logger.info(f"Processing commit for repository: {repository_path}, revision: {revision}")
+            
+            # Find the matching repository configuration
+            matching_repo = None
+            matching_repo_name = None
+
+            # 优先走预构建的路径索引（O(1)精确匹配，见_build_path_index）
+            indexed = self._path_to_repo.get(os.path.normpath(repository_path).lower())
+            if indexed is not None:
+                matching_repo_name, matching_repo = indexed
+            else:
+                # 索引未命中（钩子传入的可能是部分路径），回退到双向子串匹配
+                for repo_name, repo_config in self.repositories.items():
+                    if 'repository_path' in repo_config:
+                        # Check if the repository path matches
+                        if repository_path in repo_config['repository_path'] or \
+                           repo_config['repository_path'] in repository_path:
+                            matching_repo = repo_config
+                            matching_repo_name = repo_name
+                            break
+            
+            if not matching_repo:
+                logger.warning(f"No matching repository configuration found for: {repository_path}")
+                # Try to use the first repository config as fallback
+                if self.repositories:
+                    matching_repo_name, matching_repo = next(iter(self.repositories.items()))
+                    logger.warning(f"Using fallback repository configuration: {matching_repo_name}")
+                else:
+                    logger.error("No repository configurations available")
+                    return
+            
+            # 钩子已确认仓库产生了新版本，失效最新版本号的TTL缓存，
+            # 避免随后的查询拿到过期的缓存值
+            with self._cache_lock:
+                self._rev_cache.pop(
+                    matching_repo.get('repository_path', matching_repo.get('url', '')), None)
+
+            # Get the last recorded revision
+            last_revision = self.last_revisions.get(matching_repo_name, 0)
+            
+            # Only process if this is a new revision
+            if revision > last_revision:
+                logger.info(f"New commit detected: {last_revision} -> {revision}")
+                
+                # Log the operation
+                self.log_operation('COMMIT_PROCESSED', 
+                                  f"Processing commit: {last_revision} -> {revision}",
+                                  repository=matching_repo_name)
+                
+                # Get the changes
+                changes = self.get_changes(last_revision, revision, matching_repo)
+                
+                # Send notification if enabled
+                notify_mode = str(matching_repo.get('notify_on_changes', 'True')).lower()
+                if notify_mode in ('true', 'immediate') and changes:
+                    if notify_mode == 'immediate' or self._digest_window <= 0:
+                        # 快路径：该仓库要求立即通知（或摘要窗口被关闭），
+                        # 每次提交单独发送一封邮件
+                        email_success = self.send_email_notification(changes)
+
+                        # Update revision if email was sent successfully
+                        if email_success:
+                            logger.info(f"Email notification successful for revision {revision}")
+                            with self._revisions_lock:
+                                self.last_revisions[matching_repo_name] = revision
+                            self._save_last_revisions(self.last_revisions)
+                        else:
+                            logger.warning(f"Email notification failed for revision {revision}")
+                    else:
+                        # 摘要路径：放入缓冲，窗口到期后合并为一封邮件发送
+                        self._queue_digest(changes, matching_repo_name, revision)
+                else:
+                    # Update revision even if notifications are disabled
+                    with self._revisions_lock:
+                        self.last_revisions[matching_repo_name] = revision
+                    self._save_last_revisions(self.last_revisions)
+            else:
+                logger.info(f"Revision {revision} has already been processed")
+                
+        except Exception as e:
+            error_msg = f"Error processing commit: {str(e)}"
+            logger.error(error_msg)
+            self.log_operation('ERROR', error_msg)
+    
+    def _try_svn_cleanup(self, working_dir, repo_config=None):
+        """尝试执行SVN清理操作来解除锁定"""
+        try:
+            if not working_dir:
+                logger.warning("无法执行SVN清理：工作目录为空")
+                return False
+            
+            # 检查工作目录是否存在
+            if not os.path.exists(working_dir):
+                logger.warning(f"工作目录不存在，无法清理: {working_dir}")
+                return False
+            
+            # 检查是否为SVN工作副本
+            svn_dir = os.path.join(working_dir, '.svn')
+            if not os.path.exists(svn_dir):
+                logger.warning(f"目录不是SVN工作副本，无法清理: {working_dir}")
+                return False
+
+            # 刚清理过的工作副本60秒内不再重复清理：cleanup要扫描整个
+            # wc.db，健康副本上反复执行纯属浪费；出现新的锁定错误时
+            # 调用方会先失效该缓存（见_run_svn_command）
+            cleanup_key = os.path.abspath(working_dir)
+            now = time.monotonic()
+            with self._cache_lock:
+                recently_cleaned = now - self._cleanup_cache.get(cleanup_key, 0) < 60
+            if recently_cleaned:
+                logger.debug("跳过SVN清理：%s 刚清理过", working_dir)
+                return True
+
+            logger.info(f"执行SVN清理操作: {working_dir}")
+            
+            # 构建清理命令 - 使用绝对路径确保正确性
+            cleanup_command = ['svn', 'cleanup', working_dir]
+            
+            # 添加凭据（如果可用，复用缓存的认证参数元组）
+            cleanup_command.extend(self._get_auth_args(repo_config))
+
+            # 执行清理命令（由subprocess按系统首选编码直接解码输出）
+            result = subprocess.run(
+                cleanup_command,
+                capture_output=True,
+                cwd=working_dir,  # 在工作目录中执行清理
+                check=True,
+                encoding=self._svn_encoding,
+                errors='replace'
+            )
+
+            logger.info(f"SVN清理成功: {result.stdout.strip() if result.stdout else '无输出'}")
+            with self._cache_lock:
+                self._cleanup_cache[cleanup_key] = now
+            return True
+
+        except subprocess.CalledProcessError as e:
+            error_message = e.stderr or ''
+            logger.error(f"SVN清理失败: {error_message}")
+            
+            # 如果清理失败，尝试手动删除锁定文件
+            if _LOCK_ERR_RE.search(error_message):
+                logger.info("尝试手动删除锁定文件")
+                manual_cleanup_success = self._remove_svn_locks_manually(working_dir)
+                
+                # 手动删除锁定文件后，重试SVN清理操作
+                if manual_cleanup_success:
+                    logger.info("手动锁定文件删除成功，重试SVN清理")
+                    try:
+                        # 重新执行清理命令
+                        result = subprocess.run(
+                            cleanup_command,
+                            capture_output=True,
+                            cwd=working_dir,
+                            check=True
+                        )
+                        logger.info(f"重试SVN清理成功: {result.stdout.strip() if result.stdout else '无输出'}")
+                        return True
+                    except subprocess.CalledProcessError as retry_e:
+                        logger.error(f"重试SVN清理仍然失败: {retry_e.stderr}")
+                        return False
+                else:
+                    logger.error("手动锁定文件删除失败")
+                    return False
+            
+            return False
+        except Exception as e:
+            logger.error(f"执行SVN清理时出错: {str(e)}")
+            return False
+    
+    def _remove_svn_locks_manually(self, working_dir):
+        """手动删除SVN锁定文件"""
+        try:
+            svn_dir = os.path.join(working_dir, '.svn')
+            if not os.path.exists(svn_dir):
+                logger.warning(f"SVN目录不存在: {svn_dir}")
+                return False
+            
+            # SVN的锁定文件只会出现在少数固定位置（wc.db的SQLite侧车文件、
+            # .svn/lock和.svn/tmp下），定向检查这些位置即可；
+            # 原来的os.walk会遍历整个.svn树——pristine目录在大工作副本里
+            # 可能有几十万个文件，全量遍历的代价远超清理本身
+            candidates = [
+                os.path.join(svn_dir, 'lock'),
+                os.path.join(svn_dir, 'wc.db-journal'),
+                os.path.join(svn_dir, 'wc.db-wal'),
+                os.path.join(svn_dir, 'wc.db-shm'),
+            ]
+            candidates.extend(glob.iglob(os.path.join(svn_dir, 'tmp', '*lock*')))
+
+            lock_files = [path for path in candidates if os.path.lexists(path)]
+
+            if not lock_files:
+                logger.info("未找到锁定文件")
+                return False
+            
+            # 删除所有锁定文件
+            for lock_file in lock_files:
+                try:
+                    os.remove(lock_file)
+                    logger.info(f"删除锁定文件: {lock_file}")
+                except Exception as e:
+                    logger.warning(f"无法删除锁定文件 {lock_file}: {str(e)}")
+            
+            logger.info("手动锁定文件删除完成")
+            return True
+            
+        except Exception as e:
+            logger.error(f"手动删除锁定文件失败: {str(e)}")
+            return False
+    
+    def _get_auth_args(self, repo_config):
+        """获取SVN命令的认证参数元组（按凭据缓存）
+
+        每次SVN调用原本都要重走仓库/全局配置的凭据查找，再逐个append
+        六个认证参数；凭据在运行期不会变化，这里按(username, password)
+        缓存整组参数元组，调用方一次extend即可。
+
+        Args:
+            repo_config: 仓库配置字典（可为None，回退到全局SVN配置）
+
+        Returns:
+            tuple: 认证参数元组；无可用凭据时为空元组
+        """
+        # 首先尝试从仓库配置获取凭据
+        username = None
+        password = None
+
+        if repo_config and 'username' in repo_config and 'password' in repo_config:
+            if repo_config['username'] and repo_config['password']:
+                username = repo_config['username']
+                password = repo_config['password']
+        # 如果仓库配置没有凭据，尝试从全局配置获取
+        elif 'SVN' in self.config:
+            if self.config['SVN'].get('username') and self.config['SVN'].get('password'):
+                username = self.config['SVN']['username']
+                password = self.config['SVN']['password']
+
+        key = (username, password)
+        cached = self._auth_args_cache.get(key)
+        if cached is None:
+            if username and password:
+                cached = ('--username', username, '--password', password,
+                          '--non-interactive', '--trust-server-cert',
+                          '--trust-server-cert-failures',
+                          'unknown-ca,cn-mismatch,expired,not-yet-valid,other')
+            else:
+                cached = ()
+            self._auth_args_cache[key] = cached
+        return cached
+
+    def _get_safe_command_string(self, command):
+        """获取安全的命令字符串，隐藏用户名和密码信息
+        
+        Args:
+            command: 命令列表
+            
+        Returns:
+            str: 安全的命令字符串
+        """
+        # 单次遍历：遇到敏感选项时把紧随其后的参数值替换为***
+        safe_command = []
+        mask_next = False
+        for token in command:
+            if mask_next:
+                safe_command.append('***')
+                mask_next = False
+            else:
+                safe_command.append(token)
+                mask_next = token in _SENSITIVE_ARGS
+        return ' '.join(safe_command)
+    
+    def _run_svn_command(self, command, repo_config=None, working_dir=None, is_retry=False, output_raw_log=False,
+                         raise_on_error=False):
+        """运行SVN命令并返回输出
+
+        Args:
+            command: SVN命令列表
+            repo_config: 仓库配置字典
+            working_dir: 工作目录
+            is_retry: 是否为重试调用（避免参数重复）
+            output_raw_log: 是否输出原始SVN日志
+            raise_on_error: 为True时，锁清理/退避重试后仍然失败的命令
+                重新抛出原始异常（CalledProcessError携带stderr），
+                供调用方按错误码分类处理；默认False保持旧行为返回空串
+        """
+        try:
+            # 添加SVN凭据（如果可用），仅在非重试调用时添加
+            if not is_retry:
+                auth_args = self._get_auth_args(repo_config)
+                # 检查是否已经包含凭据参数，避免重复添加
+                if auth_args and '--username' not in command:
+                    command.extend(auth_args)
+
+            # 在Windows中文环境下，SVN输出可能是GBK编码，使用通用方法处理
+            # 确保传递环境变量，特别是OPENSSL_CONF
+            env = os.environ.copy()
+            # 固定消息语言为英文，保证下方按'locked'/'cleanup'关键字检测
+            # 锁定错误的逻辑不受系统locale影响；只设LC_MESSAGES而不是LC_ALL，
+            # 避免影响中文路径的编码处理
+            env['LC_MESSAGES'] = 'C'
+            # 由subprocess直接按系统首选编码解码（见__init__的_svn_encoding），
+            # 不再先物化完整的bytes再手动二次解码——大体量的svn log --xml
+            # 输出不用在内存里同时保留bytes和str两份
+            result = subprocess.run(
+                command,
+                capture_output=True,
+                cwd=working_dir,
+                env=env,
+                check=True,
+                encoding=self._svn_encoding,
+                errors='replace'
+            )
+
+            # 命令成功，瞬时错误的退避时长归位（见下方CalledProcessError分支）
+            self._svn_backoff = 0.1
+
+            if result.stdout:
+                decoded_output = result.stdout.strip()
+
+                # 输出原始SVN日志（使用安全的命令字符串）
+                if output_raw_log:
+                    safe_command = self._get_safe_command_string(command)
+                    logger.info(f"[SVN原始日志] 命令: {safe_command}")
+                    logger.info(f"[SVN原始日志] 输出: {decoded_output}")
+                    
+                return decoded_output
+            return ''
+        except subprocess.CalledProcessError as e:
+            # encoding参数已让subprocess完成解码，stderr直接是str
+            error_message = e.stderr or ''
+
+            # 输出原始SVN错误日志（使用安全的命令字符串）
+            safe_command = self._get_safe_command_string(command)
+            logger.info(f"[SVN原始错误日志] 命令: {safe_command}")
+            logger.info(f"[SVN原始错误日志] 错误: {error_message}")
+            
+            # 检测SVN锁定错误并尝试自动清理
+            if _LOCK_ERR_RE.search(error_message):
+                logger.warning(f"检测到SVN锁定错误，尝试自动清理: {error_message}")
+
+                # 出现了新的锁定错误，失效"刚清理过"的缓存，确保真正执行清理
+                if working_dir:
+                    with self._cache_lock:
+                        self._cleanup_cache.pop(os.path.abspath(working_dir), None)
+
+                # 尝试执行svn cleanup命令
+                cleanup_success = self._try_svn_cleanup(working_dir, repo_config)
+                if cleanup_success:
+                    logger.info("SVN清理成功，重试原始命令")
+                    # 重试原始命令，传递is_retry=True避免参数重复
+                    try:
+                        return self._run_svn_command(command, repo_config, working_dir, is_retry=True,
+                                                     raise_on_error=raise_on_error)
+                    except Exception:
+                        # 如果重试仍然失败，返回空字符串
+                        logger.error("重试SVN命令仍然失败")
+                        if raise_on_error:
+                            raise
+                        return ''
+                else:
+                    logger.error("SVN清理失败，无法解除锁定")
+                    # 即使清理失败，也尝试重试一次原始命令（可能锁定已被手动删除）
+                    try:
+                        logger.info("尝试重试原始命令（可能锁定已被手动删除）")
+                        return self._run_svn_command(command, repo_config, working_dir, is_retry=True,
+                                                     raise_on_error=raise_on_error)
+                    except Exception:
+                        logger.error("重试SVN命令仍然失败")
+                        if raise_on_error:
+                            raise
+                        return ''
+            
+            # 瞬时网络类错误（连接失败/超时）：指数退避后重试一次，
+            # 避免在服务器或网络抖动时立即重敲；健康路径上没有任何sleep
+            if not is_retry and _TRANSIENT_ERR_RE.search(error_message):
+                delay = min(self._svn_backoff, self._max_backoff)
+                self._svn_backoff = min(self._svn_backoff * 2, self._max_backoff)
+                logger.warning(f"检测到瞬时网络错误，{delay:.1f}秒后重试: {error_message}")
+                time.sleep(delay)
+                try:
+                    return self._run_svn_command(command, repo_config, working_dir, is_retry=True,
+                                                 raise_on_error=raise_on_error)
+                except Exception:
+                    logger.error("退避重试SVN命令仍然失败")
+                    if raise_on_error:
+                        raise
+                    return ''
+
+            logger.error(f"SVN命令失败: {command}\n错误: {error_message}")
+            if raise_on_error:
+                raise
+            return ''
+        except Exception as e:
+            logger.error(f"运行SVN命令时出错: {str(e)}")
+            if raise_on_error:
+                raise
+            return ''
+    
+    def _ensure_working_copy(self, repo_config):
+        """确保本地工作副本存在且是最新的
+
+        远程检测模式下直接返回：该模式从不读取工作副本，
+        省掉轮询周期里最重的整树checkout/update操作。
+        """
+        if self.use_remote_check:
+            return
+
+        working_copy = repo_config['local_working_copy']
+        repo_path = repo_config['repository_path']
+
+        # 刚更新过的工作副本在TTL内不再重复更新：轮询循环和钩子可能
+        # 在极短时间内对同一仓库连续触发，每次都是一趟整树svn update。
+        # 工作副本已不存在时不走该捷径（需要重新checkout）
+        wc_key = os.path.abspath(working_copy)
+        now = time.monotonic()
+        with self._cache_lock:
+            recently_updated = now - self._wc_update_cache.get(wc_key, 0) < self._min_poll_interval
+        if recently_updated and os.path.exists(working_copy):
+            logger.debug("跳过工作副本更新：%s 刚更新过（TTL内重复调用）", working_copy)
+            return
+
+        try:
+            # 确保父目录存在
+            parent_dir = os.path.dirname(working_copy)
+            if parent_dir and not os.path.exists(parent_dir):
+                os.makedirs(parent_dir, exist_ok=True)
+
+            # 目录存在但不是有效工作副本（缺.svn）时删除重建；
+            # 有效工作副本跳过全树状态检查，锁定问题留给更新失败路径处理
+            if os.path.exists(working_copy) and not os.path.exists(os.path.join(working_copy, '.svn')):
+                logger.warning(f"目录存在但不是工作副本，删除: {working_copy}")
+                import shutil
+                shutil.rmtree(working_copy)
+
+            if not os.path.exists(working_copy):
+                logger.info(f"创建工作副本: {working_copy}")
+                # 对于checkout，需要在父目录中运行命令
+                self._run_svn_command(['svn', 'checkout', repo_path, os.path.basename(working_copy)],
+                                     repo_config, working_dir=parent_dir or os.getcwd(),
+                                     raise_on_error=True)
+            else:
+                logger.info(f"更新工作副本: {working_copy}")
+                # 优化更新策略：直接尝试快速更新，失败时再走清理/修复路径。
+                # 健康的工作副本不需要预防性cleanup——那是每个轮询周期
+                # 一次多余的子进程加整个wc.db扫描；真正遇到锁定时
+                # _run_svn_command的错误路径会自动清理并重试
+                try:
+                    # 尝试快速更新；raise_on_error让失败以异常形式上抛，
+                    # 否则_run_svn_command吞掉错误返回空串，下面的分类逻辑永远走不到
+                    logger.info(f"执行SVN更新: {working_copy}")
+                    self._run_svn_command(['svn', 'update', '--accept', 'theirs-full', working_copy],
+                                          repo_config, output_raw_log=True, raise_on_error=True)
+                except Exception as update_error:
+                    # str(CalledProcessError)不包含stderr，而svn的E错误码在stderr里，
+                    # 分类必须直接读它
+                    if isinstance(update_error, subprocess.CalledProcessError) and update_error.stderr:
+                        error_text = update_error.stderr
+                    else:
+                        error_text = str(update_error)
+                    logger.warning(f"快速更新失败，尝试修复工作副本: {error_text}")
+
+                    # 按错误码分类：只有锁定/中断类错误（以及缺失文件）
+                    # 才值得走清理/revert修复流程，其他明确的错误码
+                    # （如认证失败、URL不存在）修复也无济于事，直接抛出
+                    error_codes = set(_SVN_ERR_RE.findall(error_text))
+                    if error_codes and not (error_codes & _RECOVERABLE_SVN_ERRS) \
+                            and 'missing' not in error_text.lower():
+                        logger.error(f"更新失败且错误不可修复（{', '.join(sorted(error_codes))}），跳过修复流程")
+                        raise
+
+                    # 检查是否有缺失文件问题（全树status扫描只在更新确实失败后才做）
+                    try:
+                        status_result = self._run_svn_command(['svn', 'status'], repo_config, working_dir=working_copy)
+                        if '!' in status_result:
+                            logger.info("检测到缺失文件，执行修复操作")
+                            # 先执行清理
+                            self._try_svn_cleanup(working_copy, repo_config)
+                            # 然后执行revert恢复缺失文件
+                            self._run_svn_command(['svn', 'revert', '-R', working_copy], repo_config)
+                            # 最后重新更新
+                            self._run_svn_command(['svn', 'update', '--accept', 'theirs-full', working_copy],
+                                                  repo_config, raise_on_error=True)
+                        else:
+                            # 其他错误，尝试清理后重试
+                            self._try_svn_cleanup(working_copy, repo_config)
+                            self._run_svn_command(['svn', 'update', '--accept', 'theirs-full', working_copy],
+                                                  repo_config, raise_on_error=True)
+                    except Exception as repair_error:
+                        logger.error(f"修复工作副本失败: {str(repair_error)}")
+                        raise update_error
+            # checkout/update成功，记录时刻供上面的TTL门使用
+            with self._cache_lock:
+                self._wc_update_cache[wc_key] = now
+        except Exception as e:
+            logger.error(f"确保工作副本失败: {str(e)}")
+            raise
+    
+    def get_latest_revision(self, repo_config):
+        """Get the latest revision number of the repository
+
+        结果带短TTL缓存（SYSTEM.min_poll_interval，默认5秒）：轮询循环
+        和钩子可能在极短时间内对同一仓库重复查询，每次查询都是一个
+        svn info子进程加网络往返（本地模式还要先svn update），缓存把
+        近乎同时的N次查询折叠成一次。
+        """
+        cache_key = repo_config.get('repository_path', repo_config.get('url', ''))
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._rev_cache.get(cache_key)
+        if cached is not None and now - cached[0] < self._min_poll_interval:
+            logger.debug("使用缓存的最新版本号 r%s（TTL内重复查询）", cached[1])
+            return cached[1]
+
+        try:
+            # 根据检测模式选择不同的获取方式
+            if self.use_remote_check:
+                # 远程检测模式：直接通过SVN URL获取信息
+                repo_url = repo_config.get('repository_path', repo_config.get('url', ''))
+                if not repo_url:
+                    logger.error(f"No repository URL found in configuration")
+                    raise ValueError(f"No repository URL found in configuration")
+                
+                # 使用_run_svn_command方法获取远程仓库的最新版本号（支持认证和证书信任）
+                cmd = ['svn', 'info', repo_url, '--show-item', 'revision']
+                logger.info(f"Getting latest revision remotely for {repo_config.get('name', 'Unnamed Repository')}")
+                output = self._run_svn_command(cmd, repo_config)
+                
+                if not output:
+                    logger.warning(f"Empty output when getting latest revision")
+                    return 0
+
+                revision = int(output)
+            else:
+                # 本地检测模式：更新本地工作副本后获取
+                self._ensure_working_copy(repo_config)
+                output = self._run_svn_command(
+                    ['svn', 'info', '--show-item', 'revision'],
+                    repo_config,
+                    working_dir=repo_config['local_working_copy']
+                )
+                revision = int(output)
+
+            with self._cache_lock:
+                self._rev_cache[cache_key] = (now, revision)
+            return revision
+        except Exception as e:
+            logger.error(f"Failed to get latest revision: {str(e)}")
+            raise
+    
+    # get_file_diff method removed as AI analysis feature is no longer required
+    
+    # analyze_file_change method removed as AI analysis feature is no longer required
+    
+    def _get_paginated_svn_log(self, repo_config, from_revision, to_revision, repo_name):
+        """Get SVN log using pagination for large revision ranges
+        
+        Args:
+            repo_config: Repository configuration
+            from_revision: Starting revision
+            to_revision: Ending revision
+            repo_name: Repository name
+
+        Returns:
+            list: 解析好的变更记录字典列表（见_parse_svn_log）
+        """
+        try:
+            # 空区间不拉起任何子进程
+            if from_revision > to_revision:
+                return []
+
+            repo_url = repo_config.get('repository_path', repo_config.get('url', ''))
+            if not repo_url:
+                logger.error(f"No repository URL found in configuration for {repo_name}")
+                return []
+            # Use page size of 500 to avoid overwhelming the SVN server
+            page_size = 500
+
+            # 先计算所有互不相交的分页区间
+            pages = []
+            current_start = from_revision
+            while current_start <= to_revision:
+                current_end = min(current_start + page_size - 1, to_revision)
+                pages.append((current_start, current_end))
+                current_start = current_end + 1
+
+            # 命令前缀在循环外构造一次，每页只追加各自的版本区间参数
+            # （_run_svn_command会向命令列表追加认证参数，这里的+保证
+            # 每页拿到的是独立的新列表）
+            base_cmd = ['svn', 'log', repo_url, '--xml', '--verbose', '-r']
+
+            def _fetch_page(page):
+                """抓取单个分页区间的日志XML（供并发调用）"""
+                page_start, page_end = page
+                cmd = base_cmd + [str(page_start) + ':' + str(page_end)]
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Fetching SVN log for revisions {page_start} to {page_end}")
+
+                try:
+                    # 使用_run_svn_command方法执行SVN命令，确保环境变量正确传递
+                    log_output = self._run_svn_command(cmd, repo_config)
+                    if log_output:
+                        return [log_output]
+
+                    # 不再对空输出逐版本重试：那最坏会为一页拉起500个
+                    # svn子进程；区间内确实没有日志时空输出是正常结果，
+                    # 输出被截断时由_parse_svn_log的恢复解析兜底
+                    logger.warning(f"Empty log output for revisions {page_start} to {page_end}")
+                    return []
+                except Exception as e:
+                    logger.error(f"Error executing SVN log command: {str(e)}")
+                    return []
+
+            # 并发抓取各分页：分页区间互不相交，svn子进程是I/O密集型，
+            # 有界线程池把每页的进程启动+认证握手开销摊到并行的墙钟时间里；
+            # 原先每页之间的0.5秒sleep由并发上限（最多4个在途请求）替代
+            if len(pages) <= 1:
+                combined_logs = _fetch_page(pages[0]) if pages else []
+            else:
+                with ThreadPoolExecutor(max_workers=min(4, len(pages)),
+                                        thread_name_prefix='svn-log-page') as page_pool:
+                    # map保持分页顺序，合并结果仍按版本号升序
+                    combined_logs = [log for page_logs in page_pool.map(_fetch_page, pages)
+                                     for log in page_logs]
+
+            # 逐页流式解析为变更记录（见_parse_svn_log），不再把所有页
+            # 拼接成一个巨型XML字符串、也不再经历fromstring+tostring的
+            # 序列化往返——每个logentry只解析一次
+            changes = []
+            for log_xml in combined_logs:
+                changes.extend(self._parse_svn_log(log_xml, repo_name))
+            return changes
+
+        except Exception as e:
+            logger.error(f"Error in paginated SVN log retrieval: {str(e)}")
+            return []
+
+    def get_changes(self, from_revision, to_revision, repo_config):
+        """Get changes between two revisions"""
+        logger.debug(f"Getting changes from revision {from_revision} to {to_revision}")
+        
+        try:
+            # Check if repo_config is valid
+            if not repo_config:
+                logger.error("Invalid repository configuration")
+                return [{
+                    'revision': to_revision,
+                    'author': 'unknown',
+                    'date': get_beijing_time_str(),
+                    'message': 'Invalid repository configuration',
+                    'changed_paths': [],
+                    'repository': 'Unknown Repository'
+                }]
+            
+            # 区间为空说明没有新版本，直接返回：空闲仓库的轮询是
+            # 最常见情形，这里省掉整个svn log子进程和网络往返
+            if from_revision >= to_revision:
+                logger.debug("No new revisions between %s and %s, skipping log fetch",
+                             from_revision, to_revision)
+                return []
+
+            # Get repository name for logging
+            repo_name = repo_config.get('name', 'Unnamed Repository')
+
+            # 根据检测模式选择不同的获取方式
+            if self.use_remote_check:
+                # 远程检测模式：直接通过SVN URL获取日志
+                repo_url = repo_config.get('repository_path', repo_config.get('url', ''))
+                if not repo_url:
+                    logger.error(f"No repository URL found in configuration for {repo_name}")
+                    return [{
+                        'revision': to_revision,
+                        'author': 'unknown',
+                        'date': get_beijing_time_str(),
+                        'message': 'Missing repository URL configuration',
+                        'changed_paths': [],
+                        'repository': repo_name
+                    }]
+                
+                logger.info(f"Getting changes remotely for {repo_name}")
+                # 使用分页方式获取SVN日志（分页内部已逐页流式解析，
+                # 直接返回变更记录，无需再走下面的字符串解析路径）
+                changes = self._get_paginated_svn_log(repo_config, from_revision, to_revision, repo_name)
+                logger.info(f"Successfully parsed {len(changes)} changes from SVN log")
+            elif self._fetch_log_via_url and \
+                    repo_config.get('repository_path', repo_config.get('url', '')):
+                # 本地检测模式但日志走仓库URL：svn log带URL参数不需要
+                # 工作副本，跳过仅为日志查询而做的svn update前置步骤
+                logger.info(f"Getting changes via repository URL for {repo_name}")
+                changes = self._get_paginated_svn_log(repo_config, from_revision, to_revision, repo_name)
+                logger.info(f"Successfully parsed {len(changes)} changes from SVN log")
+            else:
+                # 本地检测模式：更新本地工作副本后获取
+                # Check if local_working_copy is set
+                if 'local_working_copy' not in repo_config:
+                    logger.error("local_working_copy not set in repository configuration")
+                    return [{
+                        'revision': to_revision,
+                        'author': 'unknown',
+                        'date': get_beijing_time_str(),
+                        'message': 'Missing local_working_copy configuration',
+                        'changed_paths': [],
+                        'repository': repo_name
+                    }]
+                
+                self._ensure_working_copy(repo_config)
+                
+                # Calculate the number of revisions to fetch
+                revision_gap = to_revision - from_revision
+                
+                # Use the new approach: svn log --verbose -l N where N is the revision gap
+                # This limits the number of log entries fetched to exactly the number needed
+                limit_option = f'-l {revision_gap}' if revision_gap > 0 else '-l 1'
+                
+                # Build the SVN log command with limit option and revision range
+                # Use -r option to specify the revision range
+                revision_range = f'-r{from_revision+1}:{to_revision}' if from_revision > 1 else f'-r1:{to_revision}'
+                
+                cmd = ['svn', 'log', revision_range, limit_option, '--xml', '--verbose']
+                
+                logger.info(f"Getting SVN log for {repo_name} using range: {revision_range} and limit: {limit_option}")
+                
+                # Execute the SVN log command
+                output = self._run_svn_command(
+                    cmd,
+                    repo_config,
+                    working_dir=repo_config['local_working_copy']
+                )
+
+                logger.debug(f"Raw SVN log result for {repo_name}: {output[:500]}..." if len(output) > 500 else f"Raw SVN log result for {repo_name}: {output}")
+
+                # Ensure output is string type
+                if not isinstance(output, str):
+                    output = str(output) if output is not None else ''
+
+                # Fix: Properly get all changes, add additional logging
+                logger.info(f"Parsing SVN log output for {repo_name}, checking for multiple revisions")
+                changes = self._parse_svn_log(output, repo_name)
+                logger.info(f"Successfully parsed {len(changes)} changes from SVN log")
+
+            # Removed AI analysis functionality, keeping only basic change records
+            for change in changes:
+                logger.debug(f"Parsed change for {repo_name} (rev {change.get('revision')}): {len(change.get('changed_paths', []))} files changed")
+                for path in change.get('changed_paths', []):
+                    logger.debug(f"  - {path.get('action')}: {path.get('path')}")
+            
+            return changes
+        except Exception as e:
+            logger.error(f"Failed to get changes: {str(e)}")
+            # Return a default change object to avoid crashing
+            return [{
+                'revision': to_revision,
+                'author': 'unknown',
+                'date': get_beijing_time().isoformat(),
+                'message': 'Unable to parse commit details',
+                'changed_paths': [],
+                'repository': repo_config.get('name', 'Unnamed Repository'),
+                'ai_analysis': 'Unable to parse commit details'
+            }]
+    
+    def _parse_svn_log(self, xml_log, repo_name):
+        """Parse SVN log XML output"""
+        changes = []
+        
+        try:
+            # Check if xml_log is empty, None, or not a string
+            if not xml_log or not isinstance(xml_log, str):
+                logger.warning("Empty or invalid SVN log output received")
+                return changes
+
+            # 只在确有前导空白时才lstrip：调用方传入的多半已是去过
+            # 空白的输出，兆级日志无谓的strip是一次整串复制；
+            # 尾部空白对XML解析无害，不再处理
+            if xml_log[0].isspace():
+                xml_log = xml_log.lstrip()
+                if not xml_log:
+                    logger.warning("Empty or invalid SVN log output received")
+                    return changes
+            logger.info(f"Parsing SVN log XML of length: {len(xml_log)} characters")
+
+            # 优先走流式解析：iterparse在'end'事件逐个产出logentry，
+            # 处理完立即clear释放，超大版本范围的日志不需要物化整棵XML树。
+            # 装有lxml时用其iterparse（libxml2实现，tag过滤在C层完成，
+            # 解析快于标准库），否则用标准库ElementTree
+            try:
+                if LET is not None:
+                    # collect_ids=False跳过xml:id索引构建（这里用不到），
+                    # remove_blank_text=True在C层丢掉元素间的空白文本节点，
+                    # 缩小交给Python遍历的树
+                    iterator = LET.iterparse(
+                        io.BytesIO(xml_log.encode('utf-8')),
+                        events=('end',), tag='logentry',
+                        collect_ids=False, remove_blank_text=True)
+                else:
+                    iterator = ET.iterparse(io.StringIO(xml_log), events=('end',))
+                for _, elem in iterator:
+                    if elem.tag != 'logentry':
+                        continue
+                    change_record = self._parse_logentry(elem, len(changes), repo_name)
+                    if change_record is not None:
+                        changes.append(change_record)
+                    elem.clear()
+                    # lxml下已处理的logentry仍挂在父节点上，
+                    # 顺手删掉前面的兄弟节点保持O(单条)内存
+                    if LET is not None:
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                logger.info(f"Total changes parsed: {len(changes)}")
+                return changes
+            except _XML_PARSE_ERRORS as e:
+                # 流式解析失败（XML有前导杂质等），回退到下面的修复路径
+                logger.debug(f"Streaming XML parse failed, falling back: {str(e)}")
+                changes = []
+
+            # lxml可用时先尝试recover模式：畸形/截断的页面也能恢复出
+            # 其中完好的logentry，整页不至于丢弃（parser对象不可跨线程
+            # 共享，这里每次解析新建一个）
+            if LET is not None:
+                try:
+                    # 同流式路径：跳过xml:id索引、丢弃空白文本节点；
+                    # resolve_entities=False不展开DTD实体（svn日志没有DTD，
+                    # 顺带防住恶意构造的实体膨胀）
+                    parser = LET.XMLParser(recover=True, huge_tree=True,
+                                           collect_ids=False,
+                                           remove_blank_text=True,
+                                           resolve_entities=False)
+                    root = LET.fromstring(xml_log.encode('utf-8'), parser)
+                    if root is not None:
+                        for i, logentry in enumerate(root.iter('logentry')):
+                            change_record = self._parse_logentry(logentry, i, repo_name)
+                            if change_record is not None:
+                                changes.append(change_record)
+                        logger.info(f"Total changes parsed (lxml recover): {len(changes)}")
+                        return changes
+                except Exception as e:
+                    logger.debug(f"lxml recover parse failed, falling back: {str(e)}")
+                    changes = []
+
+            # Try to parse XML with error handling
+            try:
+                root = ET.fromstring(xml_log)
+                logger.info("Successfully parsed XML log")
+            except ET.ParseError as e:
+                logger.error(f"XML parsing error: {str(e)}")
+                logger.debug(f"XML content: {xml_log[:100]}...")
+                
+                # Try multiple fix methods
+                # 1. Check and fix XML declaration position issues
+                if "XML or text declaration not at start of entity" in str(e):
+                    # Try to find the first < opening tag
+                    first_tag_pos = xml_log.find('<')
+                    if first_tag_pos > 0:
+                        xml_log = xml_log[first_tag_pos:]
+                        try:
+                            root = ET.fromstring(xml_log)
+                            logger.info("Successfully parsed XML after removing leading characters")
+                        except:
+                            # If fixing fails, try wrapping
+                            if not xml_log.startswith('<log'):
+                                xml_log = f'<log>{xml_log}</log>'
+                            root = ET.fromstring(xml_log)
+                    else:
+                        # 2. Try wrapping as a complete XML document
+                        if not xml_log.startswith('<log>'):
+                            xml_log = f'<log>{xml_log}</log>'
+                        root = ET.fromstring(xml_log)
+            
+            # Debug: Print the XML structure
+            logger.debug(f"XML root tag: {root.tag}, children: {len(root)}")
+            
+            # iter按tag名直接深度遍历，不经过elementpath的选择器
+            # 编译/求值，也天然覆盖logentry不是直接子节点的情况
+            logentries = []
+            if root is not None:
+                try:
+                    logentries = list(root.iter('logentry'))
+                    logger.info(f"Found {len(logentries)} logentries")
+                except Exception as e:
+                    logger.error(f"Error finding logentries: {str(e)}")
+            
+            # Fix: Ensure all log entries are processed in correct order
+            logger.info(f"Processing {len(logentries)} logentries for {repo_name}")
+            
+            for i, logentry in enumerate(logentries):
+                change_record = self._parse_logentry(logentry, i, repo_name)
+                if change_record is not None:
+                    changes.append(change_record)
+
+            # Fix: Ensure all parsed changes are returned
+            logger.info(f"Total changes parsed: {len(changes)}")
+            return changes
+        except ET.ParseError as e:
+            logger.error(f"XML parsing error: {str(e)}")
+            logger.debug(f"Offending XML: {xml_log}")
+            # Return a minimal change object
+            return [{
+                'revision': 0,
+                'author': 'unknown',
+                'date': get_beijing_time().isoformat(),
+                'message': 'XML parsing error',
+                'changed_paths': [],
+                'repository': repo_name
+            }]
+        except Exception as e:
+            logger.error(f"Failed to parse SVN log: {str(e)}")
+            # Return a minimal change object
+            return [{
+                'revision': 0,
+                'author': 'unknown',
+                'date': get_beijing_time().isoformat(),
+                'message': 'Unknown error parsing log',
+                'changed_paths': [],
+                'repository': repo_name
+            }]
+
+    def _parse_logentry(self, logentry, i, repo_name):
+        """解析单个logentry元素为变更记录字典
+
+        供_parse_svn_log的流式（iterparse）和整树（fromstring修复路径）
+        两条解析路径共用。
+
+        Args:
+            logentry: logentry的Element对象
+            i: 该条目的序号（仅用于错误日志）
+            repo_name: 仓库名称
+
+        Returns:
+            dict或None: 变更记录，解析失败时返回None
+        """
+        try:
+            # 直接取attrib字典：比走Element.get的描述符+默认值绑定少一层，
+            # lxml下attrib['revision']也快于.get
+            try:
+                revision = int(logentry.attrib['revision'])
+            except (KeyError, ValueError):
+                revision = 0
+            # 一次直接子节点遍历取出全部子元素，替代四次find调用
+            # 各自走一遍elementpath的路径解析
+            author_elem = date_elem = msg_elem = paths_elem = None
+            for child in logentry:
+                tag = child.tag
+                if tag == 'author':
+                    author_elem = child
+                elif tag == 'date':
+                    date_elem = child
+                elif tag == 'msg':
+                    msg_elem = child
+                elif tag == 'paths':
+                    paths_elem = child
+            author = author_elem.text if author_elem is not None else 'unknown'
+            if date_elem is not None and date_elem.text:
+                date_text = date_elem.text
+                if _SVN_DATE_RE.match(date_text):
+                    # SVN输出的日期格式固定，切片直接得到目标格式
+                    date = date_text[0:10] + ' ' + date_text[11:19]
+                else:
+                    try:
+                        # Parse ISO format date string
+                        date_obj = datetime.datetime.fromisoformat(date_text.replace('Z', '+00:00'))
+                        # Format to yyyy-MM-dd HH:mm:ss format
+                        date = date_obj.strftime('%Y-%m-%d %H:%M:%S')
+                    except Exception as e:
+                        logger.warning(f"Failed to parse date: {date_text}, error: {str(e)}")
+                        # If parsing fails, use current time
+                        date = get_beijing_time_str()
+            else:
+                # If no date element, use current time
+                date = get_beijing_time_str()
+            message = msg_elem.text.strip() if msg_elem is not None and msg_elem.text else ''
+
+            # Get changed paths - add None check for paths_elem
+            # 每条logentry都会经过这里：日志改为惰性的%占位形式，
+            # 级别被过滤时logging直接跳过格式化；路径内层循环的debug
+            # 日志再用isEnabledFor整体闸掉，生产环境一条都不构造
+            changed_paths = []
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            if debug_enabled:
+                logger.debug("Parsing paths element for revision %s: %s",
+                             revision, paths_elem is not None)
+
+            if paths_elem is not None:
+                try:
+                    path_elements = [p for p in paths_elem if p.tag == 'path']
+                    logger.info("Found %d path elements in revision %s",
+                                len(path_elements), revision)
+
+                    for path in path_elements:
+                        # 同revision：经attrib字典查属性，省掉每条路径上
+                        # Element.get的方法查找和默认参数绑定
+                        action = path.attrib.get('action', 'M')
+                        path_name = path.text if path.text else ''
+
+                        # Skip empty paths
+                        if path_name.strip():
+                            changed_paths.append({
+                                'path': path_name,
+                                'action': action
+                            })
+                            if debug_enabled:
+                                logger.debug("Added path: %s: %s", action, path_name)
+                        elif debug_enabled:
+                            logger.debug("Skipping empty path")
+                except AttributeError as e:
+                    logger.error(f"AttributeError when finding paths: {str(e)}")
+
+            logger.info("Revision %s: %d changed paths", revision, len(changed_paths))
+
+            # Create change record
+            change_record = {
+                'revision': revision,
+                'author': author,
+                'date': date,
+                'message': message,
+                'changed_paths': changed_paths,
+                'repository': repo_name
+            }
+
+            logger.info("Successfully added change record for revision %s", revision)
+            return change_record
+        except Exception as e:
+            logger.error(f"Error parsing log entry {i}: {str(e)}")
+            return None
+
+    def log_operation(self, operation_type, message, repository=None, change_details=None):
+        """Log script operation for tracking and auditing"""
+        operation_log = {
+            'timestamp': get_beijing_time().isoformat(),
+            'operation_type': operation_type,
+            'message': message,
+            'repository': repository
+        }
+        
+        if change_details:
+            operation_log['change_details'] = change_details
+        
+        # 安全处理repository参数，避免AttributeError
+        repo_display = repository
+        if isinstance(repository, dict):
+            # 如果是字典，尝试获取name字段，否则显示字典类型
+            repo_display = repository.get('name', f"dict({type(repository).__name__})")
+        elif repository is None:
+            repo_display = 'None'
+        elif not isinstance(repository, str):
+            # 如果是其他非字符串类型，显示类型信息
+            repo_display = f"{type(repository).__name__}({repository})"
+        
+        # Log to file and console
+        if operation_type == 'ERROR':
+            logger.error(f"[OPERATION] {operation_log['timestamp']} - {operation_log['message']} - Repo: {repo_display}")
+        elif operation_type == 'WARNING':
+            logger.warning(f"[OPERATION] {operation_log['timestamp']} - {operation_log['message']} - Repo: {repo_display}")
+        else:
+            logger.info(f"[OPERATION] {operation_log['timestamp']} - {operation_log['message']} - Repo: {repo_display}")
+        
+        # Additional logging of change details if provided
+        if change_details and isinstance(change_details, list):
+            for detail in change_details:
+                logger.info(f"[CHANGE_DETAIL] {detail}")
+    
+    def _get_repo_id(self, repo_name, chinese_name):
+        """查找仓库的英文ID（REPO_*）
+
+        基于__init__预建的反向索引做两次dict查找，
+        找不到时返回原始仓库名。
+
+        Args:
+            repo_name: 原始仓库名
+            chinese_name: 对应的中文名称
+
+        Returns:
+            str: 仓库英文ID或原始仓库名
+        """
+        return self._repo_id_by_name.get(repo_name) \
+            or self._repo_id_by_chinese.get(chinese_name) \
+            or repo_name
+
+    def _format_repo(self, repo_name):
+        """返回仓库的显示名快照，首次访问时计算并缓存
+
+        中文名映射、英文ID和仓库URL在初始化后都不再变化，
+        同一仓库在后续每封邮件里的格式化结果可以直接复用。
+
+        Args:
+            repo_name: 仓库名称
+
+        Returns:
+            _RepoEmailMeta: 格式化后的显示名快照
+        """
+        meta = self._repo_display_cache.get(repo_name)
+        if meta is None:
+            chinese_name = self.repo_name_mapping.get(repo_name, repo_name)
+            repo_id = self._get_repo_id(repo_name, chinese_name)
+            formatted_name = f"{repo_id} ({chinese_name})"
+            repo_url = (self.repositories or {}).get(repo_name, {}).get('repository_path', '')
+            display = formatted_name + (f" (URL: {repo_url})" if repo_url else '')
+            meta = _RepoEmailMeta(formatted_name, display)
+            self._repo_display_cache[repo_name] = meta
+        return meta
+
+    def _queue_digest(self, changes, repo_name, revision):
+        """把一次提交的变更追加到摘要假脱机文件，等待窗口到期后合并发送
+
+        钩子模式下每次提交都是一个独立的短命进程，进程内的定时器等不到
+        窗口到期就随进程消失了；因此缓冲落在磁盘的JSONL文件里，每个进程
+        只追加自己这一条记录，再检查窗口是否到期（_flush_digest_if_due）。
+        注意窗口内的最后一批变更要等到下一次钩子触发或监控循环的周期
+        检查才会发出，而不是恰好在窗口到期的瞬间。
+
+        Args:
+            changes: 该次提交的变更记录列表
+            repo_name: 仓库名称（摘要发送成功后按此更新版本号记录）
+            revision: 该次提交的版本号
+        """
+        entry = _dumps({'repo': repo_name, 'revision': revision,
+                        'ts': time.time(), 'changes': changes})
+        lock_file = self._digest_spool + '.lock'
+        with self._pending_lock:
+            with open(lock_file, 'w') as lock_f:
+                if fcntl is not None:
+                    fcntl.flock(lock_f, fcntl.LOCK_EX)
+                try:
+                    with open(self._digest_spool, 'ab') as f:
+                        f.write(entry + b'\n')
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_f, fcntl.LOCK_UN)
+        logger.info(f"变更已加入摘要缓冲文件，{self._digest_window}秒窗口到期后合并发送")
+        self._flush_digest_if_due()
+
+    def _flush_digest_if_due(self):
+        """检查摘要缓冲文件的窗口是否到期，到期则触发合并发送
+
+        最早一条记录距今超过digest_window_sec，或缓冲的变更条数达到
+        上限时发送。由每次入队之后和监控循环的每个周期调用；这里只做
+        无锁的预读判断，真正的取走发送在_flush_digest里靠原子改名防重。
+        """
+        oldest_ts = None
+        pending_total = 0
+        try:
+            with open(self._digest_spool, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = _json.loads(line)
+                    except ValueError:
+                        # 可能正赶上另一进程写到一半的尾行，留给下次检查
+                        continue
+                    if oldest_ts is None:
+                        oldest_ts = entry.get('ts', 0)
+                    pending_total += len(entry.get('changes', []))
+        except FileNotFoundError:
+            return
+        if oldest_ts is None:
+            return
+        if pending_total >= self._digest_max_pending:
+            logger.info("摘要缓冲已达上限，提前发送")
+            self._flush_digest()
+        elif time.time() - oldest_ts >= self._digest_window:
+            self._flush_digest()
+
+    def _flush_digest(self):
+        """取走摘要缓冲文件中的全部变更，合并成一封邮件发送
+
+        先把假脱机文件原子改名为本进程私有的发送文件再读取，保证并发的
+        钩子进程和监控循环不会重复发送同一批变更；发送成功后统一推进
+        各仓库的版本号记录，失败则把记录原样写回缓冲文件，等下一次窗口
+        检查重试。缓冲为空（或刚被别的进程取走）时直接返回。
+        """
+        claim_file = f"{self._digest_spool}.sending.{os.getpid()}"
+        lock_file = self._digest_spool + '.lock'
+        with self._pending_lock:
+            try:
+                with open(lock_file, 'w') as lock_f:
+                    if fcntl is not None:
+                        fcntl.flock(lock_f, fcntl.LOCK_EX)
+                    try:
+                        os.replace(self._digest_spool, claim_file)
+                    finally:
+                        if fcntl is not None:
+                            fcntl.flock(lock_f, fcntl.LOCK_UN)
+            except FileNotFoundError:
+                return
+
+            pending = []
+            raw_lines = []
+            with open(claim_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = _json.loads(line)
+                    except ValueError:
+                        logger.warning("摘要缓冲文件中存在损坏的记录，已跳过")
+                        continue
+                    pending.append(entry)
+                    raw_lines.append(line)
+
+            if not pending:
+                os.remove(claim_file)
+                return
+
+            all_changes = []
+            for entry in pending:
+                all_changes.extend(entry.get('changes', []))
+
+            logger.info(f"发送摘要邮件：合并{len(pending)}次提交共{len(all_changes)}条变更")
+            email_success = self.send_email_notification(all_changes)
+            if email_success:
+                with self._revisions_lock:
+                    for entry in pending:
+                        repo_name = entry.get('repo')
+                        revision = entry.get('revision', 0)
+                        if revision > self.last_revisions.get(repo_name, 0):
+                            self.last_revisions[repo_name] = revision
+                self._save_last_revisions(self.last_revisions)
+            else:
+                logger.warning("摘要邮件发送失败，变更写回缓冲文件，等待下次窗口检查重试")
+                with open(lock_file, 'w') as lock_f:
+                    if fcntl is not None:
+                        fcntl.flock(lock_f, fcntl.LOCK_EX)
+                    try:
+                        with open(self._digest_spool, 'ab') as f:
+                            f.writelines(raw_lines)
+                    finally:
+                        if fcntl is not None:
+                            fcntl.flock(lock_f, fcntl.LOCK_UN)
+            os.remove(claim_file)
+        # 本批次发送完毕，释放复用的SMTP连接
+        self.close_smtp()
+
+    def _append_changes_table(self, body_parts, changes):
+        """把一组变更渲染成HTML表格片段，追加到body_parts
+
+        send_email_notification和_send_email_for_repository原先各自
+        维护一份几乎相同的表格渲染循环，任何改动都要同步改两处；
+        渲染逻辑收拢到这里，调用方只负责各自的标题和收件人差异。
+
+        Args:
+            body_parts: 正文片段列表（原地追加）
+            changes: 变更记录列表
+        """
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        body_parts.append(_TABLE_HEADER)
+        for change in changes:
+            try:
+                # Get changed paths
+                changed_paths = change.get('changed_paths', [])
+                if debug_enabled:
+                    logger.debug("Processing change for email - rev: %s, %d changed paths",
+                                 change.get('revision'), len(changed_paths))
+
+                # Create HTML for changed files and determine change type
+                if changed_paths:
+                    file_items = []
+                    # Collect all actions in this revision（按位或聚合）
+                    action_mask = 0
+                    for path in changed_paths:
+                        action = path.get('action', 'M')
+                        action_mask |= _ACTION_BIT.get(action, 0)
+                        path_name = path.get('path', 'unknown')
+                        action_desc = _ACTION_DESC.get(action, action)
+                        file_items.append(f"<li>{_esc(action_desc)}: {_esc(path_name)}</li>")
+                    files_html = ("<ul style='margin: 0; padding-left: 15px;'>"
+                                  + ''.join(file_items) + "</ul>")
+
+                    # Determine the primary change type for coloring
+                    # Priority: Deleted > Mixed > Modified > Added
+                    if action_mask & 4:
+                        change_type = 'Deleted'
+                        change_color = 'red'
+                    elif action_mask & (action_mask - 1):
+                        change_type = 'Mixed'
+                        change_color = 'orange'
+                    elif action_mask & 2:
+                        change_type = 'Modified'
+                        change_color = 'blue'
+                    elif action_mask & 1:
+                        change_type = 'Added'
+                        change_color = 'green'
+                    else:
+                        change_type = 'Other'
+                        change_color = 'black'
+                else:
+                    # Show a message when no files were changed
+                    files_html = "<span style='color: #666;'>No files listed in log</span>"
+                    change_type = 'None'
+                    change_color = 'grey'
+
+                # Add to email body
+                body_parts.append(f"""
+                    <tr>
+                    <td>{_esc(str(change.get('revision', 'N/A')))}</td>
+                    <td>{_esc(str(change.get('author', 'unknown')))}</td>
+                    <td>{_esc(str(change.get('date', 'N/A')))}</td>
+                    <td>{_esc(str(change.get('message', '') or ''))}</td>
+                    <td style='color: {change_color}; font-weight: bold;'>{change_type}</td>
+                    <td style='white-space: normal; word-break: break-all; max-width: 500px;'>{files_html}</td>
+                </tr>
+                """)
+            except Exception as e:
+                logger.error(f"Error processing change for email: {str(e)}")
+                # Skip this change but continue with others
+        body_parts.append(_TABLE_FOOTER)
+
+    def send_email_notification(self, changes):
+        """Send email notification about changes"""
+        if not changes:
+            return False
+        
+        try:
+            # Log the notification attempt
+            self.log_operation('NOTIFICATION', f"Attempting to send email notification with {len(changes)} changes")
+            
+            # Check if email configuration is complete
+            if 'EMAIL' not in self.config or not all([
+                'smtp_server' in self.config['EMAIL'],
+                'from_email' in self.config['EMAIL'],
+                'to_emails' in self.config['EMAIL']
+            ]):
+                logger.warning("Email notification skipped: incomplete email configuration")
+                self.log_operation('WARNING', "Email notification skipped: incomplete email configuration")
+                return False
+            
+            # Check if SMTP credentials are configured, skip email sending if not
+            has_credentials = False
+            if 'username' in self.config['EMAIL'] and 'password' in self.config['EMAIL']:
+                username = self.config['EMAIL'].get('username', '').strip()
+                password = self.config['EMAIL'].get('password', '').strip()
+                has_credentials = bool(username) and bool(password)
+                
+            if not has_credentials:
+                logger.info("Email notification skipped: No valid SMTP credentials configured")
+                self.log_operation('INFO', "Email notification skipped: No valid SMTP credentials configured")
+                return False
+            
+            # 单次遍历同时完成：按仓库分组、收集收件人、格式化显示名。
+            # 原来对仓库集合要走四趟循环（分组/收件人/主题名/正文），
+            # 现在首次遇到某仓库时就把它的元信息一次算好存快照
+            changes_by_repo = defaultdict(list)
+            repo_meta = {}
+            all_recipients = set()
+            try:
+                for change in changes:
+                    repo_name = change.get('repository', 'Unnamed Repository')
+                    if repo_name not in repo_meta:
+                        logger.info(f"Processing change with repository name: '{repo_name}'")
+                        repo_recipients = self._get_recipients_for_repository(repo_name)
+                        if repo_recipients:
+                            # 灵活支持逗号或分号分隔的收件人字符串（单次正则分割）
+                            all_recipients.update(
+                                r for r in _RECIP_SPLIT.split(repo_recipients.strip())
+                                if r and r.lower() != 'nan')
+                        # 显示名走跨邮件的实例级缓存（见_format_repo）
+                        repo_meta[repo_name] = self._format_repo(repo_name)
+                    changes_by_repo[repo_name].append(change)
+            except Exception as e:
+                logger.error(f"Error grouping changes by repository: {str(e)}")
+                return
+
+            # 修改：无论有多少个仓库，都将所有变更合并到一封邮件中发送
+            logger.info(f"Changes grouped by repository: {list(changes_by_repo.keys())}")
+            logger.info(f"Available recipients mapping: {list(self.recipients_mapping.keys())}")
+
+            # 如果没有配置收件人，使用默认收件人
+            if not all_recipients:
+                default_recipients = self.config['EMAIL'].get('to_emails', '')
+                if default_recipients:
+                    # 灵活支持逗号或分号分隔的收件人字符串（单次正则分割）
+                    all_recipients.update(
+                        r for r in _RECIP_SPLIT.split(default_recipients.strip())
+                        if r and r.lower() != 'nan')
+
+            # 收件人解析结果为空时提前退出，后面的主题格式化和
+            # HTML组装都是为发不出去的邮件做的无用功
+            if not all_recipients:
+                logger.warning("Email notification skipped: no recipients resolved")
+                self.log_operation('WARNING', "Email notification skipped: no recipients resolved")
+                return False
+
+            # 准备邮件内容（仓库显示名已在分组遍历中算好）
+            formatted_repo_names = [m.formatted_name for m in repo_meta.values()]
+
+            # 创建邮件主题
+            if len(formatted_repo_names) == 1:
+                subject = f"SVN仓库变更通知 - {formatted_repo_names[0]} ({len(changes)}个变更)"
+            else:
+                subject = f"SVN仓库变更通知 - {len(changes)}个变更涉及{len(changes_by_repo)}个仓库 ({', '.join(formatted_repo_names)})"
+            
+            # 正文用列表收集片段、最后一次join拼接：字符串+=每次都要
+            # 复制整个已累积的缓冲区，变更数多时是平方级开销
+            body_parts = [_HTML_PREAMBLE]
+
+            # 为每个仓库添加变更详情（表格渲染见_append_changes_table）
+            for repo_name, repo_changes in changes_by_repo.items():
+                body_parts.append(f"<h3>{_esc(repo_meta[repo_name].display)}</h3>")
+                self._append_changes_table(body_parts, repo_changes)
+
+            body_parts.append(_HTML_POSTAMBLE)
+            body = ''.join(body_parts)
+
+            # Create message
+            msg = MIMEMultipart('alternative')
+            msg['From'] = self.config['EMAIL']['from_email']
+            # 修改：正确设置多个收件人
+            recipients_str = ', '.join(all_recipients)
+            msg['To'] = recipients_str
+            msg['Subject'] = subject
+            
+            # Attach HTML body
+            # 显式指定utf-8字符集：正文含中文必然落到utf-8，
+            # 提前声明可跳过MIMEText先按ascii试编码整个正文的探测
+            msg.attach(MIMEText(body, 'html', 'utf-8'))
+            
+            # 发送邮件
+            return self._send_email(msg)
+        except Exception as e:
+            logger.error(f"Error in send_email_notification: {str(e)}")
+            self.log_operation('ERROR', f"Failed to send email notification: {str(e)}")
+            return False
+    
+    def _send_email_for_repository(self, repo_name, changes):
+        """为指定仓库发送邮件通知
+        
+        Args:
+            repo_name: 仓库名称
+            changes: 该仓库的变更列表
+            
+        Returns:
+            bool: 是否发送成功
+        """
+        try:
+            # 获取该仓库的收件人
+            recipients = self._get_recipients_for_repository(repo_name)
+            if not recipients:
+                logger.warning(f"仓库 '{repo_name}' 没有配置收件人，跳过邮件发送")
+                return False
+                
+            # 准备邮件内容（显示名走跨邮件的实例级缓存，见_format_repo）
+            meta = self._format_repo(repo_name)
+            subject = f"SVN仓库变更通知 - {meta.formatted_name} ({len(changes)}个变更)"
+
+            # 正文用列表收集片段、最后一次join拼接（避免字符串+=的
+            # 平方级复制，同send_email_notification）
+            body_parts = [_HTML_PREAMBLE]
+
+            # 添加仓库信息和变更详情（表格渲染见_append_changes_table）
+            body_parts.append(f"<h3>{_esc(meta.display)}</h3>")
+            self._append_changes_table(body_parts, changes)
+            body_parts.append(_HTML_POSTAMBLE)
+            body = ''.join(body_parts)
+
+            # Create message
+            msg = MIMEMultipart('alternative')
+            msg['From'] = self.config['EMAIL']['from_email']
+            msg['To'] = recipients
+            msg['Subject'] = subject
+            
+            # Attach HTML body
+            # 显式指定utf-8字符集：正文含中文必然落到utf-8，
+            # 提前声明可跳过MIMEText先按ascii试编码整个正文的探测
+            msg.attach(MIMEText(body, 'html', 'utf-8'))
+            
+            # 调用原有的邮件发送逻辑
+            return self._send_email(msg)
+        except Exception as e:
+            logger.error(f"Error in _send_email_for_repository: {str(e)}")
+            return False
+    
+    def _get_smtp_conn(self):
+        """返回一个可用的SMTP连接，优先复用缓存的连接
+
+        对缓存连接先做NOOP探活，服务器已超时断开等情况会让NOOP失败，
+        此时丢弃旧连接重新建立。连接复用把TCP+TLS+AUTH握手的开销
+        摊薄到一个通知批次内的多封邮件上。
+
+        调用方必须持有self._smtp_lock。
+
+        Returns:
+            已连接（并在有凭证时已登录）的SMTP会话对象
+        """
+        if self._smtp_conn is not None:
+            try:
+                if self._smtp_conn.noop()[0] == 250:
+                    return self._smtp_conn
+            except Exception:
+                pass
+            # NOOP失败说明连接已失效，丢弃后重建
+            try:
+                self._smtp_conn.close()
+            except Exception:
+                pass
+            self._smtp_conn = None
+
+        smtp_server = self.config['EMAIL']['smtp_server']
+        smtp_port = int(self.config['EMAIL'].get('smtp_port', '465'))
+        use_ssl = self.config['EMAIL'].get('use_ssl', 'True').lower() == 'true'
+
+        if use_ssl:
+            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
+        else:
+            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+            server.starttls()
+
+        username = self.config['EMAIL'].get('username', '').strip() \
+            if 'username' in self.config['EMAIL'] else ''
+        password = self.config['EMAIL'].get('password', '').strip() \
+            if 'password' in self.config['EMAIL'] else ''
+        if username and password:
+            server.login(username, password)
+        else:
+            logger.info("Skipping SMTP authentication as no valid credentials provided")
+
+        self._smtp_conn = server
+        return server
+
+    def close_smtp(self):
+        """关闭缓存的SMTP连接
+
+        通知批次发送完毕后调用，避免长期占着服务器连接；
+        下一批发送时_get_smtp_conn会重新建立。
+        """
+        with self._smtp_lock:
+            if self._smtp_conn is not None:
+                try:
+                    self._smtp_conn.quit()
+                except Exception as e:
+                    logger.warning(f"关闭SMTP连接失败: {str(e)}")
+                self._smtp_conn = None
+
+    def _send_email(self, msg):
+        """内部邮件发送方法，包含重试逻辑
+
+        复用self._smtp_conn持有的SMTP连接发送（见_get_smtp_conn），
+        发送失败时丢弃连接并重试，重试会触发重新连接。
+
+        Args:
+            msg: 邮件消息对象
+
+        Returns:
+            bool: 是否发送成功
+        """
+        try:
+            # Send email with retry logic
+            max_retries = 2
+            retry_count = 0
+            success = False
+
+            while retry_count <= max_retries and not success:
+                try:
+                    # 明确提取收件人列表，确保所有收件人都能收到邮件
+                    recipients_str = msg['To']
+                    # 将收件人字符串拆分为列表
+                    recipients_list = [r.strip() for r in recipients_str.split(',') if r.strip()]
+
+                    with self._smtp_lock:
+                        server = self._get_smtp_conn()
+                        # 使用明确的收件人列表发送邮件
+                        server.send_message(msg, to_addrs=recipients_list)
+                    success = True
+                    logger.info(f"Email notification sent to {recipients_str}")
+                    self.log_operation('SUCCESS', f"Email notification successfully sent to {recipients_str}")
+                    return True
+                except smtplib.SMTPAuthenticationError:
+                    logger.error(f"SMTP authentication failed (attempt {retry_count + 1}/{max_retries + 1})")
+                    self.close_smtp()
+                    retry_count += 1
+                    time.sleep(2)  # Wait before retry
+                except smtplib.SMTPException as e:
+                    logger.error(f"SMTP error sending email: {str(e)} (attempt {retry_count + 1}/{max_retries + 1})")
+                    self.close_smtp()
+                    retry_count += 1
+                    time.sleep(2)  # Wait before retry
+                except Exception as e:
+                    logger.error(f"Unexpected error sending email: {str(e)}")
+                    self.close_smtp()
+                    break
+
+            if not success:
+                logger.error("Failed to send email after multiple attempts")
+                # Do not throw exception, allow program to continue running
+                return False
+        except Exception as e:
+            logger.error(f"Error in _send_email: {str(e)}")
+            return False
+    
+    # Backup functionality has been removed
+
+    def send_status_email(self, check_result):
+        """发送程序运行状态邮件
+        
+        Args:
+            check_result: 检查结果字典，包含以下字段：
+                - check_time: 检查时间
+                - total_repos: 总仓库数
+                - repos_with_changes: 有变更的仓库数
+                - total_changes: 总变更数
+                - repos_checked: 已检查的仓库列表
+                - errors: 错误信息列表
+                
+        Returns:
+            bool: 是否发送成功
+        """
+        try:
+            # 检查邮件配置是否完整
+            if 'EMAIL' not in self.config or not all([
+                'smtp_server' in self.config['EMAIL'],
+                'from_email' in self.config['EMAIL']
+            ]):
+                logger.warning("状态邮件发送跳过：邮件配置不完整")
+                self.log_operation('WARNING', "状态邮件发送跳过：邮件配置不完整")
+                return False
+            
+            # 检查是否有SMTP凭证
+            has_credentials = False
+            if 'username' in self.config['EMAIL'] and 'password' in self.config['EMAIL']:
+                username = self.config['EMAIL'].get('username', '').strip()
+                password = self.config['EMAIL'].get('password', '').strip()
+                has_credentials = bool(username) and bool(password)
+            
+            if not has_credentials:
+                logger.info("状态邮件发送跳过：未配置有效的SMTP凭证")
+                self.log_operation('INFO', "状态邮件发送跳过：未配置有效的SMTP凭证")
+                return False
+            
+            # 准备邮件内容
+            check_time = check_result.get('check_time', get_beijing_time_str())
+            total_repos = check_result.get('total_repos', 0)
+            repos_with_changes = check_result.get('repos_with_changes', 0)
+            total_changes = check_result.get('total_changes', 0)
+            repos_checked = check_result.get('repos_checked', [])
+            errors = check_result.get('errors', [])
+            
+            # 创建邮件主题
+            subject = f"SVN监控程序运行状态报告 - {check_time}"
+            
+            # 正文用列表收集片段、最后一次join拼接（避免字符串+=的
+            # 平方级复制，同send_email_notification）；静态片段是
+            # 模块级常量，这里只格式化概况数字等动态内容
+            body_parts = [
+                '<html><body><h2>SVN监控程序运行状态报告</h2>',
+                f"<p><strong>检测时间：</strong>{_esc(str(check_time))}</p>",
+                '<h3>检测概况</h3>'
+                '<table border="1" cellpadding="5" cellspacing="0">'
+                f"<tr><td><strong>监控仓库总数</strong></td><td>{total_repos}</td></tr>"
+                f"<tr><td><strong>本次检测仓库数</strong></td><td>{len(repos_checked)}</td></tr>"
+                f"<tr><td><strong>有变更的仓库数</strong></td><td>{repos_with_changes}</td></tr>"
+                f"<tr><td><strong>检测到的变更总数</strong></td><td>{total_changes}</td></tr>"
+                '</table>',
+                _STATUS_REPO_TABLE_HEADER,
+            ]
+
+            # 添加仓库详情（映射在循环外绑定一次）
+            repo_name_mapping = self.repo_name_mapping
+            for repo_name in repos_checked:
+                chinese_repo_name = repo_name_mapping.get(repo_name, repo_name)
+
+                # 查找英文ID（REPO_*，预建索引直接命中，
+                # 替代每行对整个映射的线性扫描）
+                repo_id = self._get_repo_id(repo_name, chinese_repo_name)
+
+                # 检查该仓库是否有变更
+                has_change = False
+                if repos_with_changes > 0 and total_changes > 0:
+                    # 这里简化处理，实际可以根据check_result中的详细信息判断
+                    has_change = False
+                
+                status = "正常" if not has_change else "有变更"
+                status_color = "green" if not has_change else "orange"
+                
+                body_parts.append(
+                    f"<tr><td>{_esc(repo_id)}</td>"
+                    f"<td>{_esc(chinese_repo_name)}</td>"
+                    f"<td style='color: {status_color}; font-weight: bold;'>{status}</td></tr>")
+
+            body_parts.append('</table>')
+
+            # 添加错误信息（如果有）
+            if errors:
+                body_parts.append(_STATUS_ERRORS_HEADER)
+                for error in errors:
+                    repo_name = error.get('repo', '未知')
+                    error_msg = error.get('message', '未知错误')
+                    body_parts.append(
+                        f"<tr><td>{_esc(str(repo_name))}</td>"
+                        f"<td style='color: red;'>{_esc(str(error_msg))}</td></tr>")
+                body_parts.append('</table>')
+
+            body_parts.append(_STATUS_POSTAMBLE)
+            body = ''.join(body_parts)
+
+            # 创建邮件消息
+            msg = MIMEMultipart('alternative')
+            msg['From'] = self.config['EMAIL']['from_email']
+            # 状态邮件发送给pyc@lektec.com
+            msg['To'] = 'pyc@lektec.com'
+            msg['Subject'] = subject
+
+            # 附加HTML正文
+            # 显式指定utf-8字符集：正文含中文必然落到utf-8，
+            # 提前声明可跳过MIMEText先按ascii试编码整个正文的探测
+            msg.attach(MIMEText(body, 'html', 'utf-8'))
+
+            # 发送邮件
+            success = self._send_email(msg)
+            if success:
+                logger.info("程序运行状态邮件发送成功")
+                self.log_operation('SUCCESS', "程序运行状态邮件发送成功")
+            else:
+                logger.warning("程序运行状态邮件发送失败")
+                self.log_operation('WARNING', "程序运行状态邮件发送失败")
+
+            return success
+        except Exception as e:
+            logger.error(f"发送程序运行状态邮件时出错：{str(e)}")
+            self.log_operation('ERROR', f"发送程序运行状态邮件时出错：{str(e)}")
+            return False
+
+    def setup_auto_startup(self):
+        """Set up the script to run automatically on startup (Windows)"""
+        try:
+            if sys.platform == 'win32':
+                import winreg
+
+                # Get the path to the current script
+                script_path = os.path.abspath(__file__)
+                python_exe = sys.executable
+
+                # Create a batch file to run the script
+                batch_path = os.path.join(os.path.dirname(script_path),
+                                          'run_svn_monitor.bat')
+                with open(batch_path, 'w') as f:
+                    f.write('@echo off\n')
+                    f.write(f'"{python_exe}" "{script_path}"\n')
+                    f.write('exit\n')
+
+                # Add to startup registry
+                key = winreg.OpenKey(
+                    winreg.HKEY_CURRENT_USER,
+                    r'SOFTWARE\Microsoft\Windows\CurrentVersion\Run',
+                    0,
+                    winreg.KEY_SET_VALUE
+                )
+                winreg.SetValueEx(key, 'SVN_Monitor', 0, winreg.REG_SZ,
+                                 batch_path)
+                winreg.CloseKey(key)
+                
+                logger.info(f"Auto startup configured. Script will run on system boot.")
+            else:
+                logger.warning("Auto startup setup is only supported on Windows.")
+        except Exception as e:
+            logger.error(f"Failed to set up auto startup: {str(e)}")
+            raise
+
+    # 备份功能已移除
+
+    def _validate_config(self):
+        """Validate the configuration settings"""
+        # Global required sections
+        required_sections = ['EMAIL', 'LOGGING', 'SYSTEM']
+
+        # Ensure all required global sections exist
+        for section in required_sections:
+            if section not in self.config:
+                logger.warning(
+                    f"Configuration section '{section}' missing. Creating default settings."
+                )
+                self.config[section] = {}
+
+        # Ensure SYSTEM section has required keys
+        if 'auto_startup' not in self.config['SYSTEM']:
+            self.config['SYSTEM']['auto_startup'] = 'True'
+        if 'use_remote_check' not in self.config['SYSTEM']:
+            self.config['SYSTEM']['use_remote_check'] = 'True'
+
+        # Check for at least one repository configuration
+        repositories = self._get_repositories()
+        if not repositories:
+            logger.warning(
+                "No repository configurations found. Creating a default repository configuration."
+            )
+            self._create_default_repository_config()
+        else:
+            # Validate each repository configuration has required fields
+            for repo_name, repo_config in repositories.items():
+                # Ensure local_working_copy exists for all repositories
+                if 'local_working_copy' not in repo_config:
+                    logger.warning(
+                        f"Repository '{repo_name}' missing 'local_working_copy'. Adding default path."
+                    )
+                    # Create a default working copy path
+                    default_path = os.path.join(
+                        os.path.dirname(os.path.abspath(__file__)), 'svn_wc',
+                        repo_name
+                    )
+                    repo_config['local_working_copy'] = default_path
+
+        # No need to save configuration to file as we're using Excel for configuration management
+
+    def _check_repo_sync(self, repo_name, repo_config):
+        """检查单个仓库的变更（供并发轮询调用，不修改共享状态）
+
+        Args:
+            repo_name: 仓库名称
+            repo_config: 仓库配置
+
+        Returns:
+            dict: 包含repo/latest_revision/last_revision/changes/error的结果字典
+        """
+        result = {
+            'repo': repo_name,
+            'latest_revision': None,
+            'last_revision': self.last_revisions.get(repo_name, 0),
+            'changes': [],
+            'error': None
+        }
+        try:
+            latest_revision = self.get_latest_revision(repo_config)
+            result['latest_revision'] = latest_revision
+            last_revision = result['last_revision']
+
+            if latest_revision > last_revision:
+                logger.info(f"New changes detected in repository '{repo_name}': {last_revision} -> {latest_revision}")
+                # Log the detected changes
+                self.log_operation('CHANGE_DETECTED',
+                                  f"New changes detected: {last_revision} -> {latest_revision}",
+                                  repository=repo_name)
+                result['changes'] = self.get_changes(last_revision, latest_revision, repo_config)
+        except Exception as e:
+            error_msg = f"Error checking repository '{repo_name}': {str(e)}"
+            logger.error(error_msg)
+            self.log_operation('ERROR', error_msg, repository=repo_name)
+            result['error'] = error_msg
+        return result
+
+    def _poll_repositories(self):
+        """并发轮询所有仓库并返回结果列表（供监控循环调用）
+
+        每个仓库的检查（svn子进程RPC）是I/O密集型操作，串行轮询的总耗时
+        是各仓库延迟之和；这里把检查提交到常驻线程池self.pool并发执行，
+        线程数由self.max_concurrent限制。
+
+        Returns:
+            list: 各仓库的检查结果（顺序与self.repositories一致）
+        """
+        futures = [self.pool.submit(self._check_repo_sync, repo_name, repo_config)
+                   for repo_name, repo_config in self.repositories.items()]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except CancelledError:
+                # 收到终止信号后线程池被关闭，未执行的检查被取消
+                break
+        return results
+
+    def _wait_for_next_check(self, wait_time):
+        """等待下一次检查周期，终止信号到达时立即被唤醒
+
+        在signal.set_wakeup_fd注册的管道上select等待：SIGTERM/SIGINT
+        到达时内核向管道写入信号编号，select立即返回，不必像原来的
+        time.sleep(1)小步轮询那样最多滞后1秒才观察到self.running变化。
+
+        Args:
+            wait_time: 最长等待秒数
+        """
+        deadline = time.monotonic() + wait_time
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if self._selector.select(timeout=remaining):
+                # 被信号唤醒：排空管道里积累的字节；
+                # self.running已由信号处理器更新，下轮循环条件生效
+                try:
+                    while os.read(self._wakeup_r, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+
+    def _run_one_cycle(self):
+        """执行一轮完整的仓库检查周期
+
+        重读版本号记录、并发轮询所有仓库、汇总变更并发送通知邮件、
+        通知成功后推进版本号、最后发送运行状态邮件。启动时的立即
+        检查和监控循环的定时检查原先是两份约80行的复制代码，任何
+        优化都要同步改两处，现在共用这一份实现。
+        """
+        all_changes = []
+        changes_to_update = {}
+        errors = []  # 收集所有仓库检查错误
+
+        # Fix: Dynamically reread last_revisions.json file to ensure using the latest version records
+        # （内存中还有未落盘的更新时跳过重读，避免被磁盘上的旧数据覆盖）
+        if not self._revisions_dirty:
+            self.last_revisions = self._get_last_recorded_revisions()
+
+        # Check each repository for changes（并发轮询，结果按顺序汇总）
+        for result in self._poll_repositories():
+            repo_name = result['repo']
+
+            if result['error'] is not None:
+                # 收集错误信息（单个仓库失败不影响其他仓库）
+                errors.append({
+                    'repo': repo_name,
+                    'message': result['error']
+                })
+                continue
+
+            latest_revision = result['latest_revision']
+            last_revision = result['last_revision']
+            if latest_revision > last_revision:
+                # Only add changes if notifications are enabled for this repository
+                if self.repos[repo_name].notify_on_changes:
+                    all_changes.extend(result['changes'])
+                    # Store changes and revision info for this repository
+                    changes_to_update[repo_name] = {
+                        'last_revision': last_revision,
+                        'latest_revision': latest_revision
+                    }
+                else:
+                    # If notifications are disabled, update revision immediately
+                    self.last_revisions[repo_name] = latest_revision
+                    # Save immediately for repos with notifications disabled
+                    self._save_last_revisions(self.last_revisions)
+
+        # No unconditional save here to ensure revisions are only saved after successful email or for disabled notifications
+
+        # 记录检查完成的日志
+        logger.info("所有仓库检查完成，准备处理变更通知")
+
+        # Send notifications for all changes
+        if all_changes:
+            email_success = self.send_email_notification(all_changes)
+            # Only update and save revision numbers if email was sent successfully
+            if email_success:
+                logger.info("Email notification successful, updating repository revision numbers")
+                # Create a temporary copy to avoid modifying self.last_revisions directly
+                temp_revisions = self.last_revisions.copy()
+                for repo_name, info in changes_to_update.items():
+                    temp_revisions[repo_name] = info['latest_revision']
+                # Only update and save if all updates were successful
+                self.last_revisions = temp_revisions
+                self._save_last_revisions(self.last_revisions)
+            else:
+                logger.warning("Email notification failed, keeping original revision numbers")
+                # Explicitly reload last revisions to ensure no changes were made
+                # （内存中还有未落盘的更新时跳过重读，避免被磁盘上的旧数据覆盖）
+                if not self._revisions_dirty:
+                    self.last_revisions = self._get_last_recorded_revisions()
+
+        # 每轮检测完成后发送程序运行状态邮件，无论是否有变更
+        try:
+            # 准备状态邮件的检测结果数据
+            check_result = {
+                'check_time': get_beijing_time_str(),
+                'total_repos': len(self.repositories),
+                'repos_with_changes': len(changes_to_update),
+                'total_changes': len(all_changes),
+                'repos_checked': list(self.repositories.keys()),
+                'errors': errors  # 包含所有收集到的错误信息
+            }
+
+            # 发送状态邮件
+            self.send_status_email(check_result)
+        except Exception as e:
+            logger.error(f"发送程序运行状态邮件时出错：{str(e)}")
+            # 状态邮件发送失败不影响主程序运行
+
+        # 钩子进程留在摘要缓冲文件里、窗口已到期的变更由监控循环兜底发出
+        self._flush_digest_if_due()
+
+        # 本轮的通知邮件和状态邮件共用同一条SMTP连接，批次结束后释放
+        self.close_smtp()
+
+    def run(self):
+        """Main run method for the SVN monitor"""
+        try:
+            # Default to monitor mode
+            mode = "远程检测模式" if self.use_remote_check else "本地检测模式"
+            logger.info(f"Starting SVN Monitor ({mode})")
+            
+            # 在远程检测模式下跳过本地工作副本初始化
+            if not self.use_remote_check:
+                # Ensure working copies are properly initialized
+                for repo_name, repo_config in self.repositories.items():
+                    self._ensure_working_copy(repo_config)
+            else:
+                logger.info("Running in remote check mode, skipping local working copy initialization")
+            
+            # Setup auto startup if enabled
+            if self.config['SYSTEM'].get('auto_startup', 'True').lower() == 'true':
+                try:
+                    self.setup_auto_startup()
+                except Exception as e:
+                    logger.warning(f"Failed to setup auto startup: {str(e)}")
+            
+            # Main monitoring loop
+            # 使用基于时间的调度，确保检查间隔准确
+            min_check_interval = min(
+                cfg.check_interval for cfg in self.repos.values()
+            )
+            
+            # 记录上一次检查的时间
+            last_check_time = time.time()
+            
+            # 启动时立即检测一次版本变化（不等待第一个检查间隔）
+            logger.info("服务启动，立即检查所有仓库变更...")
+            try:
+                self._run_one_cycle()
+            except Exception as e:
+                error_msg = f"Error in initial repository check: {str(e)}"
+                logger.error(error_msg)
+                self.log_operation('ERROR', error_msg)
+            
+            while self.running:
+                try:
+                    # 计算应该等待的时间
+                    current_time = time.time()
+                    elapsed = current_time - last_check_time
+                    
+                    # 如果距离上次检查的时间小于最小间隔，等待剩余时间
+                    if elapsed < min_check_interval:
+                        wait_time = min_check_interval - elapsed
+                        logger.info(f"等待 {wait_time:.2f} 秒后进行下一次仓库检查，当前时间: {get_beijing_time_str()}")
+                        # 在信号唤醒管道上等待，终止信号到达时立即返回
+                        self._wait_for_next_check(wait_time)
+
+                        # 如果在等待期间收到终止信号，直接退出循环
+                        if not self.running:
+                            break
+                    
+                    # 更新最后检查时间
+                    last_check_time = time.time()
+                    logger.info(f"开始检查所有仓库变更，当前时间: {get_beijing_time_str()}")
+
+                    # 执行一轮完整检查（与启动检查共用同一份实现）
+                    self._run_one_cycle()
+
+                    # 本轮检查结束，按去抖间隔将版本号记录落盘
+                    self._flush_revisions_if_due()
+
+                except KeyboardInterrupt:
+                    logger.info("SVN Monitor stopped by user")
+                    self.log_operation('INFO', "SVN Monitor stopped by user")
+                    break
+                except Exception as e:
+                    error_msg = f"Error in monitoring loop: {str(e)}"
+                    logger.error(error_msg)
+                    self.log_operation('ERROR', error_msg)
+                    # 发生异常时，仍然保持原有的检查间隔，但给系统一点恢复时间
+                    # 使用配置的最小检查间隔，确保时间设置的一致性和动态性
+                    logger.info(f"监控循环发生异常，将在 {min_check_interval} 秒后重试")
+                    # 与正常调度共用可被终止信号立即唤醒的等待，
+                    # 避免恢复期的time.sleep拖慢优雅退出
+                    self._wait_for_next_check(min_check_interval)
+
+            # 监控循环退出（终止信号或KeyboardInterrupt）：
+            # 清理工作集中在这里而不是信号处理器里做，避免与被打断的
+            # 发送/冲刷路径在锁上死锁（见_handle_sigterm）
+            if self._term_signum is not None:
+                logger.info(f"收到终止信号 {self._term_signum}，准备优雅退出")
+                self.log_operation('INFO', f"SVN Monitor收到终止信号 {self._term_signum}，准备优雅退出")
+            # 关闭常驻线程池：不等待在途任务，取消尚未开始的检查
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            # 把摘要缓冲中尚未发送的变更通知发出去
+            self._flush_digest()
+            # 强制落盘未保存的版本号并释放复用的SMTP连接
+            self._flush_revisions_if_due(force=True)
+            self.close_smtp()
+            # 把内存中缓冲的日志批量写入文件，避免退出时丢失尾部日志
+            if _memory_handler is not None:
+                _memory_handler.flush()
+        except Exception as e:
+            logger.error(f"Fatal error in run method: {str(e)}")
+            raise
+
+
+def main():
+    """Main entry point - can be run in monitor mode or hook mode"""
+    try:
+        import argparse
+        
+        # Parse command line arguments
+        parser = argparse.ArgumentParser(description='SVN Monitor Script')
+        parser.add_argument('--repository', help='Repository path (used by SVN hooks)')
+        parser.add_argument('--revision', help='Revision number (used by SVN hooks)')
+        parser.add_argument('--no-cache', action='store_true',
+                            help='忽略配置Excel的磁盘解析缓存，强制重新解析')
+        parser.add_argument('--max-concurrent', type=int, default=None,
+                            help='并发检查仓库的最大数量（默认按CPU数自动推算）')
+        args = parser.parse_args()
+
+        monitor = SVNMonitor(use_config_cache=not args.no_cache,
+                             max_concurrent=args.max_concurrent)
+        
+        # If repository and revision are provided, run in hook mode
+        if args.repository and args.revision:
+            logger.info(f"Running in hook mode for repository: {args.repository}, revision: {args.revision}")
+            monitor.process_commit(args.repository, args.revision)
+        else:
+            # Otherwise run in normal monitor mode (continuous monitoring)
+            logger.info("Running in continuous monitor mode")
+            monitor.run()
+    except Exception as e:
+        logger.critical(f"Unhandled exception: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -304,10 +304,11 @@ class TestSVNMonitor(unittest.TestCase):
         # Test with existing working copy
         self.exists_mock.return_value = True
         monitor._ensure_working_copy(repo_config)
-        
-        # Verify cleanup was called before SVN operations
-        cleanup_mock.assert_called_once_with(repo_config['local_working_copy'], repo_config)
-        
+
+        # Verify no pre-emptive cleanup on the happy path (update succeeded);
+        # cleanup is only triggered by the error path in _run_svn_command
+        cleanup_mock.assert_not_called()
+
         # Verify update command was called
         self.subprocess_mock.assert_called()
         
@@ -397,6 +398,9 @@ class TestSVNMonitor(unittest.TestCase):
         mock_smtp.assert_called_with('smtp.exmail.qq.com', 465, timeout=30)
         mock_server.login.assert_called_with('test@example.com', 'test_password')
         mock_server.send_message.assert_called_once()
+        # 发送后连接保持打开以便批次内复用，close_smtp后才真正quit
+        mock_server.quit.assert_not_called()
+        monitor.close_smtp()
         mock_server.quit.assert_called_once()
     
     def test_validate_config(self):